@@ -13,16 +13,25 @@ your_bucket = "ceu-tothz"
 
 # COMMAND ----------
 
+# MAGIC %run ../Includes/_object_store
+
+# COMMAND ----------
+
+# Credentials go into the Hadoop configuration of this bucket, not into the s3a:// URLs
+configure_s3a(your_bucket, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY)
+
+# COMMAND ----------
+
 # MAGIC %md Let's take a look at my bucket:
 
 # COMMAND ----------
 
-files = dbutils.fs.ls(f"s3a://{AWS_ACCESS_KEY_ID}:{AWS_SECRET_ACCESS_KEY.replace('/', '%2F')}@{your_bucket}")
+files = dbutils.fs.ls(f"s3a://{your_bucket}")
 display(files)
 
 # COMMAND ----------
 
-files = dbutils.fs.ls(f"s3a://{AWS_ACCESS_KEY_ID}:{AWS_SECRET_ACCESS_KEY.replace('/', '%2F')}@{your_bucket}/datalake/")
+files = dbutils.fs.ls(f"s3a://{your_bucket}/datalake/")
 display(files)
 
 # COMMAND ----------
@@ -31,5 +40,5 @@ display(files)
 
 # COMMAND ----------
 
-df = spark.read.parquet(f"s3a://{AWS_ACCESS_KEY_ID}:{AWS_SECRET_ACCESS_KEY.replace('/', '%2F')}@{your_bucket}/datalake/silver_edits")
+df = spark.read.parquet(f"s3a://{your_bucket}/datalake/silver_edits")
 display(df)
@@ -11,11 +11,20 @@ your_bucket = "<<FILL-IN>>"
 
 # COMMAND ----------
 
+# MAGIC %run ../Includes/_object_store
+
+# COMMAND ----------
+
+# Credentials go into the Hadoop configuration of this bucket, not into the s3a:// URLs
+configure_s3a(your_bucket, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY)
+
+# COMMAND ----------
+
 # MAGIC %md List the files in your bucket:
 
 # COMMAND ----------
 
-files = dbutils.fs.ls(f"s3a://{AWS_ACCESS_KEY_ID}:{AWS_SECRET_ACCESS_KEY.replace('/', '%2F')}@{your_bucket}/")
+files = dbutils.fs.ls(f"s3a://{your_bucket}/")
 display(files)
 
 # COMMAND ----------
@@ -76,6 +76,28 @@ users_df.printSchema()
 
 # COMMAND ----------
 
+# MAGIC %md
+# MAGIC **`inferSchema`** reads the data an extra time on every read. **`DA.read`** infers the schema once, keeps it in the schema registry and reuses it on later reads without touching the files; pass **`validate=True`** to list the files again and re-infer the schema if they changed.
+
+# COMMAND ----------
+
+users_df = DA.read("csv", users_csv_path, sep="\t", header=True)
+
+users_df.printSchema()
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC Spark also lists the files of every path it reads. **`read_dataset`** reads a course dataset with the file list, sizes and schema recorded in the course's dataset manifest (**`Includes/_dataset_index`**), so the read neither lists the directory nor infers a schema.
+
+# COMMAND ----------
+
+users_df = read_dataset("/ecommerce/users/users-500k.csv")
+
+users_df.printSchema()
+
+# COMMAND ----------
+
 # MAGIC
 # MAGIC %md
 # MAGIC
@@ -119,6 +141,28 @@ events_df.printSchema()
 
 # COMMAND ----------
 
+# MAGIC %md
+# MAGIC The same read with the schema from the registry, as for the users CSV above.
+
+# COMMAND ----------
+
+events_df = DA.read("json", events_json_path)
+
+events_df.printSchema()
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC And from the dataset manifest, as for the users CSV above.
+
+# COMMAND ----------
+
+events_df = read_dataset("/ecommerce/events/events-500k.json")
+
+events_df.printSchema()
+
+# COMMAND ----------
+
 # MAGIC %md
 # MAGIC Now, let's do it with manual schema specification
 
@@ -56,6 +56,28 @@ print("All test pass")
 
 # COMMAND ----------
 
+# MAGIC %md
+# MAGIC The same read with the schema from the registry (**`DA.read`**, see ASP 2.2), without the extra **`inferSchema`** pass.
+
+# COMMAND ----------
+
+products_df2 = DA.read("csv", products_csv_path, header=True)
+
+products_df2.printSchema()
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC The same read from the course's dataset manifest (**`read_dataset`**, see ASP 2.2), without listing the files.
+
+# COMMAND ----------
+
+products_manifest_df = read_dataset("/products/products.csv")
+
+products_manifest_df.printSchema()
+
+# COMMAND ----------
+
 # MAGIC
 # MAGIC %md
 # MAGIC
@@ -23,7 +23,7 @@
 
 # COMMAND ----------
 
-events_df = spark.read.format("delta").load(DA.paths.events)
+events_df = DA.frames.events
 display(events_df)
 
 # COMMAND ----------
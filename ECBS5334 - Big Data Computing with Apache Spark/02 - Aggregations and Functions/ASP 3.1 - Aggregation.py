@@ -29,7 +29,7 @@
 
 # COMMAND ----------
 
-df = spark.read.format("delta").load(DA.paths.events)
+df = DA.frames.events
 display(df)
 
 # COMMAND ----------
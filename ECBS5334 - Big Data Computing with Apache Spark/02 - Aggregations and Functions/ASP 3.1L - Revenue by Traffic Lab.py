@@ -32,7 +32,7 @@
 from pyspark.sql.functions import col
 
 # Purchase events logged on the BedBricks website
-df = (spark.read.format("delta").load(DA.paths.events)
+df = (DA.frames.events
       .withColumn("revenue", col("ecommerce.purchase_revenue_in_usd"))
       .filter(col("revenue").isNotNull())
       .drop("event_name")
@@ -77,9 +77,9 @@ from pyspark.sql.functions import round
 
 expected1 = [(12704560.0, 1083.175), (78800000.3, 983.2915), (24797837.0, 1076.6221), (47218429.0, 1086.8303), (16177893.0, 1083.4378), (8044326.0, 1087.218)]
 test_df = traffic_df.sort("traffic_source").select(round("total_rev", 4).alias("total_rev"), round("avg_rev", 4).alias("avg_rev"))
-result1 = [(row.total_rev, row.avg_rev) for row in test_df.collect()]
+result1 = fetch_columns(test_df, "total_rev", "avg_rev")
 
-assert(expected1 == result1)
+assert(columns_equal(result1, expected1))
 print("All test pass")
 
 # COMMAND ----------
@@ -112,9 +112,9 @@ display(top_traffic_df)
 
 expected2 = [(78800000.3, 983.2915), (47218429.0, 1086.8303), (24797837.0, 1076.6221)]
 test_df = top_traffic_df.select(round("total_rev", 4).alias("total_rev"), round("avg_rev", 4).alias("avg_rev"))
-result2 = [(row.total_rev, row.avg_rev) for row in test_df.collect()]
+result2 = fetch_columns(test_df, "total_rev", "avg_rev")
 
-assert(expected2 == result2)
+assert(columns_equal(result2, expected2))
 print("All test pass")
 
 # COMMAND ----------
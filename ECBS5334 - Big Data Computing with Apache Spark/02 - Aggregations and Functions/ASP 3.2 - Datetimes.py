@@ -34,8 +34,7 @@
 from pyspark.sql.functions import col
 
 df = (
-    spark.read.format("delta")
-    .load(DA.paths.events)
+    DA.frames.events
     .select("user_id", col("event_timestamp"))
 )
 display(df)
@@ -27,10 +27,7 @@
 
 from pyspark.sql.functions import col
 
-df = (spark
-      .read
-      .format("delta")
-      .load(DA.paths.events)
+df = (DA.frames.events
       .select("user_id", col("event_timestamp").alias("ts"))
      )
 
@@ -134,9 +131,9 @@ print("All test pass")
 
 expected2b = [(datetime.date(2020, 6, 19), 251573), (datetime.date(2020, 6, 20), 357215), (datetime.date(2020, 6, 21), 305055), (datetime.date(2020, 6, 22), 239094), (datetime.date(2020, 6, 23), 243117)]
 
-result2b = [(row.date, row.active_users) for row in active_users_df.orderBy("date").take(5)]
+result2b = fetch_columns(active_users_df.orderBy("date").limit(5), "date", "active_users")
 
-assert expected2b == result2b, "active_users_df does not have the expected values"
+assert columns_equal(result2b, expected2b), "active_users_df does not have the expected values"
 print("All test pass")
 
 # COMMAND ----------
@@ -184,9 +181,9 @@ print("All test pass")
 
 expected3b = [("Fri", 247180.66666666666), ("Mon", 238195.5), ("Sat", 278482.0), ("Sun", 282905.5), ("Thu", 264620.0), ("Tue", 260942.5), ("Wed", 227214.0)]
 
-result3b = [(row.day, row.avg_users) for row in active_dow_df.sort("day").collect()]
+result3b = fetch_columns(active_dow_df.sort("day"), "day", "avg_users")
 
-assert expected3b == result3b, "active_dow_df does not have the expected values"
+assert columns_equal(result3b, expected3b), "active_dow_df does not have the expected values"
 print("All test pass")
 
 # COMMAND ----------
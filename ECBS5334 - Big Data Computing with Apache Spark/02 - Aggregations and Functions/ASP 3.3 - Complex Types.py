@@ -27,7 +27,7 @@ from pyspark.sql.functions import *
 
 # COMMAND ----------
 
-df = spark.read.format("delta").load(DA.paths.sales)
+df = DA.frames.sales
 
 display(df)
 
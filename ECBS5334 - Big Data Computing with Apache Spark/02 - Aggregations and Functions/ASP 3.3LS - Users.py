@@ -7,7 +7,7 @@
 
 from pyspark.sql.functions import *
 
-df = spark.read.format("delta").load(DA.paths.sales)
+df = DA.frames.sales
 display(df)
 
 # COMMAND ----------
@@ -28,7 +28,7 @@ from pyspark.sql.functions import *
 
 # COMMAND ----------
 
-sales_df = spark.read.format("delta").load(DA.paths.sales)
+sales_df = DA.frames.sales
 display(sales_df)
 
 # COMMAND ----------
@@ -164,7 +164,7 @@ display(sales_exploded_df.select("items.coupon").na.fill("NO COUPON"))
 
 # COMMAND ----------
 
-users_df = spark.read.format("delta").load(DA.paths.users)
+users_df = DA.frames.users
 display(users_df)
 
 # COMMAND ----------
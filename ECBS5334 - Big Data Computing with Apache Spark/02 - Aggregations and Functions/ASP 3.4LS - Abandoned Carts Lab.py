@@ -33,19 +33,19 @@
 # COMMAND ----------
 
 # sale transactions at BedBricks
-sales_df = spark.read.format("delta").load(sales_path)
+sales_df = DA.frames.sales
 display(sales_df)
 
 # COMMAND ----------
 
 # user IDs and emails at BedBricks
-users_df = spark.read.format("delta").load(users_path)
+users_df = DA.frames.users
 display(users_df)
 
 # COMMAND ----------
 
 # events logged on the BedBricks website
-events_df = spark.read.format("delta").load(events_path)
+events_df = DA.frames.events
 display(events_df)
 
 # COMMAND ----------
@@ -84,7 +84,7 @@ expected_columns = ["email", "converted"]
 expected_count = 210370
 
 # Create test suite
-suite = create_test_suite("1.1")
+suite = create_test_suite("1.1", deferred=True)
 
 # Run tests
 suite.test_equals(
@@ -93,14 +93,16 @@ suite.test_equals(
     description="converted_users_df has the correct columns",
 )
 
-suite.test_equals(
-    actual=converted_users_df.count(),
+suite.test_count(
+    converted_users_df,
     expected=expected_count,
     description="converted_users_df has the correct number of rows",
 )
 
-suite.test_true(
-    condition=converted_users_df.select(col("converted")).first()[0] == True,
+suite.test_agg(
+    converted_users_df,
+    first(col("converted")),
+    expected=True,
     description="converted column is correct",
 )
 
@@ -144,7 +146,7 @@ expected_count = 782749
 expected_false_count = 572379
 
 # Create test suite
-suite = create_test_suite("2.1")
+suite = create_test_suite("2.1", deferred=True)
 
 # Run tests
 suite.test_equals(
@@ -153,25 +155,28 @@ suite.test_equals(
     description="Columns are correct",
 )
 
-suite.test_equals(
-    actual=conversions_df.filter(col("email").isNull()).count(),
+suite.test_count(
+    conversions_df,
     expected=0,
     description="Email column contains no nulls",
+    where=col("email").isNull(),
 )
 
-suite.test_equals(
-    actual=conversions_df.count(),
+suite.test_count(
+    conversions_df,
     expected=expected_count,
     description="There is the correct number of rows",
 )
 
-suite.test_equals(
-    actual=conversions_df.filter(col("converted") == False).count(),
+suite.test_count(
+    conversions_df,
     expected=expected_false_count,
     description="There is the correct number of false entries in converted column",
+    where=col("converted") == False,
 )
 
 # Display results
+suite.display_results()
 assert suite.passed, "One or more tests failed."
 
 # COMMAND ----------
@@ -205,30 +210,36 @@ display(carts_df)
 
 # COMMAND ----------
 
+from pyspark.sql import functions as F
+
 expected_columns = ["user_id", "cart"]
 expected_count = 488403
 
 # Create test suite
-suite = create_test_suite("3.1")
+suite = create_test_suite("3.1", deferred=True)
 
 # Run tests
 suite.test_equals(
     actual=carts_df.columns, expected=expected_columns, description="Incorrect columns"
 )
 
-suite.test_equals(
-    actual=carts_df.count(),
+suite.test_count(
+    carts_df,
     expected=expected_count,
     description="Incorrect number of rows",
 )
 
-suite.test_equals(
-    actual=carts_df.select(col("user_id")).drop_duplicates().count(),
+# countDistinct() skips nulls; a null user_id adds one distinct value, as it does for drop_duplicates().
+# F.max, not the builtin max, and 0 rather than null for an empty carts_df
+suite.test_agg(
+    carts_df,
+    F.countDistinct(F.col("user_id")) + F.coalesce(F.max(F.col("user_id").isNull().cast("int")), F.lit(0)),
     expected=expected_count,
     description="Duplicate user_ids present",
 )
 
 # Display results
+suite.display_results()
 assert suite.passed, "One or more tests failed."
 
 # COMMAND ----------
@@ -271,7 +282,7 @@ expected_count = 782749
 expected_cart_null_count = 397799
 
 # Create test suite
-suite = create_test_suite("4.1")
+suite = create_test_suite("4.1", deferred=True)
 
 # Run tests
 suite.test_equals(
@@ -280,19 +291,21 @@ suite.test_equals(
     description="Columns do not match",
 )
 
-suite.test_equals(
-    actual=email_carts_df.count(),
+suite.test_count(
+    email_carts_df,
     expected=expected_count,
     description="Counts do not match",
 )
 
-suite.test_equals(
-    actual=email_carts_df.filter(col("cart").isNull()).count(),
+suite.test_count(
+    email_carts_df,
     expected=expected_cart_null_count,
     description="Cart null counts incorrect from join",
+    where=col("cart").isNull(),
 )
 
 # Display results
+suite.display_results()
 assert suite.passed, "One or more tests failed."
 
 # COMMAND ----------
@@ -335,7 +348,7 @@ expected_columns = [
 expected_count = 204272
 
 # Create test suite
-suite = create_test_suite("5.1")
+suite = create_test_suite("5.1", deferred=True)
 
 # Run tests
 suite.test_equals(
@@ -344,13 +357,14 @@ suite.test_equals(
     description="Columns do not match",
 )
 
-suite.test_equals(
-    actual=abandoned_carts_df.count(),
+suite.test_count(
+    abandoned_carts_df,
     expected=expected_count,
     description="Counts do not match",
 )
 
 # Display results
+suite.display_results()
 assert suite.passed, "One or more tests failed."
 
 # COMMAND ----------
@@ -392,11 +406,11 @@ expected_columns = ["items", "count"]
 expected_count = 12
 
 # Create test suite
-suite = create_test_suite("6.1")
+suite = create_test_suite("6.1", deferred=True)
 
 # Run tests
-suite.test_equals(
-    actual=abandoned_items_df.count(),
+suite.test_count(
+    abandoned_items_df,
     expected=expected_count,
     description="Counts do not match",
 )
@@ -408,6 +422,7 @@ suite.test_equals(
 )
 
 # Display results
+suite.display_results()
 assert suite.passed, "One or more tests failed."
 
 # COMMAND ----------
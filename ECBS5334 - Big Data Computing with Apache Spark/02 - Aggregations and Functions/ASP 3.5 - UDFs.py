@@ -46,7 +46,7 @@
 
 # COMMAND ----------
 
-sales_df = spark.read.format("delta").load(sales_path)
+sales_df = DA.frames.sales
 display(sales_df)
 
 # COMMAND ----------
@@ -160,7 +160,7 @@ def first_letter_udf(email: str) -> str:
 
 from pyspark.sql.functions import col
 
-sales_df = spark.read.format("delta").load(sales_path)
+sales_df = DA.frames.sales
 display(sales_df.select(first_letter_udf(col("email"))))
 
 # COMMAND ----------
@@ -30,10 +30,7 @@
 from pyspark.sql.functions import (approx_count_distinct, avg, col,
                                    date_format, to_date)
 
-df = (spark
-      .read
-      .format("delta")
-      .load(DA.paths.events)
+df = (DA.frames.events
       .withColumn("ts", (col("event_timestamp") / 1e6).cast("timestamp"))
       .withColumn("date", to_date("ts"))
       .groupBy("date").agg(approx_count_distinct("user_id").alias("active_users"))
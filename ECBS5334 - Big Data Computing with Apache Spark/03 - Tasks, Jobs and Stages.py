@@ -3,6 +3,14 @@
 
 # COMMAND ----------
 
+# MAGIC %run ./Includes/_spark_metrics
+
+# COMMAND ----------
+
+# MAGIC %run ./Includes/_job_recorder
+
+# COMMAND ----------
+
 # MAGIC %md Let's disable the Adaptive Query Executor (More on that later)
 
 # COMMAND ----------
@@ -59,7 +67,16 @@ df = spark.read.json(file_path)
 
 # COMMAND ----------
 
-df.count()
+with JobRecorder() as aqe_off:
+    df.count()
+
+# COMMAND ----------
+
+# MAGIC %md Check your guess: every job, stage and task the count launched. The tasks of the scan stage are its input splits; the shuffle column marks where one stage hands its output to the next.
+
+# COMMAND ----------
+
+aqe_off.render()
 
 # COMMAND ----------
 
@@ -67,4 +84,22 @@ spark.conf.set('spark.sql.adaptive.enabled', 'true')
 
 # COMMAND ----------
 
-df.count()
+with JobRecorder() as aqe_on:
+    df.count()
+
+# COMMAND ----------
+
+# MAGIC %md What changed with AQE on?
+
+# COMMAND ----------
+
+aqe_on.render()
+compare_recordings({"AQE off": aqe_off, "AQE on": aqe_on})
+
+# COMMAND ----------
+
+# MAGIC %md How does `spark.sql.files.maxPartitionBytes` change the number of input splits (and so tasks) for the same file? Splits are also capped by the file size divided by the number of cores, so lowering the setting only helps below that.
+
+# COMMAND ----------
+
+split_recordings = record_split_counts(lambda: spark.read.json(file_path), ["128MB", "16MB", "4MB"])
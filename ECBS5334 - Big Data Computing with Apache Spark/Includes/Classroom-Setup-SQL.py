@@ -3,45 +3,25 @@
 
 # COMMAND ----------
 
-# MAGIC %sql
-# MAGIC CREATE DATABASE IF NOT EXISTS ceu;
-# MAGIC USE ceu;
+setup = ClassroomSetup()
+
+# Recreate the course views in ceu, unless they already exist over the same paths
+course_views = {
+    "users": users_path,
+    "sales": sales_path,
+    "products": products_path,
+    "events": events_path,
+}
+setup.step(
+    "catalog with views",
+    lambda: reset_course_catalog(course_views),
+    inputs=lambda: {"tables": course_catalog_state(), "views": course_views},
+)
+setup.step("use ceu", lambda: spark.catalog.setCurrentDatabase("ceu"))
 
 # COMMAND ----------
 
-try:
-    spark.sql("DROP VIEW IF EXISTS sales;")
-except:
-    spark.sql("DROP TABLE IF EXISTS sales;")
-
-try:
-    spark.sql("DROP VIEW IF EXISTS users;")
-except:
-    spark.sql("DROP TABLE IF EXISTS users;")
-
-try:
-    spark.sql("DROP VIEW IF EXISTS products;")
-except:
-    spark.sql("DROP TABLE IF EXISTS products;")
-
-try:
-    spark.sql("DROP VIEW IF EXISTS events;")
-except:
-    spark.sql("DROP TABLE IF EXISTS events;")
-
-# COMMAND ----------
-
-# MAGIC %sql
-# MAGIC
-# MAGIC CREATE VIEW IF NOT EXISTS users AS SELECT * FROM delta.`s3a://dbx-data-public/v03/ecommerce/users/users.delta`;
-# MAGIC CREATE VIEW IF NOT EXISTS sales AS SELECT * FROM delta.`s3a://dbx-data-public/v03/ecommerce/sales/sales.delta`;
-# MAGIC CREATE VIEW IF NOT EXISTS products AS SELECT * FROM delta.`s3a://dbx-data-public/v03/products/products.delta`;
-# MAGIC CREATE VIEW IF NOT EXISTS events AS SELECT * FROM delta.`s3a://dbx-data-public/v03/ecommerce/events/events.delta`;
-# MAGIC
-
-# COMMAND ----------
-
-setup_spark_conf()
+setup.step("spark conf", setup_spark_conf)
 
 # COMMAND ----------
 
@@ -50,5 +30,6 @@ displayHTML(f"<br/>")
 displayHTML(f"✅ Created database 'ceu'")
 displayHTML(f"<br/>")
 displayHTML(f"✅ Created views: users, sales, product, events")
-
-
+displayHTML(f"- Dataset mirror: {DA.mirror.mirror_root if mirror_enabled else 'off'} (set mirror_enabled = True or False in a cell before this %run to change it)")
+displayHTML(f"<br/>")
+setup.finish()
@@ -3,43 +3,23 @@
 
 # COMMAND ----------
 
-# Set up spark configuration for SQL access to data paths
-setup_spark_conf()
+setup = ClassroomSetup()
 
-# COMMAND ----------
-
-# Reset working directory for lab exercises
-reset_working_dir()
-
-# COMMAND ----------
+# Set up spark configuration for SQL access to data paths (widgets are per notebook, so this always runs)
+setup.step("spark conf", setup_spark_conf)
 
-# MAGIC %sql
-# MAGIC CREATE DATABASE IF NOT EXISTS ceu;
-# MAGIC USE ceu;
-# MAGIC
-# MAGIC
+# Reset working directory for lab exercises, unless it is still empty from the last setup
+setup.step("working dir", reset_working_dir, inputs=working_dir_state)
 
 # COMMAND ----------
 
-try:
-    spark.sql("DROP VIEW IF EXISTS sales;")
-except:
-    spark.sql("DROP TABLE IF EXISTS sales;")
-
-try:
-    spark.sql("DROP VIEW IF EXISTS users;")
-except:
-    spark.sql("DROP TABLE IF EXISTS users;")
-
-try:
-    spark.sql("DROP VIEW IF EXISTS products;")
-except:
-    spark.sql("DROP TABLE IF EXISTS products;")
-
-try:
-    spark.sql("DROP VIEW IF EXISTS events;")
-except:
-    spark.sql("DROP TABLE IF EXISTS events;")
+# Create the ceu database and drop the course tables/views, unless the catalog is unchanged
+setup.step(
+    "catalog without views",
+    reset_course_catalog,
+    inputs=lambda: {"tables": course_catalog_state(), "views": None},
+)
+setup.step("use ceu", lambda: spark.catalog.setCurrentDatabase("ceu"))
 
 # COMMAND ----------
 
@@ -53,3 +33,6 @@ displayHTML(f"- Users data: {users_path}")
 displayHTML(f"- Events data: {events_path}")
 displayHTML(f"- Products data: {products_path}")
 displayHTML(f"- Sales data: {sales_path}")
+displayHTML(f"- Dataset mirror: {DA.mirror.mirror_root if mirror_enabled else 'off'} (set mirror_enabled = True or False in a cell before this %run to change it)")
+displayHTML(f"<br/>")
+setup.finish()
@@ -0,0 +1,274 @@
+# Databricks notebook source
+# Cache bookkeeping for cached and persisted DataFrames, as DA.cache.
+#
+# DA.cache.cache(df) and DA.cache.persist(df, storage_level) cache df as
+# df.cache()/df.persist() do and register it under the fingerprint of its
+# analyzed logical plan (Spark's semanticHash, which is what Spark's own cache
+# lookup matches on), together with its size in memory once an action has
+# materialized it; DA.cache.unpersist(df) releases it. DataFrames cached with
+# df.cache() directly are not tracked.
+#
+# A later action reuses a cached plan when one of its completed stages reads
+# the cached RDD; those actions are counted as hits. Only the jobs of this
+# notebook's job groups count: the group of every command that calls DA.cache
+# (outside Databricks, where commands have no group, a private one is set on
+# the notebook thread). Their stages come from the Spark UI REST API, so hits
+# stay at 0 when the UI is not reachable from the driver. An action is a SQL
+# execution, so the several jobs one DataFrame action may run count once; jobs
+# outside any SQL execution (RDD actions) count on their own.
+#
+# When the cached data outgrows `DA.cache.budget_bytes`, the least recently
+# used entries are unpersisted; the budget is checked whenever something new
+# is cached and on DA.cache.report(). DA.cleanup() unpersists whatever is still
+# cached and prints the report: hits per plan, and the bytes held by entries
+# that were never reused.
+
+import builtins
+import time
+import uuid
+
+cache_budget_bytes = 2 * 1024**3
+
+# COMMAND ----------
+
+
+def plan_fingerprint(df):
+    """Hex fingerprint of df's analyzed logical plan; equal for plans Spark treats as the same cached data."""
+    return format(df._jdf.queryExecution().analyzed().semanticHash() & 0xFFFFFFFF, "08x")
+
+
+def _cached_rdd_id(df):
+    """Id of the RDD holding df's cached batches, or None if df is not cached."""
+    try:
+        cached = spark._jsparkSession.sharedState().cacheManager().lookupCachedData(df._jdf)
+        if not cached.isDefined():
+            return None
+        return cached.get().cachedRepresentation().cacheBuilder().cachedColumnBuffers().id()
+    except Exception:
+        return None
+
+
+def sql_executions_by_job(offset=0, page=100):
+    """Map job id -> SQL execution id for the executions from offset on, from the Spark UI REST API.
+
+    Returns (mapping, offset to continue from). The offset does not move past
+    an execution that is still running, whose later jobs are not listed yet.
+    """
+    execution_of_job = {}
+    while True:
+        executions = spark_ui_json(f"sql?details=false&offset={offset}&length={page}") or []
+        for execution in executions:
+            for key in ("successJobIds", "failedJobIds", "runningJobIds"):
+                for job_id in execution.get(key, []):
+                    execution_of_job[job_id] = execution["id"]
+            if execution.get("status") == "RUNNING":
+                return execution_of_job, offset
+            offset += 1
+        if len(executions) < page:
+            return execution_of_job, offset
+
+
+def action_of(job_id, execution_of_job):
+    """The action a job belongs to: its SQL execution, or the job itself outside SQL."""
+    execution_id = execution_of_job.get(job_id)
+    return ("sql", execution_id) if execution_id is not None else ("job", job_id)
+
+
+class CacheManager:
+    """Tracks cached DataFrames by logical plan, counts their reuse and enforces a memory budget."""
+
+    def __init__(self, budget_bytes=cache_budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._entries = {}
+        self._released = []
+        self._seen_jobs = set()
+        self._groups = set()
+        self._own_group = f"da-cache-{uuid.uuid4().hex}"
+        self._sql_offset = 0
+        self._execution_of_job = {}
+
+    def cache(self, df, name=None):
+        """df.cache(), tracked by DA.cache; returns df."""
+        df.cache()
+        self._track(df, name)
+        return df
+
+    def persist(self, df, storage_level=None, name=None):
+        """df.persist(storage_level), tracked by DA.cache; returns df."""
+        if storage_level is None:
+            df.persist()
+        else:
+            df.persist(storage_level)
+        self._track(df, name)
+        return df
+
+    def unpersist(self, df, blocking=False):
+        """df.unpersist(), keeping the statistics of df's plan for the report; returns df."""
+        if df.is_cached:
+            try:
+                self.forget(df)
+            except Exception as e:
+                print(f"DA.cache could not release this DataFrame: {e}")
+        return df.unpersist(blocking)
+
+    def _track(self, df, name):
+        try:
+            self.register(df, name)
+        except Exception as e:
+            print(f"DA.cache could not track this DataFrame: {e}")
+
+    def _note_job_group(self):
+        """Remember the job group of the calling command, setting a private one where there is none."""
+        sc = spark.sparkContext
+        group = sc.getLocalProperty("spark.jobGroup.id")
+        if group is None:
+            group = self._own_group
+            sc.setLocalProperty("spark.jobGroup.id", group)
+        self._groups.add(group)
+
+    def register(self, df, name=None):
+        """Record a DataFrame that was just cached; returns its plan fingerprint."""
+        fingerprint = plan_fingerprint(df)
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            entry = {
+                "fingerprint": fingerprint,
+                "name": name or df._jdf.queryExecution().analyzed().nodeName(),
+                "df": df,
+                "rdd_id": _cached_rdd_id(df),
+                "storage_level": str(df.storageLevel),
+                "registered_at": time.time(),
+                "last_used": time.time(),
+                "jobs": set(),
+                "actions": set(),
+                "memory_bytes": 0,
+                "peak_bytes": 0,
+            }
+            self._entries[fingerprint] = entry
+        else:
+            entry["last_used"] = time.time()
+            if name:
+                entry["name"] = name
+        self.refresh()
+        return fingerprint
+
+    def forget(self, df, status="unpersisted"):
+        """Stop tracking df's plan (after an unpersist), keeping its statistics for the report."""
+        self.refresh()
+        entry = self._entries.pop(plan_fingerprint(df), None)
+        if entry is not None:
+            entry["status"] = status
+            entry["df"] = None
+            self._released.append(entry)
+
+    def refresh(self):
+        """Update sizes and hits from the driver's storage info and the Spark UI, then apply the budget."""
+        self._note_job_group()
+        if not self._entries:
+            return
+        sc = spark.sparkContext
+        memory = {info.id(): info.memSize() for info in sc._jsc.sc().getRDDStorageInfo()}
+        for entry in self._entries.values():
+            if entry["rdd_id"] is None:
+                entry["rdd_id"] = _cached_rdd_id(entry["df"])
+            entry["memory_bytes"] = memory.get(entry["rdd_id"], 0)
+            entry["peak_bytes"] = builtins.max(entry["peak_bytes"], entry["memory_bytes"])
+
+        tracker = sc.statusTracker()
+        job_ids = set()
+        for group in self._groups:
+            job_ids.update(tracker.getJobIdsForGroup(group))
+        finished = []
+        for job_id in sorted(job_ids - self._seen_jobs):
+            info = tracker.getJobInfo(job_id)
+            if info is not None and info.status not in ("SUCCEEDED", "FAILED"):
+                continue
+            self._seen_jobs.add(job_id)
+            if info is not None:
+                finished.append(info)
+
+        by_rdd = {entry["rdd_id"]: entry for entry in self._entries.values() if entry["rdd_id"] is not None}
+        if finished and by_rdd:
+            execution_of_job, self._sql_offset = sql_executions_by_job(self._sql_offset)
+            self._execution_of_job.update(execution_of_job)
+            for info in finished:
+                rdd_ids, completed = set(), []
+                for stage_id in info.stageIds:
+                    stage = (spark_ui_json(f"stages/{stage_id}") or [{}])[0]
+                    if stage.get("status") == "COMPLETE":
+                        rdd_ids.update(stage.get("rddIds", []))
+                        completed.append(ui_timestamp(stage.get("completionTime")) or time.time())
+                for rdd_id in rdd_ids & set(by_rdd):
+                    entry = by_rdd[rdd_id]
+                    entry["jobs"].add(info.jobId)
+                    entry["actions"].add(action_of(info.jobId, self._execution_of_job))
+                    entry["last_used"] = builtins.max([entry["last_used"]] + completed)
+
+        self._evict_over_budget()
+
+    def _evict_over_budget(self):
+        held = builtins.sum(entry["memory_bytes"] for entry in self._entries.values())
+        for entry in sorted(self._entries.values(), key=lambda entry: entry["last_used"]):
+            if held <= self.budget_bytes:
+                break
+            if entry["memory_bytes"] == 0:
+                continue
+            print(
+                f"Evicting cached {entry['name']} ({entry['fingerprint']}, {format_bytes(entry['memory_bytes'])}): "
+                f"{format_bytes(held)} cached exceeds the {format_bytes(self.budget_bytes)} budget"
+            )
+            held -= entry["memory_bytes"]
+            df = entry["df"]
+            self._entries.pop(entry["fingerprint"])
+            entry["status"] = "evicted"
+            entry["df"] = None
+            self._released.append(entry)
+            df.unpersist()
+
+    def report(self):
+        """Hits and size per cached plan, including plans that were unpersisted or evicted."""
+        self.refresh()
+        rows = []
+        for entry in list(self._entries.values()) + self._released:
+            # The first action that reads the cached RDD is the one that fills it
+            hits = builtins.max(len(entry["actions"]) - 1, 0)
+            rows.append({
+                "fingerprint": entry["fingerprint"],
+                "name": entry["name"],
+                "storage_level": entry["storage_level"],
+                "status": entry.get("status", "cached"),
+                "hits": hits,
+                "bytes": entry["peak_bytes"],
+                "wasted_bytes": entry["peak_bytes"] if hits == 0 else 0,
+            })
+        return rows
+
+    def unpersist_all(self):
+        """Unpersist every DataFrame still cached; returns the report."""
+        self.refresh()
+        for entry in list(self._entries.values()):
+            entry["df"].unpersist()
+            self._entries.pop(entry["fingerprint"])
+            entry["status"] = "unpersisted at cleanup"
+            entry["df"] = None
+            self._released.append(entry)
+        return self.report()
+
+
+def print_cache_report(rows):
+    """Print a CacheManager report as a table."""
+    if not rows:
+        print("No DataFrames were cached")
+        return
+    print(f"{'plan':<10} {'name':<24} {'status':<24} {'hits':>5} {'size':>10}")
+    for row in rows:
+        print(f"{row['fingerprint']:<10} {row['name'][:24]:<24} {row['status']:<24} {row['hits']:>5} {format_bytes(row['bytes']):>10}")
+    wasted = builtins.sum(row["wasted_bytes"] for row in rows)
+    hits = builtins.sum(row["hits"] for row in rows)
+    mark = "✅" if wasted == 0 else "❌"
+    print(f"{mark} {hits} cache hits; {format_bytes(wasted)} cached but never reused")
+
+
+# COMMAND ----------
+
+DA.cache = CacheManager()
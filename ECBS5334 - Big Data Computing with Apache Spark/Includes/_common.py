@@ -17,6 +17,10 @@ checkpoints_dir = "/tmp/spark-course-checkpoints"
 
 # COMMAND ----------
 
+import builtins
+import hashlib
+import json
+import time
 from types import SimpleNamespace
 DA = SimpleNamespace(
     paths = SimpleNamespace(
@@ -61,31 +65,66 @@ def test_success(condition, success_message, failure_message):
 
 
 # Simple function to create test suites
-def create_test_suite(name):
-    """Create a simple test suite for validating lab exercises."""
-    return SimpleSuite(name)
+def create_test_suite(name, deferred=False):
+    """Create a simple test suite for validating lab exercises.
+
+    With deferred=True, test_count/test_agg checks are collected and evaluated
+    by display_results() in a single aggregation job per DataFrame.
+    """
+    return SimpleSuite(name, deferred=deferred)
 
 
 class SimpleSuite:
     """A simplified test suite to replace DA.tests functionality."""
 
-    def __init__(self, name):
+    def __init__(self, name, deferred=False):
         self.name = name
         self.tests = []
         self.passed = True
+        self.deferred = deferred
+        self.pending = []
+        self.metrics = []
+
+    def _measure(self, action):
+        """Run action() in its own metrics window; returns (its result, the metrics or {})."""
+        try:
+            window = SparkMetrics().start()
+        except Exception:
+            window = None
+        try:
+            value = action()
+        finally:
+            try:
+                metrics = window.stop()
+            except Exception:
+                metrics = {}
+        return value, metrics
+
+    def _record(self, description, result, metrics=None):
+        """Record a test result with the Spark work measured for that check."""
+        self.tests.append((description, result))
+        self.metrics.append(metrics or {})
 
     def test(self, description, test_function):
         """Add a test with a custom test function."""
-        result = test_function()
-        self.tests.append((description, result))
+        result, metrics = self._measure(test_function)
+        self._record(description, result, metrics)
         if not result:
             self.passed = False
         return result
 
     def test_equals(self, actual, expected, description):
-        """Test if actual equals expected."""
+        """Test if actual equals expected.
+
+        actual may be a function (e.g. `lambda: df.count()`), which is then
+        evaluated inside this check's metrics window.
+        """
+        actual, metrics = self._measure(actual if callable(actual) else lambda: actual)
+        return self._check_equals(actual, expected, description, metrics)
+
+    def _check_equals(self, actual, expected, description, metrics=None):
         result = actual == expected
-        self.tests.append((description, result))
+        self._record(description, result, metrics)
         if not result:
             self.passed = False
             print(f"❌ {description} - Expected {expected}, got {actual}")
@@ -96,7 +135,7 @@ class SimpleSuite:
     def test_true(self, condition, description):
         """Test if condition is True."""
         result = condition == True
-        self.tests.append((description, result))
+        self._record(description, result)
         if not result:
             self.passed = False
             print(f"❌ {description}")
@@ -107,7 +146,7 @@ class SimpleSuite:
     def test_false(self, condition, description):
         """Test if condition is False."""
         result = condition == False
-        self.tests.append((description, result))
+        self._record(description, result)
         if not result:
             self.passed = False
             print(f"❌ {description}")
@@ -119,7 +158,7 @@ class SimpleSuite:
         """Test if collection has expected length."""
         actual_length = len(collection)
         result = actual_length == expected_length
-        self.tests.append((description, result))
+        self._record(description, result)
         if not result:
             self.passed = False
             print(
@@ -129,20 +168,201 @@ class SimpleSuite:
             print(f"✅ {description}")
         return result
 
-    def display_results(self):
-        """Print test results summary."""
+    def test_agg(self, df, column, expected, description):
+        """Test if an aggregate column expression (e.g. first("converted")) over df equals expected."""
+        if self.deferred:
+            self.pending.append((df, column, expected, description))
+            return None
+        actual, metrics = self._measure(lambda: df.agg(column).first()[0])
+        return self._check_equals(actual, expected, description, metrics)
+
+    def test_count(self, df, expected, description, where=None):
+        """Test if df has the expected number of rows, optionally only counting rows matching where."""
+        from pyspark.sql.functions import count, lit, when
+
+        column = count(lit(1)) if where is None else count(when(where, True))
+        return self.test_agg(df, column, expected, description)
+
+    def evaluate_pending(self):
+        """Run the deferred checks, one aggregation job per DataFrame.
+
+        Each aggregation is measured on its own; its metrics are recorded on
+        every check it answered, with the number of those checks.
+        """
+        by_df = {}
+        for check in self.pending:
+            by_df.setdefault(id(check[0]), []).append(check)
+        self.pending = []
+
+        for checks in by_df.values():
+            df = checks[0][0]
+            row, metrics = self._measure(lambda: df.agg(
+                *[column.alias(f"check_{i}") for i, (_, column, _, _) in enumerate(checks)]
+            ).first())
+            if metrics:
+                metrics = {**metrics, "grouped_checks": len(checks)}
+            for i, (_, _, expected, description) in enumerate(checks):
+                self._check_equals(row[i], expected, description, metrics)
+
+    def metrics_table(self):
+        """Format the per-test wall time and Spark metrics as a text table."""
+        header = ["Test", "Result", "Wall (s)", "Jobs", "Stages", "Tasks", "Input", "Shuffle read", "Shuffle write", "Spill"]
+        rows = [header]
+        for (description, result), metrics in zip(self.tests, self.metrics):
+            if not metrics:
+                rows.append([description, "✅" if result else "❌"] + ["-"] * 8)
+                continue
+            rows.append([
+                description,
+                "✅" if result else "❌",
+                f"{metrics['wall_time_s']:.2f}",
+                str(metrics["jobs"]),
+                str(metrics["stages"]),
+                str(metrics["tasks"]),
+                format_bytes(metrics["input_bytes"]),
+                format_bytes(metrics["shuffle_read_bytes"]),
+                format_bytes(metrics["shuffle_write_bytes"]),
+                format_bytes(metrics["spill_bytes"]),
+            ])
+        widths = [builtins.max(len(row[i]) for row in rows) for i in range(len(header))]
+        return "\n".join(
+            "  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows
+        )
+
+    def export_metrics(self, path=None):
+        """Return the per-test metrics as JSON, also writing them to path if given."""
+        exported = json.dumps(
+            {
+                "suite": self.name,
+                "passed": self.passed,
+                "tests": [
+                    {"description": description, "passed": bool(result), **metrics}
+                    for (description, result), metrics in zip(self.tests, self.metrics)
+                ],
+            },
+            indent=2,
+        )
+        if path is not None:
+            dbutils.fs.put(path, exported, True)
+        return exported
+
+    def display_results(self, show_metrics=True, metrics_path=None):
+        """Print test results summary, the per-test metrics table and optionally export them as JSON."""
+        self.evaluate_pending()
         total = len(self.tests)
-        passed = sum(1 for _, result in self.tests if result)
+        # builtins.sum, as notebooks `from pyspark.sql.functions import *` over the shared namespace
+        passed = builtins.sum(1 for _, result in self.tests if result)
         print(f"\n===== Test Results for {self.name} =====")
         print(f"Passed: {passed}/{total} tests")
         if self.passed:
             print("🎉 All tests passed!")
         else:
             print("❌ Some tests failed.")
+        if show_metrics:
+            print()
+            print(self.metrics_table())
+        if metrics_path is not None:
+            self.export_metrics(metrics_path)
+            print(f"Exported test metrics to {metrics_path}")
         print("=====================================\n")
         return self.passed
 
 
+# COMMAND ----------
+
+# Column-wise result retrieval for lab checks. Results are fetched as Arrow
+# record batches and compared as NumPy arrays instead of going through pickled
+# Row objects; without pyarrow, or with Arrow disabled, the Row path is used.
+
+import numpy as np
+import tracemalloc
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+def arrow_enabled():
+    """Whether results can be fetched through Arrow in this session."""
+    return pa is not None and spark.conf.get("spark.sql.execution.arrow.pyspark.enabled", "false").lower() == "true"
+
+
+def fetch_columns(df, *columns, use_arrow=None):
+    """Fetch the result of df (optionally only some columns) as {column: NumPy array}."""
+    if columns:
+        df = df.select(*columns)
+    if use_arrow is None:
+        use_arrow = arrow_enabled()
+
+    if use_arrow:
+        try:
+            batches = df._collect_as_arrow()
+        except Exception:
+            # Types Arrow cannot convert (e.g. nested maps on older Spark) fall back to Rows
+            batches = None
+        if batches:
+            table = pa.Table.from_batches(batches)
+            return {name: table.column(name).to_numpy() for name in table.column_names}
+
+    rows = df.collect()
+    return {name: np.array([row[i] for row in rows], dtype=object) for i, name in enumerate(df.columns)}
+
+
+def collect_tuples(df, *columns, use_arrow=None):
+    """The result of df as a list of tuples of Python values, like [(row.a, row.b) for row in df.collect()]."""
+    fetched = fetch_columns(df, *columns, use_arrow=use_arrow)
+    return list(zip(*[values.tolist() for values in fetched.values()]))
+
+
+def columns_equal(actual, expected_rows):
+    """Compare fetched columns with expected rows (a list of tuples) one column at a time."""
+    if not isinstance(actual, dict):
+        actual = fetch_columns(actual)
+    columns = list(actual.values())
+    if builtins.any(len(values) != len(expected_rows) for values in columns):
+        return False
+    expected_columns = list(zip(*expected_rows)) if expected_rows else [()] * len(columns)
+    if len(expected_columns) != len(columns):
+        return False
+
+    for values, expected in zip(columns, expected_columns):
+        try:
+            if values.dtype.kind == "f":
+                expected = np.array([np.nan if v is None else v for v in expected], dtype=float)
+                equal = np.array_equal(values, expected, equal_nan=True)
+            elif values.dtype.kind in "biu":
+                equal = np.array_equal(values, np.asarray(expected))
+            else:
+                equal = values.tolist() == list(expected)
+        except (TypeError, ValueError):
+            equal = False
+        if not equal:
+            return False
+    return True
+
+
+def benchmark_result_retrieval(sizes=(10, 10_000, 1_000_000)):
+    """Driver time and Python memory of fetching n-row results through Rows and through Arrow."""
+    results = []
+    for n in sizes:
+        df = spark.range(n).selectExpr("id", "id * 1.5 AS value", "CAST(id % 100 AS STRING) AS label")
+        for method, use_arrow in [("rows", False), ("arrow", True)]:
+            if use_arrow and pa is None:
+                continue
+            tracemalloc.start()
+            start = time.perf_counter()
+            columns = fetch_columns(df, use_arrow=use_arrow)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            arrow_bytes = pa.total_allocated_bytes() if use_arrow else 0
+            del columns
+            results.append({"rows": n, "method": method, "driver_time_s": elapsed, "python_peak_bytes": peak, "arrow_bytes": arrow_bytes})
+            print(f"{n:>9,} rows {method:>5}: {elapsed:7.3f}s, Python peak {format_bytes(peak):>9}, Arrow {format_bytes(arrow_bytes):>9}")
+    return results
+
+
 # COMMAND ----------
 
 
@@ -150,7 +370,7 @@ class SimpleSuite:
 def reset_working_dir():
     """Reset the working directory."""
     try:
-        dbutils.fs.rm(working_dir, True)
+        delete_tree(working_dir, background=True)
     except:
         pass
 
@@ -161,6 +381,107 @@ def reset_working_dir():
         print(f"Failed to create working directory: {working_dir}")
 
 
+# COMMAND ----------
+
+# Tables and views that the classroom setup resets in the ceu database
+course_tables = ["sales", "users", "products", "events"]
+setup_fingerprint_path = f"{working_dir}/_setup_fingerprint.json"
+
+
+def working_dir_state():
+    """List the working directory (without the setup fingerprint), or None if it is missing."""
+    try:
+        return sorted(
+            f.name for f in dbutils.fs.ls(working_dir) if f.name != "_setup_fingerprint.json"
+        )
+    except:
+        return None
+
+
+def course_catalog_state():
+    """Return (name, type, view text) of the course tables in ceu with one SHOW TABLE EXTENDED, or None if ceu does not exist."""
+    try:
+        rows = spark.sql(f"SHOW TABLE EXTENDED IN ceu LIKE '{'|'.join(course_tables)}'").collect()
+    except:
+        return None
+    state = []
+    for row in rows:
+        information = dict(line.split(": ", 1) for line in row.information.splitlines() if ": " in line)
+        kind = "TEMPORARY VIEW" if row.isTemporary else information.get("Type", "").upper()
+        state.append((row.tableName, kind, information.get("View Text")))
+    return sorted(state, key=lambda table: table[:2])
+
+
+def course_view_text(path):
+    return f"SELECT * FROM delta.`{path}`"
+
+
+def reset_course_catalog(views=None):
+    """Make the course tables in ceu exactly the given views (name -> Delta path), none by default.
+
+    Only tables that differ from that are dropped or created, so an
+    unchanged catalog costs the one listing in course_catalog_state().
+    """
+    state = course_catalog_state()
+    if state is None:
+        spark.sql("CREATE DATABASE IF NOT EXISTS ceu")
+        state = []
+    spark.catalog.setCurrentDatabase("ceu")
+
+    missing = {name: course_view_text(path) for name, path in (views or {}).items()}
+    for name, kind, view_text in state:
+        if kind == "VIEW" and missing.get(name) == view_text:
+            del missing[name]
+        elif kind in ("VIEW", "TEMPORARY VIEW"):
+            spark.sql(f"DROP VIEW IF EXISTS {name}")
+        else:
+            spark.sql(f"DROP TABLE IF EXISTS {name}")
+
+    for name, view_text in missing.items():
+        spark.sql(f"CREATE VIEW {name} AS {view_text}")
+
+
+class ClassroomSetup:
+    """Runs classroom setup steps, skipping the ones whose inputs match the fingerprint in the working dir."""
+
+    def __init__(self):
+        self.timings = []
+        try:
+            self.fingerprints = json.loads(dbutils.fs.head(setup_fingerprint_path))
+        except:
+            self.fingerprints = {}
+
+    @staticmethod
+    def _fingerprint(value):
+        return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+    def step(self, name, action, inputs=None):
+        """Run action unless inputs() still matches the state recorded after its last run."""
+        start = time.time()
+        if inputs is not None and self.fingerprints.get(name) == self._fingerprint(inputs()):
+            self.timings.append((name, time.time() - start, True))
+            return False
+
+        action()
+        if inputs is not None:
+            self.fingerprints[name] = self._fingerprint(inputs())
+        self.timings.append((name, time.time() - start, False))
+        return True
+
+    def finish(self):
+        """Record the fingerprints in the working dir and print the timing breakdown."""
+        try:
+            dbutils.fs.put(setup_fingerprint_path, json.dumps(self.fingerprints), True)
+        except:
+            pass
+
+        total = builtins.sum(seconds for _, seconds, _ in self.timings)
+        displayHTML(f"⏱️ Setup took {total:.2f}s")
+        for name, seconds, skipped in self.timings:
+            status = "skipped, unchanged" if skipped else "ran"
+            displayHTML(f"- {name}: {seconds:.2f}s ({status})")
+
+
 # COMMAND ----------
 
 
@@ -173,9 +494,21 @@ def cleanup():
     except:
         pass
 
+    try:
+        unpersisted = DA.frames.unpersist_all()
+        if unpersisted:
+            print(f"Unpersisted {unpersisted} DataFrames cached by DA.frames")
+    except:
+        pass
+
+    try:
+        print_cache_report(DA.cache.unpersist_all())
+    except:
+        pass
+
     try:
         # Remove working directory
-        dbutils.fs.rm(working_dir, True)
+        delete_tree(working_dir, background=True)
         print(f"Removed working directory: {working_dir}")
     except:
         pass
@@ -184,3 +517,75 @@ def cleanup():
 
 # Add cleanup function to maintain compatibility
 DA.cleanup = cleanup
+
+# COMMAND ----------
+
+# MAGIC %run ./_spark_metrics
+
+# COMMAND ----------
+
+# MAGIC %run ./_delete_tree
+
+# COMMAND ----------
+
+# MAGIC %run ./_dataset_mirror
+
+# COMMAND ----------
+
+# MAGIC %run ./_datasets
+
+# COMMAND ----------
+
+# MAGIC %run ./_frames
+
+# COMMAND ----------
+
+# MAGIC %run ./_schema_registry
+
+# COMMAND ----------
+
+# MAGIC %run ./_hourly_conversion
+
+# COMMAND ----------
+
+# MAGIC %run ./_write_profiles
+
+# COMMAND ----------
+
+# MAGIC %run ./_delta_compaction
+
+# COMMAND ----------
+
+# MAGIC %run ./_stream_verification
+
+# COMMAND ----------
+
+# MAGIC %run ./_scan_report
+
+# COMMAND ----------
+
+# MAGIC %run ./_jdbc
+
+# COMMAND ----------
+
+# MAGIC %run ./_object_store
+
+# COMMAND ----------
+
+# MAGIC %run ./_lint_plan
+
+# COMMAND ----------
+
+# MAGIC %run ./_cache_manager
+
+# COMMAND ----------
+
+# MAGIC %run ./_shuffle_sizing
+
+# COMMAND ----------
+
+# MAGIC %run ./_partition_skew
+
+# COMMAND ----------
+
+# MAGIC %run ./_job_recorder
@@ -0,0 +1,277 @@
+# Databricks notebook source
+# MAGIC %run ./_dataset_index
+
+# COMMAND ----------
+
+# Local read-through mirror of the course datasets.
+#
+# The core Delta tables and the `notebook_datasets` are copied once to
+# `mirror_dir` and `DA.paths` is pointed at the local copies. Notebooks build
+# the other paths as f"{DA.paths.datasets}/...", so DA.paths.datasets only
+# moves to the mirror once every one of `notebook_datasets` is mirrored;
+# dataset_path() resolves any other mirrored dataset to its local copy. A copy is only reused while its
+# fingerprint (Delta version, or an etag built from the file listing) still
+# matches the source, and the least recently used copies are evicted once the
+# mirror grows past `mirror_budget_bytes`.
+#
+# The mirror must be visible to every executor: on local and single-node
+# clusters it lives on the driver's disk (`local_mirror_dir`), on multi-node
+# Databricks clusters such as the classroom cluster on DBFS
+# (`shared_mirror_dir`), where every notebook on the workspace shares one
+# copy. Elsewhere it stays off. Set `mirror_enabled` (and `mirror_dir`)
+# before `%run`-ing the setup to override this.
+#
+# Builtins such as sum/max are called through `builtins` because notebooks
+# commonly `from pyspark.sql.functions import *` into the shared namespace.
+
+import builtins
+import hashlib
+import json
+import time
+
+datasets_root = f"s3a://dbx-data-public/{data_source_version}"
+local_mirror_dir = "file:/tmp/spark-course-mirror"
+shared_mirror_dir = "dbfs:/tmp/spark-course-mirror"
+mirror_budget_bytes = 8 * 1024 * 1024 * 1024
+
+# Datasets the notebooks read as f"{DA.paths.datasets}/<dataset>"
+notebook_datasets = [
+    "/ecommerce/events/events-500k.json",
+    "/ecommerce/events/events.parquet",
+    "/ecommerce/sales/sales.parquet",
+    "/ecommerce/users/users-500k.csv",
+    "/people/people-with-dups.txt",
+    "/products/products.csv",
+]
+
+# COMMAND ----------
+
+
+def list_files_recursive(path):
+    """List every file below path with dbutils.fs.ls, returning FileInfo objects."""
+    files = []
+    pending = [path]
+    while pending:
+        for info in dbutils.fs.ls(pending.pop()):
+            if info.name.endswith("/"):
+                pending.append(info.path)
+            else:
+                files.append(info)
+    return files
+
+
+def listing_etag(path):
+    """Fingerprint the files below path by name, size and modification time; returns (etag, total bytes)."""
+    try:
+        files = list_files_recursive(path)
+    except Exception:
+        files = dbutils.fs.ls(path)
+    listing = sorted(
+        (f.path[len(path):], f.size, getattr(f, "modificationTime", 0))
+        for f in files
+    )
+    etag = hashlib.sha1(repr(listing).encode()).hexdigest()
+    return etag, builtins.sum(size for _, size, _ in listing)
+
+
+def delta_version(path):
+    """Return the latest committed version of the Delta table at path, or None if it is not a Delta table."""
+    try:
+        log_files = dbutils.fs.ls(f"{path.rstrip('/')}/_delta_log/")
+    except Exception:
+        return None
+
+    versions = [
+        int(f.name.split(".")[0])
+        for f in log_files
+        if f.name.endswith(".json") and f.name.split(".")[0].isdigit()
+    ]
+    return builtins.max(versions) if versions else None
+
+
+# COMMAND ----------
+
+
+class DatasetMirror:
+    """Copies datasets from the object store to local disk and tracks them in a manifest."""
+
+    def __init__(self, source_root, mirror_root, budget_bytes):
+        self.source_root = source_root.rstrip("/")
+        self.mirror_root = mirror_root.rstrip("/")
+        self.budget_bytes = budget_bytes
+        self.manifest_path = f"{self.mirror_root}/_mirror_manifest.json"
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            return json.loads(dbutils.fs.head(self.manifest_path, 16 * 1024 * 1024))
+        except Exception:
+            return {}
+
+    def _save_manifest(self):
+        dbutils.fs.put(self.manifest_path, json.dumps(self.manifest, indent=2), True)
+
+    def source_path(self, dataset):
+        return f"{self.source_root}{dataset}"
+
+    def local_path(self, dataset):
+        return f"{self.mirror_root}{dataset}"
+
+    def fingerprint(self, dataset):
+        """Return (fingerprint, size in bytes) of the remote copy of a dataset."""
+        source = self.source_path(dataset)
+        if dataset.endswith(".delta"):
+            version = delta_version(source)
+            if version is not None:
+                size = self.manifest.get(dataset, {}).get("bytes")
+                if size is None:
+                    size = builtins.sum(f.size for f in list_files_recursive(source))
+                return f"delta-v{version}", size
+
+        etag, size = listing_etag(source)
+        return f"etag-{etag}", size
+
+    def is_current(self, dataset, fingerprint=None):
+        """True if the local copy exists and matches the remote fingerprint."""
+        entry = self.manifest.get(dataset)
+        if entry is None:
+            return False
+        if fingerprint is None:
+            fingerprint, _ = self.fingerprint(dataset)
+        return entry["fingerprint"] == fingerprint
+
+    def fetch(self, dataset):
+        """Copy a dataset to the mirror unless the local copy is already current."""
+        fingerprint, size = self.fingerprint(dataset)
+        if self.is_current(dataset, fingerprint):
+            self.touch(dataset)
+            return self.local_path(dataset)
+
+        if size > self.budget_bytes:
+            print(f"❌ Not mirroring {dataset}: {size} bytes exceeds the mirror budget")
+            return None
+
+        start = time.time()
+        self.evict(size, keep=dataset)
+        dbutils.fs.rm(self.local_path(dataset), True)
+        dbutils.fs.cp(self.source_path(dataset), self.local_path(dataset), True)
+        self.manifest[dataset] = {
+            "fingerprint": fingerprint,
+            "bytes": size,
+            "last_used": time.time(),
+        }
+        self._save_manifest()
+        print(f"✅ Mirrored {dataset} ({size / 1024 / 1024:.1f} MB) in {time.time() - start:.1f}s")
+        return self.local_path(dataset)
+
+    def touch(self, dataset):
+        """Mark a dataset as used; the manifest is saved by the next fetch or apply_dataset_mirror()."""
+        self.manifest[dataset]["last_used"] = time.time()
+
+    def used_bytes(self, exclude=None):
+        return builtins.sum(entry["bytes"] for dataset, entry in self.manifest.items() if dataset != exclude)
+
+    def evict(self, incoming_bytes=0, keep=None):
+        """Drop least recently used copies until incoming_bytes fit in the budget.
+
+        keep is the dataset being (re)fetched: its stale copy is replaced by
+        the incoming bytes, so it neither counts towards the budget nor is evicted.
+        """
+        by_age = sorted(self.manifest.items(), key=lambda item: item[1]["last_used"])
+        for dataset, entry in by_age:
+            if self.used_bytes(exclude=keep) + incoming_bytes <= self.budget_bytes:
+                break
+            if dataset == keep:
+                continue
+            dbutils.fs.rm(self.local_path(dataset), True)
+            del self.manifest[dataset]
+            print(f"Evicted {dataset} from the dataset mirror ({entry['bytes']} bytes)")
+        self._save_manifest()
+
+    def resolve(self, dataset, fetch=True):
+        """Return the path notebooks should read a dataset from, mirroring it on a miss."""
+        try:
+            if fetch:
+                return self.fetch(dataset) or self.source_path(dataset)
+            if self.is_current(dataset):
+                self.touch(dataset)
+                return self.local_path(dataset)
+        except Exception as e:
+            print(f"❌ Dataset mirror unavailable for {dataset}: {e}")
+        return self.source_path(dataset)
+
+
+# COMMAND ----------
+
+
+def default_mirror_dir():
+    """Where every executor of this cluster can read the mirror from, or None.
+
+    Driver-local disk when the driver is the only executor, DBFS on a
+    multi-node Databricks cluster.
+    """
+    try:
+        if spark.sparkContext.master.startswith("local") or spark.conf.get(
+            "spark.databricks.cluster.profile", ""
+        ) == "singleNode":
+            return local_mirror_dir
+        if spark.conf.get("spark.databricks.clusterUsageTags.clusterId", ""):
+            return shared_mirror_dir
+    except Exception:
+        pass
+    return None
+
+
+def apply_dataset_mirror(fetch=True):
+    """Point DA.paths and the *_path globals at mirrored copies of the core and notebook datasets."""
+    global sales_path, users_path, events_path, products_path
+
+    mirror = DatasetMirror(datasets_root, mirror_dir, mirror_budget_bytes)
+    DA.mirror = mirror
+
+    # Notebook datasets first: a later fetch may evict an earlier copy, and
+    # DA.paths must not be left pointing at an evicted core table
+    resolved = {dataset: mirror.resolve(dataset, fetch=fetch) for dataset in notebook_datasets}
+
+    core = {
+        "sales": "/ecommerce/sales/sales.delta",
+        "users": "/ecommerce/users/users.delta",
+        "events": "/ecommerce/events/events.delta",
+        "products": "/products/products.delta",
+    }
+    for name, dataset in core.items():
+        setattr(DA.paths, name, mirror.resolve(dataset, fetch=fetch))
+
+    sales_path = DA.paths.sales
+    users_path = DA.paths.users
+    events_path = DA.paths.events
+    products_path = DA.paths.products
+
+    # The datasets root can only move once every dataset read through it is still mirrored
+    if builtins.all(
+        dataset in mirror.manifest and path == mirror.local_path(dataset) for dataset, path in resolved.items()
+    ):
+        DA.paths.datasets = f"{mirror.mirror_root}/"
+
+    try:
+        mirror._save_manifest()
+    except Exception:
+        pass
+
+    return mirror
+
+
+# COMMAND ----------
+
+try:
+    mirror_dir
+except NameError:
+    mirror_dir = default_mirror_dir() or local_mirror_dir
+
+try:
+    mirror_enabled
+except NameError:
+    mirror_enabled = default_mirror_dir() is not None
+
+if mirror_enabled:
+    apply_dataset_mirror()
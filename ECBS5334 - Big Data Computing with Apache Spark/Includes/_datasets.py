@@ -0,0 +1,111 @@
+# Databricks notebook source
+# MAGIC %run ./_dataset_index
+
+# COMMAND ----------
+
+# Manifest-driven dataset readers.
+#
+# `dataset_manifest` (Includes/_dataset_index.py, regenerated with
+# tools/build_dataset_manifest.py) knows every dataset's files, sizes, schema
+# and partition columns, so reads can pass the exact file list and schema to
+# Spark instead of listing directories and inferring types. A read never
+# lists the dataset: an entry without a schema is an error (regenerate the
+# manifest), not a reason to infer one at runtime.
+
+import builtins
+import math
+import re
+
+# COMMAND ----------
+
+
+def dataset_entry(dataset):
+    """Return the manifest entry of a dataset such as "/ecommerce/users/users-500k.csv"."""
+    try:
+        return dataset_manifest[dataset]
+    except KeyError:
+        raise KeyError(f"{dataset} is not in the dataset manifest; known datasets: {sorted(dataset_manifest)}")
+
+
+def dataset_path(dataset):
+    """Full path of a dataset: its copy in the dataset mirror when there is one, else below DA.paths.datasets."""
+    mirror = getattr(DA, "mirror", None)
+    if mirror is not None:
+        return mirror.local_path(dataset) if dataset in mirror.manifest else mirror.source_path(dataset)
+    return f"{DA.paths.datasets.rstrip('/')}{dataset}"
+
+
+def dataset_data_files(dataset):
+    """Return (full path, size) of the data files of a dataset, skipping _SUCCESS/_committed/_delta_log files."""
+    root = dataset_path(dataset)
+    files = []
+    for file in dataset_entry(dataset)["files"]:
+        name = file["path"].split("/")[-1]
+        if file["path"].startswith("_delta_log") or name.startswith(("_", ".")):
+            continue
+        files.append((f"{root}/{file['path']}" if file["path"] else root, file["size"]))
+    return files
+
+
+def read_dataset(dataset, **options):
+    """Read a dataset with the file list and schema from the manifest; pass inferSchema=True to infer instead."""
+    entry = dataset_entry(dataset)
+    root = dataset_path(dataset)
+    reader = spark.read.format(entry["format"]).options(**{**entry["options"], **options})
+    if entry["format"] == "delta":
+        return reader.load(root)
+
+    if "inferSchema" not in options:
+        if entry["schema"]:
+            reader = reader.schema(entry["schema"])
+        elif entry["format"] in ("csv", "json", "parquet"):
+            raise ValueError(
+                f"The dataset manifest has no schema for {dataset}; regenerate it with "
+                "python -m tools.build_dataset_manifest --data-root <copy of the datasets>"
+            )
+    if entry["partition_columns"]:
+        reader = reader.option("basePath", root)
+    files = [path for path, _ in dataset_data_files(dataset)]
+    return reader.load(files or root)
+
+
+def _conf_bytes(key, default):
+    value = str(spark.conf.get(key, default)).strip().lower()
+    number, unit = re.fullmatch(r"(\d+)\s*([kmgt]?)b?", value).groups()
+    return int(number) * 1024 ** " kmgt".index(unit or " ")
+
+
+def estimate_input_splits(dataset):
+    """Predict how many input partitions Spark will create for a dataset, from the manifest sizes.
+
+    Mirrors Spark's FilePartition planning: the split size is
+    min(maxPartitionBytes, max(openCostInBytes, bytes per core)) and splits are
+    bin-packed, each file adding openCostInBytes. Returns None when the
+    manifest has no sizes.
+    """
+    sizes = [size for _, size in dataset_data_files(dataset)]
+    if not sizes or None in sizes:
+        return None
+
+    max_partition_bytes = _conf_bytes("spark.sql.files.maxPartitionBytes", "128m")
+    open_cost = _conf_bytes("spark.sql.files.openCostInBytes", "4m")
+    parallelism = spark.sparkContext.defaultParallelism
+    total_bytes = builtins.sum(size + open_cost for size in sizes)
+    max_split_bytes = builtins.min(max_partition_bytes, builtins.max(open_cost, total_bytes // parallelism))
+
+    # The course files are uncompressed, so every file can be split
+    splits = []
+    for size in sizes:
+        if size > max_split_bytes:
+            pieces = math.ceil(size / max_split_bytes)
+            splits.extend([max_split_bytes] * (pieces - 1) + [size - max_split_bytes * (pieces - 1)])
+        else:
+            splits.append(size)
+
+    partitions, current = 0, 0
+    for split in sorted(splits, reverse=True):
+        if current and current + split > max_split_bytes:
+            partitions += 1
+            current = 0
+        current += split + open_cost
+    return partitions + (1 if current else 0)
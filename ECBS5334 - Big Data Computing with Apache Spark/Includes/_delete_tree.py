@@ -0,0 +1,211 @@
+# Databricks notebook source
+# Parallel deletion of directory trees such as working_dir.
+#
+# The tree is listed once, then its files are deleted on a bounded thread
+# pool. Paths on the driver's local filesystem are handled with os calls;
+# anything else (DBFS, s3a://, ...) goes through dbutils.fs. With
+# background=True a local tree is first renamed to a trash directory next to
+# it, so the caller can recreate the path immediately. Object stores have no
+# cheap rename, so there the deletion always runs in the foreground.
+#
+# A background deletion that fails records its error on the TreeDeletion
+# instead of raising in the thread; the trash directory it leaves behind is
+# swept by the next delete_tree() of the same path.
+
+import builtins
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+delete_parallelism = 16
+
+# Trash directories that a background deletion in this process is still working on
+_active_trash = set()
+
+# COMMAND ----------
+
+
+def local_fs_path(path):
+    """Return the OS path for a path on the driver's local filesystem, or None for DBFS/object stores."""
+    if path.startswith("file:"):
+        return "/" + path[len("file:"):].lstrip("/")
+    if ":" in path.split("/")[0]:
+        return None
+    # Scheme-less paths resolve against the default filesystem (dbfs:/ on Databricks)
+    try:
+        default_fs = spark.sparkContext._jsc.hadoopConfiguration().get("fs.defaultFS")
+    except Exception:
+        return None
+    return path if default_fs and default_fs.startswith("file:") else None
+
+
+class TreeDeletion:
+    """Lists a directory tree once and deletes its files in parallel."""
+
+    def __init__(self, path, parallelism=delete_parallelism):
+        self.path = path.rstrip("/")
+        self.parallelism = parallelism
+        self.local_path = local_fs_path(self.path)
+        self.files = []
+        self.dirs = []
+        self.deleted = 0
+        self.thread = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def scan(self):
+        """List every file (with its size) and directory below path."""
+        self.files, self.dirs = [], []
+        if self.local_path is not None:
+            if not os.path.exists(self.local_path):
+                return self
+            if os.path.isfile(self.local_path):
+                self.files.append((self.local_path, os.path.getsize(self.local_path)))
+                return self
+            for root, dirs, files in os.walk(self.local_path):
+                for name in dirs:
+                    dir_path = os.path.join(root, name)
+                    # os.walk does not descend into symlinked directories; the link itself is removed like a file
+                    if os.path.islink(dir_path):
+                        self.files.append((dir_path, 0))
+                    else:
+                        self.dirs.append(dir_path)
+                for name in files:
+                    file_path = os.path.join(root, name)
+                    self.files.append((file_path, os.lstat(file_path).st_size))
+            return self
+
+        try:
+            level = dbutils.fs.ls(self.path)
+        except Exception:
+            return self
+        with ThreadPoolExecutor(self.parallelism) as pool:
+            while level:
+                subdirs = []
+                for info in level:
+                    if info.name.endswith("/"):
+                        subdirs.append(info.path)
+                    else:
+                        self.files.append((info.path, info.size))
+                self.dirs.extend(subdirs)
+                level = [info for listing in pool.map(dbutils.fs.ls, subdirs) for info in listing]
+        return self
+
+    def report(self):
+        """Summarize what a deletion would remove."""
+        return {
+            "path": self.path,
+            "files": len(self.files),
+            "dirs": len(self.dirs),
+            "bytes": builtins.sum(size for _, size in self.files),
+        }
+
+    def _delete_file(self, file_path):
+        if self.local_path is not None:
+            os.remove(file_path)
+        else:
+            dbutils.fs.rm(file_path)
+        with self._lock:
+            self.deleted += 1
+
+    def run(self, progress=True):
+        """Delete the listed files in parallel, then the (now empty) directories."""
+        total = len(self.files)
+        step = builtins.max(1, total // 10)
+        with ThreadPoolExecutor(self.parallelism) as pool:
+            for done, _ in enumerate(pool.map(self._delete_file, [f for f, _ in self.files]), 1):
+                if progress and (done % step == 0 or done == total):
+                    print(f"Deleted {done}/{total} files from {self.path}")
+
+        if self.local_path is not None:
+            for directory in sorted(self.dirs, key=len, reverse=True):
+                os.rmdir(directory)
+            if os.path.isdir(self.local_path):
+                os.rmdir(self.local_path)
+        else:
+            dbutils.fs.rm(self.path, True)
+        return self
+
+    def run_in_background(self, stale=()):
+        """Move a local tree to a trash directory and delete it, and the stale trash directories, from a daemon thread."""
+        trash_path = os.path.join(
+            os.path.dirname(self.local_path),
+            f".trash-{os.path.basename(self.local_path)}-{uuid.uuid4().hex[:8]}",
+        )
+        os.rename(self.local_path, trash_path)
+        _active_trash.add(trash_path)
+        self.files = [(trash_path + f[len(self.local_path):], size) for f, size in self.files]
+        self.dirs = [trash_path + d[len(self.local_path):] for d in self.dirs]
+        self.local_path = trash_path
+        self.thread = threading.Thread(target=self._run_recorded, args=(list(stale),), daemon=True)
+        self.thread.start()
+        return self
+
+    def _run_recorded(self, stale):
+        try:
+            sweep_trash(stale, self.parallelism)
+            self.run(progress=False)
+        except Exception as e:
+            # Nothing would see an exception raised in the thread; keep it for wait() and the next sweep
+            self.error = e
+        finally:
+            _active_trash.discard(self.local_path)
+
+    def wait(self):
+        """Block until a background deletion has finished; its error, if any, is in `error`."""
+        if self.thread is not None:
+            self.thread.join()
+        return self
+
+
+def stale_trash(local_path):
+    """Trash directories left next to local_path by earlier background deletions that did not finish."""
+    parent, name = os.path.split(local_path.rstrip("/"))
+    try:
+        entries = sorted(os.listdir(parent))
+    except OSError:
+        return []
+    return [
+        os.path.join(parent, entry)
+        for entry in entries
+        if entry.startswith(f".trash-{name}-") and os.path.join(parent, entry) not in _active_trash
+    ]
+
+
+def sweep_trash(trash_paths, parallelism=delete_parallelism):
+    """Delete stale trash directories; returns [(path, error)] for the ones that could not be removed."""
+    failures = []
+    for trash_path in trash_paths:
+        try:
+            TreeDeletion(f"file:{trash_path}", parallelism).scan().run(progress=False)
+        except Exception as e:
+            failures.append((trash_path, e))
+    for trash_path, error in failures:
+        print(f"❌ Could not remove {trash_path}: {error}")
+    return failures
+
+
+def delete_tree(path, parallelism=delete_parallelism, dry_run=False, background=False, progress=True):
+    """Delete a directory tree with parallel file deletes.
+
+    dry_run only prints the size report. background moves local trees out of
+    the way and deletes them from a thread; it has no effect on object stores.
+    Trash left next to a local path by an earlier background deletion is
+    removed as well. Returns the TreeDeletion, whose `deleted` counter tracks
+    progress and whose `error` holds the exception of a failed background run.
+    """
+    deletion = TreeDeletion(path, parallelism).scan()
+    report = deletion.report()
+    if dry_run:
+        print(
+            f"Would delete {report['files']} files in {report['dirs']} directories "
+            f"({format_bytes(report['bytes'])}) from {path}"
+        )
+        return deletion
+
+    stale = stale_trash(deletion.local_path) if deletion.local_path is not None else []
+    if background and deletion.local_path is not None and os.path.exists(deletion.local_path):
+        return deletion.run_in_background(stale)
+    sweep_trash(stale, parallelism)
+    return deletion.run(progress=progress)
@@ -0,0 +1,231 @@
+# Databricks notebook source
+# OPTIMIZE-style compaction of small files in Delta tables.
+#
+# Partitioned writes such as ASP 6.1's partitionBy("state") leave many small
+# Parquet files, and every later read pays for opening them.
+# compact_delta_table() bin-packs the active files of each partition into
+# bins of up to `target_file_bytes` and rewrites them as one Delta
+# transaction, then reports file count, bytes and scan time before and after.
+#
+# Delta 2.0+ (and Databricks) ship a bin-packing OPTIMIZE, which is used when
+# available. Older open-source Delta versions fall back to rewriting the
+# partitions that have something to compact with one replaceWhere overwrite
+# marked dataChange=false, one output file per planned bin. The rewrite only
+# commits if the table is still at the version it was planned on; if it then
+# leaves a different number of files than planned, the error names the
+# version to restore.
+
+import builtins
+from urllib.parse import unquote
+
+compaction_target_file_bytes = 128 * 1024 * 1024
+
+# COMMAND ----------
+
+
+def _relative_path(full_path, root):
+    """Path of full_path below root, ignoring the scheme (file:, dbfs:) either of them may carry."""
+    return full_path.split(root.split(":", 1)[-1].rstrip("/") + "/", 1)[-1]
+
+
+def delta_active_files(path):
+    """Return [(relative path, size)] of the files in the current version of the Delta table at path."""
+    active = {_relative_path(f, path) for f in spark.read.format("delta").load(path).inputFiles()}
+    return [
+        (_relative_path(info.path, path), info.size)
+        for info in list_files_recursive(path)
+        if _relative_path(info.path, path) in active
+    ]
+
+
+def partition_of(relative_path):
+    """The partition directory of a data file, e.g. "state=CA" ("" for unpartitioned tables)."""
+    return relative_path.rsplit("/", 1)[0] if "/" in relative_path else ""
+
+
+def plan_compaction(path, target_file_bytes=compaction_target_file_bytes):
+    """Bin-pack the small files of each partition (first fit decreasing); returns {partition: [[(file, size)], ...]}.
+
+    Only partitions where at least one bin holds two or more files are
+    included, since rewriting a single file gains nothing.
+    """
+    partitions = {}
+    for relative, size in delta_active_files(path):
+        partitions.setdefault(partition_of(relative), []).append((relative, size))
+
+    plan = {}
+    for partition, files in partitions.items():
+        bins = bin_pack(files, target_file_bytes)
+        if any(len(candidate) > 1 for candidate in bins):
+            plan[partition] = bins
+    return plan
+
+
+def bin_pack(files, target_file_bytes):
+    """First fit decreasing over [(file, size)]; files of target_file_bytes or more get a bin of their own."""
+    bins = []
+    for file in sorted(files, key=lambda f: f[1], reverse=True):
+        if file[1] >= target_file_bytes:
+            bins.append([file])
+            continue
+        for candidate in bins:
+            if builtins.sum(size for _, size in candidate) + file[1] <= target_file_bytes:
+                candidate.append(file)
+                break
+        else:
+            bins.append([file])
+    return bins
+
+
+def number_bins(plan):
+    """Map every planned file to a dense bin index 0..n-1 over all partitions of the plan."""
+    bin_of_file = {}
+    index = 0
+    for bins in plan.values():
+        for files in bins:
+            for relative, _ in files:
+                bin_of_file[relative] = index
+            index += 1
+    return bin_of_file
+
+
+def table_file_stats(path):
+    files = delta_active_files(path)
+    return {"files": len(files), "bytes": builtins.sum(size for _, size in files)}
+
+
+def timed_full_scan(path):
+    with SparkMetrics() as metrics:
+        spark.read.format("delta").load(path).write.format("noop").mode("overwrite").save()
+    return metrics.metrics["wall_time_s"]
+
+
+# COMMAND ----------
+
+
+def _partition_predicate(partition):
+    clauses = []
+    for part in partition.split("/"):
+        column, value = part.split("=", 1)
+        value = unquote(value)
+        if value == "__HIVE_DEFAULT_PARTITION__":
+            clauses.append(f"`{column}` IS NULL")
+        else:
+            escaped = value.replace("'", "\\'")
+            clauses.append(f"`{column}` = '{escaped}'")
+    return "(" + " AND ".join(clauses) + ")"
+
+
+def _hash_partition_keys(count):
+    """One long key per partition i < count such that repartition(count, key) sends it to partition i.
+
+    repartition(n, column) places a row in pmod(hash(column), n), with the
+    same Murmur3 hash as F.hash(), so the keys are found by hashing a range.
+    """
+    from pyspark.sql import functions as F
+
+    rows = (spark.range(count * 64)
+              .select(F.pmod(F.hash("id"), F.lit(count)).alias("partition"), F.col("id").alias("key"))
+              .groupBy("partition")
+              .agg(F.min("key").alias("key"))
+              .collect())
+    keys = {row["partition"]: row["key"] for row in rows}
+    return [keys[partition] for partition in range(count)]
+
+
+def _rewrite_bins(path, plan, version):
+    """Rewrite the planned partitions in one replaceWhere transaction, one output file per bin.
+
+    version is the table version the plan was made from; nothing is written
+    if the table has moved on since. Returns the number of bins, i.e. the
+    files the rewrite should leave in place of the planned ones.
+    """
+    from pyspark.sql import functions as F
+
+    partition_columns = [part.split("=", 1)[0] for part in next(iter(plan)).split("/") if part]
+    bin_count = builtins.sum(len(bins) for bins in plan.values())
+    # A bin's key hashes to the bin's own index, so every bin gets a task (and a file) of its own
+    bin_keys = _hash_partition_keys(bin_count)
+    bin_lookup = F.create_map(*[
+        F.lit(x) for relative, index in number_bins(plan).items() for x in (relative, bin_keys[index])
+    ])
+    root = path.split(":", 1)[-1].rstrip("/") + "/"
+    relative_name = F.expr(f"substr(input_file_name(), instr(input_file_name(), '{root}') + {len(root)})")
+
+    # The keys were found among long ids, and an int hashes differently, hence the cast
+    df = spark.read.format("delta").option("versionAsOf", version).load(path).withColumn(
+        "_compaction_bin", F.coalesce(bin_lookup[relative_name], F.lit(bin_keys[0])).cast("long")
+    )
+    writer_options = {"dataChange": "false"}
+    if partition_columns:
+        predicate = " OR ".join(_partition_predicate(partition) for partition in plan)
+        df = df.where(predicate)
+        writer_options["replaceWhere"] = predicate
+
+    current_version = delta_version(path)
+    if current_version != version:
+        raise RuntimeError(
+            f"{path} changed from version {version} to {current_version} since the compaction was planned; "
+            "nothing was rewritten, run compact_delta_table() again"
+        )
+    (df.repartition(bin_count, "_compaction_bin")
+       .drop("_compaction_bin")
+       .write.format("delta")
+       .mode("overwrite")
+       .options(**writer_options)
+       .partitionBy(*partition_columns)
+       .save(path))
+    return bin_count
+
+
+def _optimize_unsupported(error):
+    """Whether OPTIMIZE failed because this Delta version has none, as opposed to any other failure."""
+    from pyspark.sql.utils import AnalysisException, ParseException
+
+    # The statement is generated here, so a parse error means there is no OPTIMIZE syntax
+    if isinstance(error, ParseException):
+        return True
+    return isinstance(error, AnalysisException) and "OPTIMIZE" in str(error) and "not supported" in str(error)
+
+
+def compact_delta_table(path, target_file_bytes=compaction_target_file_bytes):
+    """Bin-pack the small files of the Delta table at path into files of up to target_file_bytes."""
+    path = path.rstrip("/")
+    before = {**table_file_stats(path), "scan_time_s": timed_full_scan(path)}
+
+    version = delta_version(path)
+    plan = plan_compaction(path, target_file_bytes)
+    if not plan:
+        print(f"✅ {path} has nothing to compact ({before['files']} files, {format_bytes(before['bytes'])})")
+        return {"before": before, "after": before, "method": None}
+
+    expected_files = None
+    max_file_size_key = "spark.databricks.delta.optimize.maxFileSize"
+    previous_max_file_size = spark.conf.get(max_file_size_key, None)
+    spark.conf.set(max_file_size_key, str(target_file_bytes))
+    try:
+        spark.sql(f"OPTIMIZE delta.`{path}`")
+        method = "OPTIMIZE"
+    except Exception as e:
+        # Delta before 2.0 has no OPTIMIZE
+        if not _optimize_unsupported(e):
+            raise
+        planned_files = builtins.sum(len(files) for bins in plan.values() for files in bins)
+        expected_files = before["files"] - planned_files + _rewrite_bins(path, plan, version)
+        method = "replaceWhere rewrite"
+    finally:
+        if previous_max_file_size is None:
+            spark.conf.unset(max_file_size_key)
+        else:
+            spark.conf.set(max_file_size_key, previous_max_file_size)
+
+    after = {**table_file_stats(path), "scan_time_s": timed_full_scan(path)}
+    if expected_files is not None and after["files"] != expected_files:
+        raise RuntimeError(
+            f"Compacting {path} left {after['files']} files instead of {expected_files}; the data is unchanged, "
+            f"but to undo the rewrite restore version {version}: RESTORE TABLE delta.`{path}` TO VERSION AS OF {version}"
+        )
+    print(f"✅ Compacted {len(plan)} partitions of {path} with {method}")
+    for label, stats in [("before", before), ("after", after)]:
+        print(f"{label:>8}: {stats['files']:>6} files, {format_bytes(stats['bytes']):>10}, full scan {stats['scan_time_s']:.2f}s")
+    return {"before": before, "after": after, "method": method}
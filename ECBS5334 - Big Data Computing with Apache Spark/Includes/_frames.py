@@ -0,0 +1,100 @@
+# Databricks notebook source
+# Lazy, memoized DataFrames for the course tables, e.g. DA.frames.events.
+#
+# Each table is loaded on first access and pinned to the Delta version that
+# was current at that point, so the log replay and schema analysis happen
+# once per version instead of once per `spark.read`. The table's version is
+# re-checked at most every `ttl_seconds`; a new version replaces the cached
+# DataFrame.
+
+import time
+
+from pyspark import StorageLevel
+
+# COMMAND ----------
+
+
+class DataFrameRegistry:
+    """Builds DataFrames for the DA.paths Delta tables on first access."""
+
+    def __init__(self, paths, ttl_seconds=30):
+        self._paths = paths
+        self._ttl_seconds = ttl_seconds
+        self._frames = {}
+        self._storage_level = None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.get(name)
+
+    def __dir__(self):
+        return [name for name in vars(self._paths) if name not in ("datasets", "working_dir")]
+
+    def persist(self, storage_level):
+        """Opt in to persisting every registered DataFrame at the given StorageLevel."""
+        if not isinstance(storage_level, StorageLevel):
+            raise TypeError(f"Expected a pyspark.StorageLevel, got {storage_level!r}")
+        self._storage_level = storage_level
+        for entry in self._frames.values():
+            entry["df"].unpersist()
+            entry["df"].persist(storage_level)
+        return self
+
+    def get(self, name):
+        """Return the DataFrame for a table in DA.paths, loading it if needed."""
+        path = getattr(self._paths, name)
+        entry = self._frames.get(name)
+        now = time.time()
+
+        if entry is not None and now - entry["checked_at"] < self._ttl_seconds:
+            return entry["df"]
+
+        version = delta_version(path)
+        if entry is not None and entry["path"] == path and entry["version"] == version:
+            entry["checked_at"] = now
+            return entry["df"]
+
+        if entry is not None:
+            entry["df"].unpersist()
+
+        reader = spark.read.format("delta")
+        if version is not None:
+            reader = reader.option("versionAsOf", version)
+        df = reader.load(path)
+        if self._storage_level is not None:
+            df.persist(self._storage_level)
+
+        self._frames[name] = {
+            "df": df,
+            "path": path,
+            "version": version,
+            "schema": df.schema,
+            "checked_at": now,
+        }
+        return df
+
+    def schema(self, name):
+        """Return the memoized schema of a table."""
+        self.get(name)
+        return self._frames[name]["schema"]
+
+    def version(self, name):
+        """Return the Delta version the cached DataFrame is pinned to."""
+        self.get(name)
+        return self._frames[name]["version"]
+
+    def unpersist_all(self):
+        """Unpersist and forget every DataFrame the registry has built."""
+        count = 0
+        for entry in self._frames.values():
+            if entry["df"].is_cached:
+                entry["df"].unpersist()
+                count += 1
+        self._frames = {}
+        return count
+
+
+# COMMAND ----------
+
+DA.frames = DataFrameRegistry(DA.paths)
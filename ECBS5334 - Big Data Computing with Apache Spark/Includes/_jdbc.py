@@ -0,0 +1,123 @@
+# Databricks notebook source
+# Balanced JDBC reads and the training database connection.
+#
+# spark.read.jdbc with a static lowerBound/upperBound splits the id range
+# into equal strides, so skewed or sparse ids give badly unbalanced
+# partitions. read_jdbc_balanced() derives the split points from the table
+# instead: from MIN/MAX ("minmax") or from quantiles of the partition column
+# that the database computes with NTILE ("quantiles"), and sizes `fetchsize`
+# from the expected rows per partition. jdbc_partition_report() shows the resulting rows and time per
+# partition.
+#
+# `training_jdbc` points at the training Postgres database, or at the local
+# SQLite stand-in built by `python -m tools.local_jdbc seed` when it exists.
+
+import builtins
+import os
+import time
+from types import SimpleNamespace
+
+local_jdbc_db = "/tmp/spark-course-jdbc/training.db"
+
+if os.path.exists(local_jdbc_db):
+    training_jdbc = SimpleNamespace(
+        url=f"jdbc:sqlite:{local_jdbc_db}",
+        table="people_1m",
+        properties={"driver": "org.sqlite.JDBC"},
+    )
+else:
+    training_jdbc = SimpleNamespace(
+        url="jdbc:postgresql://server1.training.databricks.com/training",
+        table="training.people_1m",
+        # Username and Password w/read-only rights
+        properties={"user": "training", "password": "training", "driver": "org.postgresql.Driver"},
+    )
+
+# COMMAND ----------
+
+
+def _jdbc_query(url, query, properties):
+    return spark.read.jdbc(url=url, table=f"({query}) q", properties=properties)
+
+
+def jdbc_column_stats(url, table, column, properties):
+    """MIN, MAX and COUNT of the partition column, computed by the database."""
+    row = _jdbc_query(
+        url, f"SELECT MIN({column}) AS lo, MAX({column}) AS hi, COUNT(*) AS n FROM {table}", properties
+    ).first()
+    return row["lo"], row["hi"], row["n"]
+
+
+def jdbc_quantile_bounds_query(table, column, num_partitions):
+    """SQL returning the first value of each of num_partitions equally sized NTILE buckets of column, in order."""
+    return (
+        f"SELECT MIN({column}) AS bound FROM ("
+        f"SELECT {column}, NTILE({num_partitions}) OVER (ORDER BY {column}) AS tile "
+        f"FROM {table} WHERE {column} IS NOT NULL"
+        f") t GROUP BY tile ORDER BY tile"
+    )
+
+
+def jdbc_quantile_bounds(url, table, column, num_partitions, properties):
+    """Split points for num_partitions equally sized partitions, from exact quantiles of column.
+
+    The database ranks the whole column with NTILE, so gaps or periodic
+    patterns in the ids cannot bias the bounds, and only num_partitions
+    values are transferred.
+    """
+    rows = _jdbc_query(url, jdbc_quantile_bounds_query(table, column, num_partitions), properties).collect()
+    # The first bucket starts at MIN(column); its partition is open-ended below
+    return sorted(set(row["bound"] for row in rows[1:]))
+
+
+def jdbc_range_predicates(column, bounds):
+    """One WHERE clause per partition for the given split points; nulls go to the last partition."""
+    if not bounds:
+        return ["1 = 1"]
+    predicates = [f"{column} < {bounds[0]}"]
+    predicates += [f"{column} >= {lo} AND {column} < {hi}" for lo, hi in zip(bounds, bounds[1:])]
+    predicates.append(f"{column} >= {bounds[-1]} OR {column} IS NULL")
+    return predicates
+
+
+def read_jdbc_balanced(url, table, column, num_partitions=8, properties=None, strategy="quantiles", fetchsize=None):
+    """Read a JDBC table in num_partitions partitions split by the actual distribution of column."""
+    properties = dict(properties or {})
+    lo, hi, rows = jdbc_column_stats(url, table, column, properties)
+    # Large enough to avoid round trips, small enough to keep executor memory flat
+    properties["fetchsize"] = str(fetchsize or builtins.min(10_000, builtins.max(1_000, rows // builtins.max(num_partitions, 1) // 10)))
+
+    if strategy == "minmax":
+        return spark.read.jdbc(
+            url=url,
+            table=table,
+            column=column,
+            lowerBound=lo,
+            upperBound=hi + 1,
+            numPartitions=num_partitions,
+            properties=properties,
+        )
+    if strategy == "quantiles":
+        bounds = jdbc_quantile_bounds(url, table, column, num_partitions, properties)
+        return spark.read.jdbc(url=url, table=table, predicates=jdbc_range_predicates(column, bounds), properties=properties)
+    raise ValueError(f"strategy must be 'minmax' or 'quantiles', not {strategy!r}")
+
+
+def jdbc_partition_report(df):
+    """Read every partition of df and report its rows and read time; returns [(partition, rows, seconds)]."""
+
+    def measure(index, rows):
+        start = time.time()
+        count = 0
+        for _ in rows:
+            count += 1
+        yield index, count, time.time() - start
+
+    partitions = sorted(df.rdd.mapPartitionsWithIndex(measure).collect())
+    counts = [rows for _, rows, _ in partitions]
+    mean = builtins.sum(counts) / builtins.max(len(counts), 1)
+    for index, rows, seconds in partitions:
+        print(f"partition {index:>3}: {rows:>10,} rows in {seconds:6.2f}s")
+    if mean:
+        print(f"{builtins.sum(counts):,} rows in {len(counts)} partitions, largest is {builtins.max(counts) / mean:.2f}x the mean")
+    return partitions
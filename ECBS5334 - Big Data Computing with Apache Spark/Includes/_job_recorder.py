@@ -0,0 +1,169 @@
+# Databricks notebook source
+# Record the jobs, stages and tasks a block of notebook code launches.
+#
+#     with JobRecorder() as aqe_off:
+#         df.count()
+#     aqe_off.render()
+#     compare_recordings({"AQE off": aqe_off, "AQE on": aqe_on})
+#
+# The recording comes from Spark's status store, which Spark's own
+# AppStatusListener fills from the listener bus: jobs through the status
+# tracker (attributed by job group, as in SparkMetrics) and task details
+# through the Spark UI REST API. Registering a listener from Python would need
+# the Py4J callback server, which shared clusters don't allow.
+#
+# Per task it keeps the duration, locality and the bytes and records read, so
+# the tasks of a scan stage are its input splits; stages that write or read
+# shuffle files mark the shuffle boundaries. record_split_counts() repeats a
+# scan for several spark.sql.files.maxPartitionBytes values.
+#
+# Without the Spark UI only job, stage and task counts are recorded.
+
+import builtins
+
+# COMMAND ----------
+
+
+def _task_record(task):
+    metrics = task.get("taskMetrics") or {}
+    shuffle_read = metrics.get("shuffleReadMetrics") or {}
+    return {
+        "index": task.get("index"),
+        "attempt": task.get("attempt", 0),
+        "status": task.get("status"),
+        "host": task.get("host"),
+        "locality": task.get("taskLocality"),
+        "duration_ms": task.get("duration", 0),
+        "input_bytes": (metrics.get("inputMetrics") or {}).get("bytesRead", 0),
+        "input_records": (metrics.get("inputMetrics") or {}).get("recordsRead", 0),
+        "shuffle_read_bytes": shuffle_read.get("localBytesRead", 0) + shuffle_read.get("remoteBytesRead", 0),
+        "shuffle_write_bytes": (metrics.get("shuffleWriteMetrics") or {}).get("bytesWritten", 0),
+    }
+
+
+def _duration_s(start, end):
+    start, end = ui_timestamp(start), ui_timestamp(end)
+    return end - start if start is not None and end is not None else None
+
+
+def _seconds(duration_s):
+    return f", {duration_s:.2f}s" if duration_s is not None else ""
+
+
+class JobRecorder(SparkMetrics):
+    """SparkMetrics plus every job, stage and task launched in the block, with durations, splits and shuffles."""
+
+    def __init__(self, max_tasks_per_stage=10_000):
+        super().__init__()
+        self.max_tasks_per_stage = max_tasks_per_stage
+        self.jobs = []
+
+    def stop(self):
+        tracker = spark.sparkContext.statusTracker()
+        job_ids = sorted(set(tracker.getJobIdsForGroup(self._group)) - self._known_jobs)
+        metrics = super().stop()
+
+        self.jobs = []
+        for job_id in job_ids:
+            data = spark_ui_json(f"jobs/{job_id}") or {}
+            info = tracker.getJobInfo(job_id)
+            self.jobs.append({
+                "job_id": job_id,
+                "description": data.get("description") or data.get("name", ""),
+                "status": data.get("status") or (info.status if info else "UNKNOWN"),
+                "duration_s": _duration_s(data.get("submissionTime"), data.get("completionTime")),
+                "stage_ids": sorted(data.get("stageIds") or (info.stageIds if info else [])),
+            })
+
+        for stage in self.stages:
+            stage["duration_s"] = _duration_s(stage["submission_time"], stage["completion_time"])
+            stage["shuffle"] = " + ".join(
+                label
+                for label, field in (("reads shuffle", "shuffle_read_bytes"), ("writes shuffle", "shuffle_write_bytes"))
+                if stage[field]
+            )
+            if stage["status"] == "SKIPPED":
+                stage["task_details"] = []
+                continue
+            tasks = spark_ui_json(
+                f"stages/{stage['stage_id']}/{stage['attempt_id']}/taskList?length={self.max_tasks_per_stage}&sortBy=ID"
+            )
+            stage["task_details"] = [_task_record(task) for task in tasks or []]
+            stage["input_splits"] = builtins.sum(1 for task in stage["task_details"] if task["input_bytes"] or task["input_records"])
+
+        ran = [stage for stage in self.stages if stage["status"] != "SKIPPED"]
+        metrics["input_splits"] = builtins.sum(stage.get("input_splits", 0) for stage in ran)
+        metrics["shuffle_boundaries"] = builtins.sum(1 for stage in ran if stage["shuffle_write_bytes"])
+        return metrics
+
+    def render(self):
+        """Show the recorded jobs, stages and per-stage task durations as a table."""
+        stages = {stage["stage_id"]: stage for stage in self.stages}
+        rows = []
+        for job in self.jobs:
+            rows.append(
+                f"<tr><td><b>Job {job['job_id']}</b></td><td colspan='6'>{job['description']} "
+                f"({job['status']}{_seconds(job['duration_s'])})</td></tr>"
+            )
+            for stage_id in job["stage_ids"]:
+                stage = stages.get(stage_id)
+                if stage is None:
+                    continue
+                durations = [task["duration_ms"] for task in stage.get("task_details", [])]
+                task_times = (
+                    f"{builtins.min(durations)} / {sorted(durations)[len(durations) // 2]} / {builtins.max(durations)} ms"
+                    if durations else ""
+                )
+                rows.append(
+                    f"<tr><td>Stage {stage_id}</td><td>{stage['status']}{_seconds(stage['duration_s'])}</td>"
+                    f"<td>{stage['tasks']}</td><td>{stage.get('input_splits', 0)}</td>"
+                    f"<td>{format_bytes(stage['input_bytes'])}</td><td>{stage['shuffle']}</td><td>{task_times}</td></tr>"
+                )
+        displayHTML(
+            "<table><tr><th></th><th>Status</th><th>Tasks</th><th>Input splits</th><th>Input</th>"
+            f"<th>Shuffle</th><th>Task min / median / max</th></tr>{''.join(rows)}</table>"
+        )
+
+
+def compare_recordings(recordings):
+    """Show several JobRecorder runs side by side; recordings maps a label to a finished recorder."""
+    fields = [
+        ("Wall time", lambda m: f"{m['wall_time_s']:.2f}s"),
+        ("Jobs", lambda m: m["jobs"]),
+        ("Stages", lambda m: m["stages"]),
+        ("Skipped stages", lambda m: m["skipped_stages"]),
+        ("Tasks", lambda m: m["tasks"]),
+        ("Input splits", lambda m: m["input_splits"]),
+        ("Shuffle boundaries", lambda m: m["shuffle_boundaries"]),
+        ("Input", lambda m: format_bytes(m["input_bytes"])),
+        ("Shuffle write", lambda m: format_bytes(m["shuffle_write_bytes"])),
+    ]
+    header = "".join(f"<th>{label}</th>" for label in recordings)
+    rows = "".join(
+        f"<tr><td>{name}</td>" + "".join(f"<td>{value(r.metrics)}</td>" for r in recordings.values()) + "</tr>"
+        for name, value in fields
+    )
+    displayHTML(f"<table><tr><th></th>{header}</tr>{rows}</table>")
+
+
+def record_split_counts(read, max_partition_bytes=("128MB", "32MB", "8MB"), action=lambda df: df.count()):
+    """Record action on read() under each spark.sql.files.maxPartitionBytes value and compare the runs.
+
+    read is called once per value, after the setting is changed, so file
+    splits are planned with it; any schema inference it triggers is not
+    recorded.
+    """
+    key = "spark.sql.files.maxPartitionBytes"
+    previous = spark.conf.get(key)
+    recordings = {}
+    try:
+        for value in max_partition_bytes:
+            spark.conf.set(key, value)
+            df = read()
+            with JobRecorder() as recorder:
+                action(df)
+            recordings[f"maxPartitionBytes={value}"] = recorder
+    finally:
+        spark.conf.set(key, previous)
+    compare_recordings(recordings)
+    return recordings
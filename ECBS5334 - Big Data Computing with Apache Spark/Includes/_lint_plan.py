@@ -0,0 +1,103 @@
+# Databricks notebook source
+# MAGIC %run ./_plan_helpers
+
+# COMMAND ----------
+
+# Query plan linter for the anti-patterns from ASP 4.1 - Query Optimization.
+#
+# lint_plan(df) walks df's optimized logical plan and its physical plan
+# (without running the query) and flags:
+#
+# - filters applied on top of a cached relation, where the filter can no
+#   longer be pushed down into the source scan
+# - Python UDFs, which move rows to Python workers and split whole-stage codegen
+# - cartesian products and broadcast nested loop joins
+# - a global sort without a limit, e.g. ahead of display(), which only shows
+#   the first rows but still sorts everything
+# - arrays that are exploded and then aggregated again
+#
+# Each finding carries the optimizer's size estimate of the data involved.
+
+import builtins
+
+# COMMAND ----------
+
+
+def _physical_root(plan):
+    """The first node of a physical plan that does real work, skipping AQE, codegen and projection wrappers."""
+    node = plan
+    while True:
+        name = _class_name(node)
+        if name == "AdaptiveSparkPlanExec":
+            node = node.executedPlan()
+        elif name in ("WholeStageCodegenExec", "InputAdapter", "ProjectExec", "ColumnarToRowExec"):
+            node = node.children().apply(0)
+        else:
+            return node
+
+
+def lint_plan(df):
+    """Flag query plan anti-patterns in df; returns a list of findings (rule, node, message, estimated_bytes)."""
+    query_execution = df._jdf.queryExecution()
+    findings = []
+
+    def flag(rule, node, message, estimated_bytes):
+        findings.append({"rule": rule, "node": _class_name(node), "message": message, "estimated_bytes": estimated_bytes})
+
+    for node in _plan_nodes(query_execution.executedPlan()):
+        name = _class_name(node)
+        if name == "InMemoryTableScanExec" and node.predicates().size() > 0:
+            flag(
+                "filter-after-cache",
+                node,
+                "Filters run on top of a cached relation instead of being pushed down into its source scan; "
+                "filter before caching, or don't cache",
+                _size_of_logical(node.relation()),
+            )
+        elif name in ("BatchEvalPythonExec", "ArrowEvalPythonExec"):
+            flag(
+                "python-udf",
+                node,
+                "A Python UDF sends every row to a Python worker and splits whole-stage codegen; "
+                "use built-in functions where possible",
+                _size_of_physical(node.children().apply(0)),
+            )
+        elif name in ("CartesianProductExec", "BroadcastNestedLoopJoinExec"):
+            sides = [_size_of_physical(child) for child in _java_seq(node.children())]
+            flag(
+                "nested-loop-join",
+                node,
+                f"{name} compares every pair of rows ({' x '.join(format_bytes(side) for side in sides)}); "
+                "add an equality join condition",
+                builtins.sum(sides),
+            )
+
+    root = _physical_root(query_execution.executedPlan())
+    # `global` is a Python keyword, hence getattr
+    if _class_name(root) == "SortExec" and getattr(root, "global")():
+        flag(
+            "sort-without-limit",
+            root,
+            "The whole result is sorted although display() only shows the first rows; add a limit() after the sort",
+            _size_of_physical(root),
+        )
+
+    for node in _logical_nodes(query_execution.optimizedPlan()):
+        if _class_name(node) != "Aggregate":
+            continue
+        below = list(_logical_nodes(node.children().apply(0)))
+        generates = [n for n in below if _class_name(n) == "Generate" and "explode" in n.generator().prettyName()]
+        if generates:
+            flag(
+                "explode-then-aggregate",
+                node,
+                "An exploded array is aggregated again; array functions such as size(), aggregate() or "
+                "transform() avoid multiplying the rows",
+                _size_of_logical(generates[0]),
+            )
+
+    for finding in findings:
+        print(f"❌ [{finding['rule']}] {finding['message']} (estimated {format_bytes(finding['estimated_bytes'])})")
+    if not findings:
+        print("✅ No plan anti-patterns found")
+    return findings
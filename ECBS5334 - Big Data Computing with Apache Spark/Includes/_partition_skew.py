@@ -0,0 +1,146 @@
+# Databricks notebook source
+# Rows and bytes per partition of a DataFrame, and how skewed they are.
+#
+# getNumPartitions() says how many partitions there are, not how evenly the
+# data is spread over them. inspect_partitions(df) runs one aggregation over
+# spark_partition_id(), so it measures the partitions df is actually computed
+# in: the files of a scan, the output of coalesce() or repartition(), or the
+# output of any shuffle in a pipeline (pass the DataFrame right after the
+# groupBy, join or dropDuplicates). Bytes are estimated per row from the
+# column values: fixed-width types by their size, strings and binaries by
+# their length and nested types by the length of their JSON.
+#
+# Skew is summarized as max/median and as the Gini coefficient of the sizes
+# (0 for equal partitions, close to 1 when one partition holds everything),
+# and the sizes are rendered as a histogram.
+
+import builtins
+import functools
+from types import SimpleNamespace
+
+_fixed_width_bytes = {
+    "BooleanType": 1,
+    "ByteType": 1,
+    "ShortType": 2,
+    "IntegerType": 4,
+    "FloatType": 4,
+    "DateType": 4,
+    "LongType": 8,
+    "DoubleType": 8,
+    "TimestampType": 8,
+    "TimestampNTZType": 8,
+    "DecimalType": 16,
+}
+
+# COMMAND ----------
+
+
+def _row_bytes_column(schema):
+    """A Column estimating the bytes of each row of schema."""
+    from pyspark.sql import functions as F
+
+    sizes = []
+    for field in schema.fields:
+        column = F.col(f"`{field.name.replace('`', '``')}`")
+        type_name = type(field.dataType).__name__
+        if type_name in ("StringType", "BinaryType"):
+            size = F.octet_length(column)
+        elif type_name in ("ArrayType", "MapType", "StructType"):
+            size = F.octet_length(F.to_json(column))
+        else:
+            size = F.when(column.isNotNull(), F.lit(_fixed_width_bytes.get(type_name, 8)))
+        sizes.append(F.coalesce(size, F.lit(0)))
+    return functools.reduce(lambda a, b: a + b, sizes, F.lit(0))
+
+
+def gini(values):
+    """Gini coefficient of non-negative values: 0 when all are equal, towards 1 when one holds everything."""
+    values = sorted(values)
+    n, total = len(values), builtins.sum(values)
+    if n == 0 or total == 0:
+        return 0.0
+    return builtins.sum((2 * i - n + 1) * value for i, value in enumerate(values)) / (n * total)
+
+
+def _max_over_median(values):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    middle = len(ordered) // 2
+    median = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    if median == 0:
+        return float("inf") if ordered[-1] else 0.0
+    return ordered[-1] / median
+
+
+def _histogram_html(partitions, max_bars=64, bins=16):
+    """One bar per partition, or a histogram of partition sizes when there are more than max_bars."""
+    largest = builtins.max([p["bytes"] for p in partitions] or [0]) or 1
+    bar = '<div style="background:#1f77b4;height:12px;width:{width}px"></div>'
+    if len(partitions) <= max_bars:
+        rows = "".join(
+            f"<tr><td>{p['partition']}</td><td>{p['rows']:,}</td><td>{format_bytes(p['bytes'])}</td>"
+            f"<td>{bar.format(width=builtins.round(300 * p['bytes'] / largest))}</td></tr>"
+            for p in partitions
+        )
+        return f"<table><tr><th>Partition</th><th>Rows</th><th>Bytes</th><th></th></tr>{rows}</table>"
+
+    width = largest / bins
+    counts = [0] * bins
+    for p in partitions:
+        counts[builtins.min(int(p["bytes"] / width), bins - 1)] += 1
+    most = builtins.max(counts)
+    rows = "".join(
+        f"<tr><td>{format_bytes(i * width)} - {format_bytes((i + 1) * width)}</td><td>{count:,}</td>"
+        f"<td>{bar.format(width=builtins.round(300 * count / most))}</td></tr>"
+        for i, count in enumerate(counts)
+    )
+    return f"<table><tr><th>Partition size</th><th>Partitions</th><th></th></tr>{rows}</table>"
+
+
+def inspect_partitions(df, num_partitions=None, show=True):
+    """Rows and estimated bytes per partition of df, with skew statistics, computed in one aggregation.
+
+    Partitions without rows don't show up in the aggregation; pass
+    num_partitions (e.g. df.rdd.getNumPartitions()) to count trailing empty
+    partitions too.
+    """
+    from pyspark.sql import functions as F
+
+    counted = (df
+               .select(F.spark_partition_id().alias("partition"), _row_bytes_column(df.schema).alias("bytes"))
+               .groupBy("partition")
+               .agg(F.count(F.lit(1)).alias("rows"), F.sum("bytes").alias("bytes"))
+               .collect())
+    by_id = {row["partition"]: row for row in counted}
+    total_partitions = builtins.max(num_partitions or 0, builtins.max(by_id, default=-1) + 1)
+    partitions = [
+        {
+            "partition": i,
+            "rows": by_id[i]["rows"] if i in by_id else 0,
+            "bytes": int(by_id[i]["bytes"] or 0) if i in by_id else 0,
+        }
+        for i in range(total_partitions)
+    ]
+
+    rows = [p["rows"] for p in partitions]
+    sizes = [p["bytes"] for p in partitions]
+    result = SimpleNamespace(
+        partitions=partitions,
+        rows=builtins.sum(rows),
+        bytes=builtins.sum(sizes),
+        empty_partitions=rows.count(0),
+        rows_max_over_median=_max_over_median(rows),
+        bytes_max_over_median=_max_over_median(sizes),
+        rows_gini=gini(rows),
+        bytes_gini=gini(sizes),
+    )
+
+    if show:
+        displayHTML(
+            f"<p>{len(partitions)} partitions ({result.empty_partitions} empty), {result.rows:,} rows, "
+            f"~{format_bytes(result.bytes)}; max/median {result.bytes_max_over_median:.2f} (bytes), "
+            f"{result.rows_max_over_median:.2f} (rows); Gini {result.bytes_gini:.2f} (bytes), {result.rows_gini:.2f} (rows)</p>"
+            + _histogram_html(partitions)
+        )
+    return result
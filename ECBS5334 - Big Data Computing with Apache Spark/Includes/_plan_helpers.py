@@ -0,0 +1,47 @@
+# Databricks notebook source
+# Walking Spark query plans through py4j, shared by _scan_report, _lint_plan
+# and _shuffle_sizing (each of them runs this include first).
+
+import builtins
+
+# COMMAND ----------
+
+
+def _java_seq(seq):
+    return [seq.apply(i) for i in range(seq.size())]
+
+
+def _class_name(node):
+    return node.getClass().getSimpleName()
+
+
+def _plan_nodes(node):
+    """Yield every node of an executed physical plan, looking through AQE and query stage wrappers."""
+    name = _class_name(node)
+    if name == "AdaptiveSparkPlanExec":
+        yield from _plan_nodes(node.executedPlan())
+        return
+    if name.endswith("QueryStageExec"):
+        yield from _plan_nodes(node.plan())
+        return
+    yield node
+    for child in _java_seq(node.children()):
+        yield from _plan_nodes(child)
+
+
+def _logical_nodes(node):
+    yield node
+    for child in _java_seq(node.children()):
+        yield from _logical_nodes(child)
+
+
+def _size_of_logical(node):
+    return int(node.stats().sizeInBytes().toString())
+
+
+def _size_of_physical(node):
+    """Size estimate of a physical node, from its logical counterpart or else its children."""
+    link = node.logicalLink()
+    if link.isDefined():
+        return _size_of_logical(link.get())
+    return builtins.sum(_size_of_physical(child) for child in _java_seq(node.children()))
@@ -0,0 +1,102 @@
+# Databricks notebook source
+# MAGIC %run ./_plan_helpers
+
+# COMMAND ----------
+
+# Scan pruning reports from physical plan metrics.
+#
+# scan_report(df) executes df's own physical plan (without collecting rows)
+# and reads back the metrics of every file scan in it: files and bytes in the
+# table versus files and bytes actually read, partitions read, partition and
+# pushed data filters, and which (nested) columns were read, e.g. only
+# `ecommerce.purchase_revenue_in_usd` from the `ecommerce` struct. Every
+# report is also appended to `scan_reports` so a lab's access patterns can be
+# audited afterwards.
+
+import json
+from pyspark.sql.types import StructType
+
+scan_reports = []
+
+# COMMAND ----------
+
+
+def _metric(node, name):
+    metric = node.metrics().get(name)
+    return metric.get().value() if metric.isDefined() else None
+
+
+def _metadata(node, key):
+    value = node.metadata().get(key)
+    return value.get() if value.isDefined() else None
+
+
+def _leaf_columns(schema, prefix=""):
+    """Dotted paths of the leaf fields of a StructType, descending into structs."""
+    columns = []
+    for field in schema.fields:
+        path = f"{prefix}{field.name}"
+        if isinstance(field.dataType, StructType):
+            columns.extend(_leaf_columns(field.dataType, f"{path}."))
+        else:
+            columns.append(path)
+    return columns
+
+
+def _scan_details(node):
+    location = node.relation().location()
+    table_columns = _leaf_columns(StructType.fromJson(json.loads(node.relation().dataSchema().json())))
+    read_columns = _leaf_columns(StructType.fromJson(json.loads(node.requiredSchema().json())))
+    try:
+        table_files = len(location.inputFiles())
+    except Exception:
+        table_files = None
+    return {
+        "table": location.rootPaths().head().toString(),
+        "files_in_table": table_files,
+        "bytes_in_table": location.sizeInBytes(),
+        "files_read": _metric(node, "numFiles"),
+        "bytes_read": _metric(node, "filesSize"),
+        "partitions_read": _metric(node, "numPartitions"),
+        "rows_output": _metric(node, "numOutputRows"),
+        "partition_filters": _metadata(node, "PartitionFilters"),
+        "pushed_filters": _metadata(node, "PushedFilters"),
+        "columns_read": read_columns,
+        "columns_pruned": [column for column in table_columns if column not in read_columns],
+    }
+
+
+def scan_report(df, execute=True):
+    """Report the file pruning of every file scan in df's plan.
+
+    With execute=True df's plan is run (rows are counted, not collected);
+    pass execute=False right after an action on the same DataFrame object,
+    e.g. df.collect(), to report on that run instead.
+    """
+    query_execution = df._jdf.queryExecution()
+    if execute:
+        query_execution.toRdd().count()
+
+    reports = [
+        _scan_details(node)
+        for node in _plan_nodes(query_execution.executedPlan())
+        if _class_name(node) == "FileSourceScanExec"
+    ]
+    for report in reports:
+        skipped = ""
+        if report["files_in_table"] and report["files_read"] is not None:
+            skipped = f" ({report['files_in_table'] - report['files_read']} skipped)"
+        print(f"Scan of {report['table']}")
+        print(f"  files read:     {report['files_read']} of {report['files_in_table']}{skipped}")
+        print(f"  bytes read:     {format_bytes(report['bytes_read'] or 0)} of {format_bytes(report['bytes_in_table'])}")
+        if report["partitions_read"] is not None:
+            print(f"  partitions:     {report['partitions_read']} read, filters {report['partition_filters']}")
+        print(f"  pushed filters: {report['pushed_filters']}")
+        print(f"  columns read:   {', '.join(report['columns_read'])}")
+        if report["columns_pruned"]:
+            print(f"  columns pruned: {len(report['columns_pruned'])} ({', '.join(report['columns_pruned'][:10])}{', ...' if len(report['columns_pruned']) > 10 else ''})")
+    if not reports:
+        print("No file scans in the plan (cached, in-memory or non-file source)")
+
+    scan_reports.extend(reports)
+    return reports
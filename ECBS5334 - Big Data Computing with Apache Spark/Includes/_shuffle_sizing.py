@@ -0,0 +1,219 @@
+# Databricks notebook source
+# MAGIC %run ./_plan_helpers
+
+# COMMAND ----------
+
+# spark.sql.shuffle.partitions sized from the data, per ASP 4.2's guidelines.
+#
+# estimate_shuffle_input_bytes() finds the operators of a query's optimized
+# plan that shuffle (aggregations, sort-merge and shuffled hash joins, global
+# sorts, repartitions, windows) and takes the largest size estimate of their
+# input. Where the optimizer has no statistics (JDBC or RDD sources) it falls
+# back to the size of the files read below that operator, and a shuffle with
+# no estimate at all is skipped.
+#
+# ShuffleSizing(df) turns the estimate into a partition count (input / ~200MB,
+# rounded up to a multiple of defaultParallelism) and sets it for the body of a
+# `with` block:
+#
+#     with ShuffleSizing(deduped_df):
+#         deduped_df.write.format("delta").save(path)
+#
+# The setting applies to queries planned inside the block, so run the action
+# there on df or a DataFrame derived from it; a DataFrame that already ran
+# keeps the plan it was given. With AQE, the count is the starting point that
+# AQE coalesces from.
+
+import builtins
+import contextlib
+import functools
+import math
+
+shuffle_target_partition_bytes = 200 * 1024**2
+
+# Every decision, most recent last
+shuffle_sizing_log = []
+
+_shuffling_nodes = (
+    "Aggregate",
+    "Join",
+    "Sort",
+    "Repartition",
+    "RepartitionByExpression",
+    "RebalancePartitions",
+    "Window",
+    "Deduplicate",
+)
+
+# COMMAND ----------
+
+
+def _file_bytes_below(node):
+    """Bytes of the files read by the file-based relations below a logical plan node."""
+    total = 0
+    for leaf in _logical_nodes(node):
+        if _class_name(leaf) == "LogicalRelation" and _class_name(leaf.relation()) == "HadoopFsRelation":
+            total += leaf.relation().location().sizeInBytes()
+    return total
+
+
+def estimate_shuffle_input_bytes(df):
+    """Largest estimated shuffle input in df's plan as (bytes, operator).
+
+    bytes is None when no shuffle can be estimated; operator is None when
+    nothing in the plan shuffles.
+    """
+    conf = spark._jsparkSession.sessionState().conf()
+    unknown = conf.defaultSizeInBytes()
+    broadcast_threshold = conf.autoBroadcastJoinThreshold()
+
+    def input_bytes(node):
+        size = _size_of_logical(node)
+        if size >= unknown:
+            return _file_bytes_below(node) or None
+        return size
+
+    largest, largest_node = 0, None
+    unestimated = None
+    for node in _logical_nodes(df._jdf.queryExecution().optimizedPlan()):
+        name = _class_name(node)
+        if name not in _shuffling_nodes:
+            continue
+        # `global` is a Python keyword, hence getattr
+        if name == "Sort" and not getattr(node, "global")():
+            continue
+        if name == "Repartition" and not node.shuffle():
+            continue
+        sides = [input_bytes(child) for child in _java_seq(node.children())]
+        # Without an estimate for one of its inputs this shuffle can't be sized; the others still can
+        if None in sides:
+            unestimated = unestimated or name
+            continue
+        # A side under the broadcast threshold is broadcast instead of shuffled
+        if name == "Join" and builtins.min(sides) <= broadcast_threshold:
+            continue
+        if largest_node is None or builtins.sum(sides) > largest:
+            largest, largest_node = builtins.sum(sides), name
+    if largest_node is None and unestimated:
+        return None, unestimated
+    return largest, largest_node
+
+
+def shuffle_partitions_for(input_bytes, target_bytes=shuffle_target_partition_bytes, parallelism=None):
+    """Partitions of about target_bytes for input_bytes, rounded up to a multiple of the cluster's cores."""
+    parallelism = parallelism or spark.sparkContext.defaultParallelism
+    partitions = builtins.max(1, math.ceil(input_bytes / target_bytes))
+    return math.ceil(partitions / parallelism) * parallelism
+
+
+class ShuffleSizing:
+    """Sets spark.sql.shuffle.partitions from df's estimated shuffle input for the body of a `with` block."""
+
+    def __init__(self, df, target_bytes=shuffle_target_partition_bytes, parallelism=None, quiet=False):
+        self.df = df
+        self.target_bytes = target_bytes
+        self.parallelism = parallelism
+        self.quiet = quiet
+        self.partitions = None
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = spark.conf.get("spark.sql.shuffle.partitions")
+        input_bytes, node = estimate_shuffle_input_bytes(self.df)
+        parallelism = self.parallelism or spark.sparkContext.defaultParallelism
+
+        if input_bytes is None:
+            self.partitions = self._previous
+            reason = f"the input of {node} has no size estimate, keeping {self._previous}"
+        elif node is None:
+            self.partitions = self._previous
+            reason = f"the plan has no shuffle exchange, keeping {self._previous}"
+        elif input_bytes == 0:
+            self.partitions = self._previous
+            reason = f"the input of {node} is estimated empty, keeping {self._previous}"
+        else:
+            self.partitions = shuffle_partitions_for(input_bytes, self.target_bytes, parallelism)
+            reason = (
+                f"largest shuffle input ({node}) is ~{format_bytes(input_bytes)}, "
+                f"{format_bytes(self.target_bytes)} per partition, multiple of {parallelism} cores"
+            )
+
+        spark.conf.set("spark.sql.shuffle.partitions", str(self.partitions))
+        shuffle_sizing_log.append({
+            "partitions": self.partitions,
+            "previous": self._previous,
+            "input_bytes": input_bytes,
+            "operator": node,
+            "reason": reason,
+        })
+        if not self.quiet:
+            print(f"spark.sql.shuffle.partitions = {self.partitions}: {reason}")
+        return self
+
+    def __exit__(self, *exc_info):
+        spark.conf.set("spark.sql.shuffle.partitions", self._previous)
+        return False
+
+
+# COMMAND ----------
+
+
+def _scaled(df, scale):
+    """df sampled down (scale < 1) or unioned with itself (scale > 1)."""
+    if scale < 1:
+        return df.sample(fraction=scale, seed=42)
+    return functools.reduce(lambda left, right: left.unionAll(right), [df] * int(scale))
+
+
+def benchmark_shuffle_sizing(scales=(0.25, 1, 4), settings=(8, 200, "auto"), df=None, query=None, coalesce=False):
+    """Run query at every scale of df (default: events) under fixed and sized shuffle partitions.
+
+    query maps a DataFrame to the DataFrame that is written to the noop
+    sink; the default de-duplicates events like ASP 4.2L does with people.
+    AQE's partition coalescing is off unless coalesce=True, so every setting
+    runs with the partition count it was given.
+    """
+    if df is None:
+        df = DA.frames.events
+    if query is None:
+        query = lambda scaled: scaled.dropDuplicates(["user_id", "event_timestamp"])
+
+    coalesce_key = "spark.sql.adaptive.coalescePartitions.enabled"
+    previous_coalesce = spark.conf.get(coalesce_key)
+    previous_partitions = spark.conf.get("spark.sql.shuffle.partitions")
+    spark.conf.set(coalesce_key, str(coalesce).lower())
+    results = []
+    try:
+        for scale in scales:
+            for setting in settings:
+                result_df = query(_scaled(df, scale))
+                if setting == "auto":
+                    sizing = ShuffleSizing(result_df, quiet=True)
+                else:
+                    spark.conf.set("spark.sql.shuffle.partitions", setting)
+                    sizing = None
+                with SparkMetrics() as m, sizing or contextlib.nullcontext():
+                    result_df.write.format("noop").mode("overwrite").save()
+                results.append({
+                    "scale": scale,
+                    "setting": str(setting),
+                    "partitions": sizing.partitions if sizing else setting,
+                    "wall_time_s": m.metrics["wall_time_s"],
+                    "tasks": m.metrics["tasks"],
+                    "shuffle_write_bytes": m.metrics["shuffle_write_bytes"],
+                    "spill_bytes": m.metrics["spill_bytes"],
+                })
+    finally:
+        spark.conf.set(coalesce_key, previous_coalesce)
+        spark.conf.set("spark.sql.shuffle.partitions", previous_partitions)
+
+    rows = "".join(
+        f"<tr><td>{r['scale']}x</td><td>{r['setting']}</td><td>{r['partitions']}</td><td>{r['wall_time_s']:.2f}s</td>"
+        f"<td>{r['tasks']}</td><td>{format_bytes(r['shuffle_write_bytes'])}</td><td>{format_bytes(r['spill_bytes'])}</td></tr>"
+        for r in results
+    )
+    displayHTML(
+        "<table><tr><th>Scale</th><th>Setting</th><th>Partitions</th><th>Wall time</th><th>Tasks</th>"
+        f"<th>Shuffle write</th><th>Spill</th></tr>{rows}</table>"
+    )
+    return results
@@ -0,0 +1,177 @@
+# Databricks notebook source
+# Spark job/stage/task metrics for a block of notebook code.
+#
+# Jobs are attributed through the job group of the calling thread (Databricks
+# sets one per command; outside Databricks a private group is set), so other
+# users' jobs on a shared cluster are never counted. Job and stage structure
+# comes from the status tracker; byte counters come from the Spark UI REST
+# API and are left at 0 when the UI is not reachable from the driver.
+
+import builtins
+import datetime
+import json
+import time
+import urllib.request
+import uuid
+
+# COMMAND ----------
+
+
+def spark_ui_json(endpoint):
+    """GET an application endpoint of the Spark UI REST API (e.g. "stages/3"), or None."""
+    sc = spark.sparkContext
+    if not sc.uiWebUrl:
+        return None
+    url = f"{sc.uiWebUrl}/api/v1/applications/{sc.applicationId}/{endpoint}"
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return json.loads(response.read())
+    except Exception:
+        return None
+
+
+def ui_timestamp(value):
+    """Epoch seconds of a Spark UI REST API timestamp such as 2024-05-01T10:00:00.123GMT, or None."""
+    try:
+        parsed = datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%Z")
+    except (TypeError, ValueError):
+        return None
+    return parsed.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def format_bytes(num_bytes):
+    """Format a byte count for display, e.g. 1536 -> '1.5 KB'."""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if builtins.abs(num_bytes) < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
+
+
+# COMMAND ----------
+
+# Spark UI stage fields summed into the metrics, keyed by our metric name
+stage_metric_fields = {
+    "input_bytes": "inputBytes",
+    "input_records": "inputRecords",
+    "output_bytes": "outputBytes",
+    "output_records": "outputRecords",
+    "shuffle_read_bytes": "shuffleReadBytes",
+    "shuffle_write_bytes": "shuffleWriteBytes",
+    "memory_spill_bytes": "memoryBytesSpilled",
+    "disk_spill_bytes": "diskBytesSpilled",
+    "executor_run_time_ms": "executorRunTime",
+}
+
+
+class SparkMetrics:
+    """Records wall time and the Spark jobs, stages and tasks launched between start() and stop().
+
+    Use as a context manager:
+
+        with SparkMetrics() as m:
+            df.count()
+        print(m.metrics)
+    """
+
+    def __init__(self):
+        self.metrics = None
+        self.stages = []
+        self._started = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    def start(self):
+        sc = spark.sparkContext
+        self._own_group = None
+        self._group = sc.getLocalProperty("spark.jobGroup.id")
+        if self._group is None:
+            self._own_group = f"spark-metrics-{uuid.uuid4().hex}"
+            self._group = self._own_group
+            sc.setLocalProperty("spark.jobGroup.id", self._group)
+        self._known_jobs = set(sc.statusTracker().getJobIdsForGroup(self._group))
+        self._started = time.time()
+        return self
+
+    def stop(self):
+        wall_time = time.time() - self._started
+        sc = spark.sparkContext
+        tracker = sc.statusTracker()
+        job_ids = sorted(set(tracker.getJobIdsForGroup(self._group)) - self._known_jobs)
+
+        if self._own_group is not None and sc.getLocalProperty("spark.jobGroup.id") == self._own_group:
+            sc.setLocalProperty("spark.jobGroup.id", None)
+
+        self._wait_for_jobs(tracker, job_ids)
+        self.stages = self._collect_stages(tracker, job_ids)
+
+        ran = [stage for stage in self.stages if stage["status"] != "SKIPPED"]
+        self.metrics = {
+            "wall_time_s": builtins.round(wall_time, 3),
+            "jobs": len(job_ids),
+            "stages": len(ran),
+            "skipped_stages": len(self.stages) - len(ran),
+            "tasks": builtins.sum(stage["tasks"] for stage in ran),
+        }
+        for name in stage_metric_fields:
+            self.metrics[name] = builtins.sum(stage[name] for stage in ran)
+        self.metrics["spill_bytes"] = self.metrics["memory_spill_bytes"] + self.metrics["disk_spill_bytes"]
+        self.metrics["peak_execution_memory"] = builtins.max(
+            [stage["peak_execution_memory"] for stage in ran] or [0]
+        )
+        return self.metrics
+
+    def _wait_for_jobs(self, tracker, job_ids, timeout_s=5):
+        # The status store is updated asynchronously by the listener bus
+        deadline = time.time() + timeout_s
+        while time.time() < deadline:
+            infos = [tracker.getJobInfo(job_id) for job_id in job_ids]
+            if all(info is None or info.status in ("SUCCEEDED", "FAILED") for info in infos):
+                return
+            time.sleep(0.05)
+
+    def _collect_stages(self, tracker, job_ids):
+        stage_ids = set()
+        for job_id in job_ids:
+            info = tracker.getJobInfo(job_id)
+            if info is not None:
+                stage_ids.update(info.stageIds)
+
+        stages = []
+        for stage_id in sorted(stage_ids):
+            attempts = spark_ui_json(f"stages/{stage_id}") or []
+            if attempts:
+                data = attempts[0]
+                stage = {
+                    "stage_id": stage_id,
+                    "attempt_id": data.get("attemptId", 0),
+                    "name": data.get("name", ""),
+                    "status": data.get("status", "UNKNOWN"),
+                    "tasks": data.get("numTasks", 0),
+                    "peak_execution_memory": data.get("peakExecutionMemory", 0),
+                    "submission_time": data.get("submissionTime"),
+                    "completion_time": data.get("completionTime"),
+                }
+                for name, field in stage_metric_fields.items():
+                    stage[name] = data.get(field, 0)
+            else:
+                info = tracker.getStageInfo(stage_id)
+                stage = {
+                    "stage_id": stage_id,
+                    "attempt_id": info.currentAttemptId if info else 0,
+                    "name": info.name if info else "",
+                    "status": "COMPLETE" if info and info.numCompletedTasks else "SKIPPED",
+                    "tasks": info.numTasks if info else 0,
+                    "peak_execution_memory": 0,
+                    "submission_time": None,
+                    "completion_time": None,
+                }
+                for name in stage_metric_fields:
+                    stage[name] = 0
+            stages.append(stage)
+        return stages
@@ -0,0 +1,133 @@
+# Databricks notebook source
+# Memory-bounded, content-level verification of large results.
+#
+# verify_stream() pulls a DataFrame to the driver one partition at a time with
+# toLocalIterator (prefetching the next partition while the current one is
+# checked) and folds every row into running checks: a row count, an
+# order-independent checksum, per-column null counts and key uniqueness. Keys
+# can be column names or expressions such as lower(col("firstName")), which
+# Spark computes and streams next to each row. Keys are tracked exactly up to
+# `exact_keys_limit`, then in a fixed-size Bloom filter, so driver memory
+# stays flat however large the result is.
+
+import builtins
+import hashlib
+import math
+
+# COMMAND ----------
+
+
+class BloomFilter:
+    """A fixed-size Bloom filter over 128-bit key digests."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = builtins.max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = builtins.max(1, builtins.round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, digest):
+        """Add a digest (an int); returns True if it may already have been added."""
+        h1, h2 = digest >> 64, digest & 0xFFFFFFFFFFFFFFFF
+        present = True
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % self.size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self.bits[byte] & mask:
+                present = False
+                self.bits[byte] |= mask
+        return present
+
+
+class StreamVerification:
+    """Running row count, checksum, null counts and key uniqueness over a stream of Rows.
+
+    Rows carry `columns` followed by `extra_columns`; the checksum and null
+    counts cover `columns` only, while key_columns may name either.
+    """
+
+    def __init__(self, columns, key_columns=None, extra_columns=(), exact_keys_limit=100_000, bloom_capacity=10_000_000, bloom_error_rate=0.001):
+        self.columns = list(columns)
+        streamed = self.columns + list(extra_columns)
+        self.key_indexes = [streamed.index(c) for c in key_columns] if key_columns else None
+        self.exact_keys_limit = exact_keys_limit
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.rows = 0
+        self.checksum = 0
+        self.null_counts = dict.fromkeys(self.columns, 0)
+        self.duplicate_keys = 0
+        self.keys = set()
+        self.bloom = None
+
+    @staticmethod
+    def _digest(values):
+        return int.from_bytes(hashlib.blake2b(repr(values).encode(), digest_size=16).digest(), "big")
+
+    def _seen(self, key_digest):
+        if self.bloom is not None:
+            return self.bloom.add(key_digest)
+        if key_digest in self.keys:
+            return True
+        self.keys.add(key_digest)
+        if len(self.keys) > self.exact_keys_limit:
+            self.bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+            for seen in self.keys:
+                self.bloom.add(seen)
+            self.keys = set()
+        return False
+
+    def update(self, row):
+        values = tuple(row)
+        self.rows += 1
+        # Summing row digests makes the checksum independent of partition and row order
+        self.checksum = (self.checksum + self._digest(values[:len(self.columns)])) & 0xFFFFFFFFFFFFFFFF
+        for column, value in zip(self.columns, values):
+            if value is None:
+                self.null_counts[column] += 1
+        if self.key_indexes is not None and self._seen(self._digest(tuple(values[i] for i in self.key_indexes))):
+            self.duplicate_keys += 1
+
+    @property
+    def exact(self):
+        """Whether duplicate_keys is exact (False once keys overflowed into the Bloom filter)."""
+        return self.bloom is None
+
+    def result(self):
+        return {
+            "rows": self.rows,
+            "checksum": f"{self.checksum:016x}",
+            "null_counts": self.null_counts,
+            "duplicate_keys": self.duplicate_keys if self.key_indexes is not None else None,
+            "duplicate_keys_exact": self.exact,
+        }
+
+
+def verify_stream(df, key_columns=None, prefetch=True, **options):
+    """Stream df to the driver partition by partition and return its StreamVerification.
+
+    key_columns are column names or Column expressions, e.g. lower(col("lastName"))
+    to treat keys that differ only in letter case as duplicates.
+    """
+    columns = df.columns
+    extra_columns = []
+    if key_columns and not builtins.all(isinstance(c, str) for c in key_columns):
+        from pyspark.sql.functions import col
+
+        extra_columns = [f"_verify_key_{i}" for i in range(len(key_columns))]
+        df = df.select("*", *[(col(c) if isinstance(c, str) else c).alias(name) for c, name in zip(key_columns, extra_columns)])
+        key_columns = extra_columns
+    verification = StreamVerification(columns, key_columns, extra_columns, **options)
+    try:
+        rows = df.toLocalIterator(prefetchPartitions=prefetch)
+    except TypeError:
+        # prefetchPartitions is Spark 3.0+
+        rows = df.toLocalIterator()
+    for row in rows:
+        verification.update(row)
+
+    summary = f"{verification.rows:,} rows, checksum {verification.result()['checksum']}"
+    if key_columns:
+        qualifier = "" if verification.exact else " (approximate)"
+        summary += f", {verification.duplicate_keys:,} duplicate keys{qualifier}"
+    print(f"✅ Verified {summary}")
+    return verification
@@ -0,0 +1,116 @@
+# Databricks notebook source
+# Named write profiles for Parquet and Delta output.
+#
+# A profile bundles the settings that decide the physical layout of a write:
+# compression codec, target file size, Parquet row-group size and an optional
+# sortWithinPartitions key. write_with_profile() applies one to a
+# DataFrameWriter call, and benchmark_write_profiles() writes the same
+# DataFrame under every profile to compare bytes on disk, write throughput and
+# the latency of a downstream scan.
+#
+# Spark has no target-file-size option for plain file writes, so the file
+# size is reached by repartitioning to ceil(estimated bytes / target) before
+# the write, using the optimizer's size estimate of the DataFrame.
+
+import builtins
+import math
+
+write_profiles = {
+    # Spark's defaults, as used by the labs
+    "default": {"codec": "snappy", "target_file_bytes": None, "row_group_bytes": 128 * 1024 * 1024, "sort_by": None},
+    # Cold data: best compression, few large files, large row groups
+    "archive": {"codec": "zstd", "target_file_bytes": 1024 * 1024 * 1024, "row_group_bytes": 256 * 1024 * 1024, "sort_by": None},
+    # Data queried interactively: cheap decompression, small row groups for fine-grained skipping
+    "interactive": {"codec": "lz4", "target_file_bytes": 128 * 1024 * 1024, "row_group_bytes": 16 * 1024 * 1024, "sort_by": None},
+}
+
+# COMMAND ----------
+
+
+def write_profile(name, **overrides):
+    """Return the settings of a named profile, with any settings overridden, e.g. write_profile("archive", sort_by=["user_id"])."""
+    try:
+        profile = dict(write_profiles[name])
+    except KeyError:
+        raise KeyError(f"Unknown write profile {name!r}; known profiles: {sorted(write_profiles)}")
+    unknown = set(overrides) - set(profile)
+    if unknown:
+        raise KeyError(f"Unknown write profile settings: {sorted(unknown)}")
+    profile.update(overrides)
+    return profile
+
+
+def estimated_size_bytes(df):
+    """The optimizer's size estimate of df, without running a job."""
+    return int(df._jdf.queryExecution().optimizedPlan().stats().sizeInBytes().toString())
+
+
+def write_with_profile(df, path, profile="default", format="parquet", mode="overwrite", partition_by=None, **options):
+    """Write df to path with the codec, file size, row-group size and sort order of a write profile."""
+    if isinstance(profile, str):
+        profile = write_profile(profile)
+
+    if profile["target_file_bytes"]:
+        files = builtins.max(1, math.ceil(estimated_size_bytes(df) / profile["target_file_bytes"]))
+        df = df.repartition(files, *(partition_by or []))
+    if profile["sort_by"]:
+        df = df.sortWithinPartitions(*profile["sort_by"])
+
+    writer = (df.write
+              .format(format)
+              .mode(mode)
+              .option("compression", profile["codec"])
+              .option("parquet.block.size", profile["row_group_bytes"])
+              .options(**options))
+    if partition_by:
+        writer = writer.partitionBy(*partition_by)
+
+    # Older Delta versions do not pass the compression option on to Parquet, so the codec is also set for the session
+    codec_key = "spark.sql.parquet.compression.codec"
+    previous_codec = spark.conf.get(codec_key)
+    spark.conf.set(codec_key, profile["codec"])
+    try:
+        writer.save(path)
+    finally:
+        spark.conf.set(codec_key, previous_codec)
+
+
+# COMMAND ----------
+
+
+def benchmark_write_profiles(df=None, profiles=None, format="delta", query=None):
+    """Write df (default: the events table) under every profile and compare size, write throughput and scan latency."""
+    if df is None:
+        df = DA.frames.events
+    if query is None:
+        query = lambda scan: scan.groupBy("traffic_source").count().collect()
+
+    results = {}
+    for name in profiles or sorted(write_profiles):
+        path = f"{working_dir}/write-profiles/{name}"
+        delete_tree(path, progress=False)
+
+        with SparkMetrics() as write_metrics:
+            write_with_profile(df, path, name, format=format)
+        with SparkMetrics() as scan_metrics:
+            query(spark.read.format(format).load(path))
+
+        _, size = listing_etag(path)
+        write_time = write_metrics.metrics["wall_time_s"]
+        results[name] = {
+            "bytes_on_disk": size,
+            "write_time_s": write_time,
+            "write_mb_per_s": write_metrics.metrics["output_bytes"] / 1024 / 1024 / builtins.max(write_time, 0.001),
+            "scan_time_s": scan_metrics.metrics["wall_time_s"],
+        }
+
+    rows = "".join(
+        f"<tr><td>{name}</td><td>{format_bytes(r['bytes_on_disk'])}</td><td>{r['write_time_s']:.2f}s</td>"
+        f"<td>{r['write_mb_per_s']:.1f} MB/s</td><td>{r['scan_time_s']:.2f}s</td></tr>"
+        for name, r in results.items()
+    )
+    displayHTML(
+        "<table><tr><th>Profile</th><th>On disk</th><th>Write</th><th>Write throughput</th><th>Scan</th></tr>"
+        f"{rows}</table>"
+    )
+    return results
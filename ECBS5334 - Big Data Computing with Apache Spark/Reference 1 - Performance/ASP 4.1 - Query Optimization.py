@@ -29,7 +29,7 @@
 
 # COMMAND ----------
 
-df = spark.read.format("delta").load(DA.paths.events)
+df = DA.frames.events
 display(df)
 
 # COMMAND ----------
@@ -85,6 +85,20 @@ better_df.explain(True)
 
 # COMMAND ----------
 
+# MAGIC
+# MAGIC %md
+# MAGIC
+# MAGIC
+# MAGIC The plan only shows which filters Spark *tried* to push down. **`scan_report`** runs the query and reads the scan metrics from the physical plan: how many files and bytes were actually read, which filters reached the scan, and which columns were pruned. Selecting one field of the **`ecommerce`** struct reads only that nested column.
+
+# COMMAND ----------
+
+revenue_df = better_df.select("ecommerce.purchase_revenue_in_usd")
+
+scan_report(revenue_df)
+
+# COMMAND ----------
+
 # MAGIC
 # MAGIC %md
 # MAGIC
@@ -149,14 +163,16 @@ stupid_df.explain(True)
 
 # COMMAND ----------
 
-jdbc_url = "jdbc:postgresql://server1.training.databricks.com/training"
+# jdbc:postgresql://server1.training.databricks.com/training, or the local SQLite stand-in when one was seeded
+jdbc_url = training_jdbc.url
+people_table = training_jdbc.table
 
 # Username and Password w/read-only rights
-conn_properties = {"user": "training", "password": "training"}
+conn_properties = training_jdbc.properties
 
 pp_df = spark.read.jdbc(
     url=jdbc_url,  # the JDBC URL
-    table="training.people_1m",  # the name of the table
+    table=people_table,  # the name of the table
     column="id",  # the name of a column of an integral type that will be used for partitioning
     lowerBound=1,  # the minimum value of columnName used to decide partition stride
     upperBound=1000000,  # the maximum value of columnName used to decide partition stride
@@ -179,6 +195,21 @@ pp_df.explain(True)
 
 # COMMAND ----------
 
+# MAGIC
+# MAGIC %md
+# MAGIC
+# MAGIC
+# MAGIC
+# MAGIC The static **`lowerBound`**/**`upperBound`** above split the id range into equal strides, which only gives balanced partitions if the ids are evenly spread. **`read_jdbc_balanced`** derives the split points from quantiles of the actual ids, computed by the database, instead, and **`jdbc_partition_report`** shows the rows and time per partition.
+
+# COMMAND ----------
+
+balanced_df = read_jdbc_balanced(jdbc_url, people_table, "id", num_partitions=8, properties=conn_properties)
+
+jdbc_partition_report(balanced_df)
+
+# COMMAND ----------
+
 # MAGIC
 # MAGIC %md
 # MAGIC
@@ -191,7 +222,7 @@ pp_df.explain(True)
 
 cached_df = spark.read.jdbc(
     url=jdbc_url,
-    table="training.people_1m",
+    table=people_table,
     column="id",
     lowerBound=1,
     upperBound=1000000,
@@ -199,7 +230,7 @@ cached_df = spark.read.jdbc(
     properties=conn_properties,
 )
 
-cached_df.cache()
+DA.cache.cache(cached_df)
 filtered_df = cached_df.filter(col("gender") == "M")
 
 filtered_df.explain(True)
@@ -214,6 +245,27 @@ filtered_df.explain(True)
 # MAGIC In addition to the **Scan** (the JDBC read) we saw in the previous example, here we also see the **InMemoryTableScan** followed by a **Filter** in the explain plan.
 # MAGIC
 # MAGIC This means Spark had to read ALL the data from the database and cache it, and then scan it in cache to find the records matching the filter condition.
+# MAGIC
+# MAGIC **`lint_plan`** spots this and other anti-patterns from this lesson in a query plan, along with the size estimate that makes them expensive.
+
+# COMMAND ----------
+
+lint_plan(filtered_df)
+
+# COMMAND ----------
+
+# MAGIC
+# MAGIC %md
+# MAGIC
+# MAGIC
+# MAGIC
+# MAGIC **`DA.cache.cache(cached_df)`** above is **`cached_df.cache()`**, tracked by **`DA.cache`** (**`DA.cache.persist(df, storage_level)`** does the same for **`persist`**): it counts how many later actions actually read from the cache, and unpersists the least recently used DataFrames when the cache outgrows **`DA.cache.budget_bytes`**. A DataFrame that was cached but never reused only cost memory.
+
+# COMMAND ----------
+
+filtered_df.count()
+
+print_cache_report(DA.cache.report())
 
 # COMMAND ----------
 
@@ -225,7 +277,7 @@ filtered_df.explain(True)
 
 # COMMAND ----------
 
-cached_df.unpersist()
+DA.cache.unpersist(cached_df)
 
 # COMMAND ----------
 
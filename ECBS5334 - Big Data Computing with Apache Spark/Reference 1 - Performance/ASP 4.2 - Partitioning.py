@@ -33,7 +33,7 @@
 
 # COMMAND ----------
 
-df = spark.read.format("delta").load(DA.paths.events)
+df = DA.frames.events
 df.rdd.getNumPartitions()
 
 # COMMAND ----------
@@ -122,6 +122,36 @@ coalesce_df.rdd.getNumPartitions()
 
 # COMMAND ----------
 
+# MAGIC
+# MAGIC %md
+# MAGIC
+# MAGIC
+# MAGIC
+# MAGIC Both DataFrames have 8 partitions, but **`getNumPartitions`** doesn't show how evenly the data is spread over them. **`inspect_partitions`** counts the rows and estimated bytes of every partition in one job, and reports the skew as max/median and as the Gini coefficient (0 means equal partitions) along with a histogram.
+
+# COMMAND ----------
+
+inspect_partitions(repartitioned_df)
+
+# COMMAND ----------
+
+inspect_partitions(coalesce_df)
+
+# COMMAND ----------
+
+# MAGIC
+# MAGIC %md
+# MAGIC
+# MAGIC
+# MAGIC
+# MAGIC It works on the output of a shuffle as well, e.g. the partitions produced by an aggregation:
+
+# COMMAND ----------
+
+inspect_partitions(df.groupBy("traffic_source").count())
+
+# COMMAND ----------
+
 # MAGIC
 # MAGIC %md
 # MAGIC
@@ -163,6 +193,33 @@ print(spark.conf.get("spark.sql.shuffle.partitions"))
 
 # COMMAND ----------
 
+# MAGIC
+# MAGIC %md
+# MAGIC
+# MAGIC
+# MAGIC
+# MAGIC **`ShuffleSizing`** applies these guidelines to a query: it estimates the largest shuffle input from the query plan's statistics (or the size of the files read), divides it by ~200MB, rounds up to a multiple of the number of cores and sets **`spark.sql.shuffle.partitions`** for the actions inside the **`with`** block.
+
+# COMMAND ----------
+
+users_df = DA.frames.events.groupBy("user_id").count()
+
+with ShuffleSizing(users_df):
+    users_df.write.format("noop").mode("overwrite").save()
+
+print(spark.conf.get("spark.sql.shuffle.partitions"))
+
+# COMMAND ----------
+
+# MAGIC
+# MAGIC %md
+# MAGIC
+# MAGIC
+# MAGIC
+# MAGIC How the sized partition count compares with fixed settings of 8 and 200 depends on the data size. **`benchmark_shuffle_sizing`** runs that comparison on the events dataset at several scales; it runs nine full de-duplication jobs, so run it outside class, e.g. on a local copy of the datasets with **`python -m tools.benchmark_shuffle_sizing --data-root <copy of the datasets>`**.
+
+# COMMAND ----------
+
 # MAGIC
 # MAGIC %md
 # MAGIC
@@ -91,10 +91,26 @@ for f in verify_files:
 assert verify_delta_format, "Data not written in Delta format"
 assert verify_num_data_files == 1, "Expected 1 data file written"
 
-verify_record_count = spark.read.format("delta").load(delta_dest_dir).count()
-assert verify_record_count == 100000, "Expected 100000 records in final result"
-
-del verify_files, verify_delta_format, verify_num_data_files, verify_record_count
+# Keys are compared like the de-duplication does: names in lower case, SSNs without hyphens
+from pyspark.sql.functions import col, lower, translate
+
+verify_result = verify_stream(
+    spark.read.format("delta").load(delta_dest_dir),
+    key_columns=[
+        lower(col("firstName")),
+        lower(col("middleName")),
+        lower(col("lastName")),
+        translate(col("ssn"), "-", ""),
+        "gender",
+        "birthDate",
+        "salary",
+    ],
+    exact_keys_limit=200_000,
+)
+assert verify_result.rows == 100000, "Expected 100000 records in final result"
+assert verify_result.duplicate_keys == 0, "Expected no duplicate records in final result"
+
+del verify_files, verify_delta_format, verify_num_data_files, verify_result
 print("All test pass")
 
 # COMMAND ----------
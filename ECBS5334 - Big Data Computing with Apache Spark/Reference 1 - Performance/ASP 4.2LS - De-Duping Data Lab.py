@@ -65,17 +65,8 @@ delta_dest_dir = f"{DA.paths.working_dir}/people"
 # In case it already exists
 dbutils.fs.rm(delta_dest_dir, True)
 
-# dropDuplicates() will introduce a shuffle, so it helps to reduce the number of post-shuffle partitions.
-spark.conf.set("spark.sql.shuffle.partitions", 8)
-
-# Okay, now we can read this thing
-df = (spark
-      .read
-      .option("header", "true")
-      .option("inferSchema", "true")
-      .option("sep", ":")
-      .csv(source_file)
-     )
+# Okay, now we can read this thing. DA.read() infers the schema once and reuses it from the schema registry afterwards
+df = DA.read("csv", source_file, header="true", sep=":")
 
 # COMMAND ----------
 
@@ -99,15 +90,17 @@ deduped_df = (df
 
 # ANSWER
 
+# dropDuplicates() will introduce a shuffle; ShuffleSizing sizes the post-shuffle partitions from the input for this write.
 # Now, write the results in Delta format as a single file. We'll also display the Delta files to make sure they were written as expected.
 
-(deduped_df
- .repartition(1)
- .write
- .mode("overwrite")
- .format("delta")
- .save(delta_dest_dir)
-)
+with ShuffleSizing(deduped_df):
+    (deduped_df
+     .repartition(1)
+     .write
+     .mode("overwrite")
+     .format("delta")
+     .save(delta_dest_dir)
+    )
 
 display(dbutils.fs.ls(delta_dest_dir))
 
@@ -134,10 +127,26 @@ for f in verify_files:
 assert verify_delta_format, "Data not written in Delta format"
 assert verify_num_data_files == 1, "Expected 1 data file written"
 
-verify_record_count = spark.read.format("delta").load(delta_dest_dir).count()
-assert verify_record_count == 100000, "Expected 100000 records in final result"
+# Keys are compared like the de-duplication does: names in lower case, SSNs without hyphens
+from pyspark.sql.functions import col, lower, translate
+
+verify_result = verify_stream(
+    spark.read.format("delta").load(delta_dest_dir),
+    key_columns=[
+        lower(col("firstName")),
+        lower(col("middleName")),
+        lower(col("lastName")),
+        translate(col("ssn"), "-", ""),
+        "gender",
+        "birthDate",
+        "salary",
+    ],
+    exact_keys_limit=200_000,
+)
+assert verify_result.rows == 100000, "Expected 100000 records in final result"
+assert verify_result.duplicate_keys == 0, "Expected no duplicate records in final result"
 
-del verify_files, verify_delta_format, verify_num_data_files, verify_record_count
+del verify_files, verify_delta_format, verify_num_data_files, verify_result
 print("All test pass")
 
 # COMMAND ----------
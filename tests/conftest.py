@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.local_runner import INCLUDES_DIR, load_include  # noqa: E402
+
+
+@pytest.fixture
+def include():
+    """Load an include notebook into a fresh namespace, like `%run ./<name>` on a cluster without Spark."""
+
+    def load(name, **namespace):
+        return load_include(os.path.join(INCLUDES_DIR, f"{name}.py"), dict(namespace))
+
+    return load
@@ -0,0 +1,23 @@
+from tools.benchmark_solutions import find_regressions, summarize
+
+
+def test_summarize_reports_the_result_rows():
+    report = {"wall_time_s": 1.0, "peak_executor_memory": 10, "result_rows": 3, "cells": [{"status": "ok", "shuffle_read_bytes": 5}]}
+
+    assert summarize(report) == {"wall_time_s": 1.0, "shuffle_bytes": 5, "peak_executor_memory": 10, "output_rows": 3, "failed_cells": 0}
+
+
+def test_any_change_in_output_rows_is_a_regression():
+    baseline = {"lab@1x": {"wall_time_s": 10.0, "output_rows": 100}}
+    results = {"lab@1x": {"wall_time_s": 10.0, "shuffle_bytes": 0, "peak_executor_memory": 0, "output_rows": 99}}
+
+    assert find_regressions(results, baseline, 0.2) == [("lab@1x", "output_rows", 100, 99)]
+
+
+def test_costs_regress_only_past_the_threshold():
+    baseline = {"lab@1x": {"wall_time_s": 10.0, "output_rows": 100}}
+    within = {"lab@1x": {"wall_time_s": 11.9, "shuffle_bytes": 0, "peak_executor_memory": 0, "output_rows": 100}}
+    beyond = {"lab@1x": {"wall_time_s": 12.1, "shuffle_bytes": 0, "peak_executor_memory": 0, "output_rows": 100}}
+
+    assert find_regressions(within, baseline, 0.2) == []
+    assert find_regressions(beyond, baseline, 0.2) == [("lab@1x", "wall_time_s", 10.0, 12.1)]
@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+
+
+class FakeDataFrame:
+    def __init__(self, fingerprint, rdd_id):
+        self.fingerprint, self.rdd_id = fingerprint, rdd_id
+        self.is_cached = False
+        self.storageLevel = "MEMORY_AND_DISK"
+
+    def cache(self):
+        self.is_cached = True
+        return self
+
+    def unpersist(self, blocking=False):
+        self.is_cached = False
+        return self
+
+
+class FakeTracker:
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def getJobIdsForGroup(self, group):
+        return [job_id for job_id, job in self.jobs.items() if job["group"] == group]
+
+    def getJobInfo(self, job_id):
+        job = self.jobs[job_id]
+        return SimpleNamespace(jobId=job_id, status=job["status"], stageIds=job["stages"])
+
+
+class FakeSparkContext:
+    def __init__(self, tracker, group):
+        self.tracker = tracker
+        self.properties = {"spark.jobGroup.id": group}
+        self._jsc = SimpleNamespace(sc=lambda: SimpleNamespace(getRDDStorageInfo=lambda: []))
+
+    def getLocalProperty(self, key):
+        return self.properties.get(key)
+
+    def setLocalProperty(self, key, value):
+        self.properties[key] = value
+
+    def statusTracker(self):
+        return self.tracker
+
+
+def load(include, jobs, stage_rdds, executions, group="notebook"):
+    requests = []
+
+    def spark_ui_json(endpoint):
+        requests.append(endpoint)
+        if endpoint.startswith("sql?"):
+            offset = int(endpoint.split("offset=")[1].split("&")[0])
+            return executions[offset:]
+        stage_id = int(endpoint.split("/")[1])
+        return [{"status": "COMPLETE", "rddIds": stage_rdds.get(stage_id, []), "completionTime": None}]
+
+    spark = SimpleNamespace(sparkContext=FakeSparkContext(FakeTracker(jobs), group))
+    namespace = include(
+        "_cache_manager",
+        spark=spark,
+        DA=SimpleNamespace(),
+        spark_ui_json=spark_ui_json,
+        ui_timestamp=lambda value: None,
+        format_bytes=str,
+    )
+    namespace["plan_fingerprint"] = lambda df: df.fingerprint
+    namespace["_cached_rdd_id"] = lambda df: df.rdd_id
+    return namespace, spark, requests
+
+
+def test_hits_count_actions_of_this_notebooks_jobs_only(include):
+    jobs = {
+        0: {"group": "notebook", "status": "SUCCEEDED", "stages": [0]},
+        1: {"group": "notebook", "status": "SUCCEEDED", "stages": [1]},
+        2: {"group": "notebook", "status": "SUCCEEDED", "stages": [2]},
+        3: {"group": "other-notebook", "status": "SUCCEEDED", "stages": [3]},
+    }
+    stage_rdds = {0: [7], 1: [7], 2: [7], 3: [7]}
+    # Jobs 1 and 2 are one action
+    executions = [{"id": 0, "status": "COMPLETED", "successJobIds": [0]}, {"id": 1, "status": "COMPLETED", "successJobIds": [1, 2]}]
+    namespace, _, requests = load(include, jobs, stage_rdds, executions)
+    manager = namespace["DA"].cache
+
+    df = manager.cache(FakeDataFrame("abc", 7), name="events")
+    [row] = manager.report()
+
+    assert df.is_cached
+    assert row["hits"] == 1
+    assert "jobs" not in requests and "stages" not in requests
+    assert "stages/3" not in requests
+
+
+def test_unpersist_keeps_the_statistics(include):
+    namespace, _, _ = load(include, {}, {}, [])
+    manager = namespace["DA"].cache
+    df = manager.cache(FakeDataFrame("abc", 7), name="events")
+
+    manager.unpersist(df)
+
+    assert not df.is_cached
+    assert [row["status"] for row in manager.report()] == ["unpersisted"]
+
+
+def test_a_private_job_group_is_set_outside_databricks(include):
+    namespace, spark, _ = load(include, {}, {}, [], group=None)
+    manager = namespace["DA"].cache
+
+    manager.cache(FakeDataFrame("abc", 7), name="events")
+
+    assert spark.sparkContext.getLocalProperty("spark.jobGroup.id").startswith("da-cache-")
+
+
+def test_sql_executions_resume_at_the_first_running_execution(include):
+    executions = [
+        {"id": 0, "status": "COMPLETED", "successJobIds": [0]},
+        {"id": 1, "status": "RUNNING", "runningJobIds": [1]},
+        {"id": 2, "status": "COMPLETED", "successJobIds": [2]},
+    ]
+    namespace, _, _ = load(include, {}, {}, executions)
+
+    execution_of_job, offset = namespace["sql_executions_by_job"](0)
+
+    assert execution_of_job == {0: 0, 1: 1}
+    assert offset == 1
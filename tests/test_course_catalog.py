@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+
+def table(name, kind, view_text=None, temporary=False):
+    information = f"Database: ceu\nTable: {name}\nType: {kind}\n"
+    if view_text:
+        information += f"View Text: {view_text}\n"
+    return SimpleNamespace(tableName=name, isTemporary=temporary, information=information)
+
+
+class FakeSpark:
+    def __init__(self, tables):
+        self.tables = tables
+        self.statements = []
+        self.catalog = SimpleNamespace(setCurrentDatabase=lambda name: None)
+
+    def sql(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(collect=lambda: self.tables)
+
+
+@pytest.fixture
+def catalog(include):
+    def load(tables):
+        spark = FakeSpark(tables)
+        return include("_common", spark=spark), spark
+
+    return load
+
+
+def test_unchanged_views_cost_one_listing(catalog):
+    namespace, spark = catalog([
+        table("events", "VIEW", "SELECT * FROM delta.`/data/events.delta`"),
+        table("users", "VIEW", "SELECT * FROM delta.`/data/users.delta`"),
+    ])
+
+    namespace["reset_course_catalog"]({"events": "/data/events.delta", "users": "/data/users.delta"})
+
+    assert spark.statements == ["SHOW TABLE EXTENDED IN ceu LIKE 'sales|users|products|events'"]
+
+
+def test_only_differing_tables_are_dropped_or_created(catalog):
+    namespace, spark = catalog([
+        table("events", "VIEW", "SELECT * FROM delta.`/data/events.delta`"),
+        table("sales", "MANAGED"),
+        table("users", "VIEW", "SELECT * FROM delta.`/old/users.delta`"),
+        table("products", "VIEW", temporary=True),
+    ])
+
+    namespace["reset_course_catalog"]({
+        "events": "/data/events.delta",
+        "sales": "/data/sales.delta",
+        "users": "/data/users.delta",
+    })
+
+    assert spark.statements[1:] == [
+        "DROP VIEW IF EXISTS products",
+        "DROP TABLE IF EXISTS sales",
+        "DROP VIEW IF EXISTS users",
+        "CREATE VIEW sales AS SELECT * FROM delta.`/data/sales.delta`",
+        "CREATE VIEW users AS SELECT * FROM delta.`/data/users.delta`",
+    ]
+
+
+def test_without_views_every_course_table_is_dropped(catalog):
+    namespace, spark = catalog([table("events", "VIEW", "SELECT 1"), table("sales", "EXTERNAL")])
+
+    namespace["reset_course_catalog"]()
+
+    assert spark.statements[1:] == ["DROP VIEW IF EXISTS events", "DROP TABLE IF EXISTS sales"]
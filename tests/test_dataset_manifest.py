@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tools.build_dataset_manifest import dataset_of, manifest_from_files
+
+FILES = [
+    ("/ecommerce/events/events-2020-07-03.json/_SUCCESS", 0),
+    ("/ecommerce/events/events-2020-07-03.json/hour=0/part-00000.json", 100),
+    ("/ecommerce/events/events-2020-07-03.json/hour=1/part-00000.json", 50),
+    ("/ecommerce/sales/sales.delta/_delta_log/00000000000000000000.json", 10),
+    ("/ecommerce/sales/sales.delta/_delta_log/00000000000000000001.json", 10),
+    ("/ecommerce/sales/sales.delta/part-00000.snappy.parquet", 200),
+    ("/people/people-with-dups.txt", 300),
+]
+
+
+def test_dataset_of_is_the_shallowest_path_with_an_extension():
+    assert dataset_of("/ecommerce/sales/sales.delta/_delta_log/0.json") == "/ecommerce/sales/sales.delta"
+    assert dataset_of("/people/people-with-dups.txt") == "/people/people-with-dups.txt"
+    assert dataset_of("/ecommerce/sales/") is None
+
+
+def test_manifest_records_format_sizes_partitions_and_delta_version():
+    manifest = manifest_from_files(FILES)
+
+    events = manifest["/ecommerce/events/events-2020-07-03.json"]
+    assert events["format"] == "json"
+    assert events["bytes"] == 150
+    assert events["partition_columns"] == ["hour"]
+    sales = manifest["/ecommerce/sales/sales.delta"]
+    assert (sales["format"], sales["delta_version"], sales["bytes"]) == ("delta", 1, 220)
+    people = manifest["/people/people-with-dups.txt"]
+    assert people["files"] == [{"path": "", "size": 300}]
+    assert people["options"] == {"sep": ":", "header": "true"}
+
+
+def test_unknown_sizes_leave_the_dataset_size_unknown():
+    manifest = manifest_from_files([("/products/products.csv/part-0.csv", None), ("/products/products.csv/part-1.csv", 5)])
+
+    assert manifest["/products/products.csv"]["bytes"] is None
+
+
+def test_remote_files_lists_every_directory_and_file(include):
+    index = include("_dataset_index")
+    manifest = manifest_from_files(FILES[:3] + FILES[-1:])
+
+    assert index["manifest_paths"](manifest) == [
+        "/ecommerce/",
+        "/ecommerce/events/",
+        "/ecommerce/events/events-2020-07-03.json/",
+        "/ecommerce/events/events-2020-07-03.json/_SUCCESS",
+        "/ecommerce/events/events-2020-07-03.json/hour=0/",
+        "/ecommerce/events/events-2020-07-03.json/hour=0/part-00000.json",
+        "/ecommerce/events/events-2020-07-03.json/hour=1/",
+        "/ecommerce/events/events-2020-07-03.json/hour=1/part-00000.json",
+        "/people/",
+        "/people/people-with-dups.txt",
+    ]
+    assert index["remote_files"] == index["manifest_paths"](index["dataset_manifest"])
+
+
+def test_data_files_skip_markers_and_the_delta_log(include):
+    DA = SimpleNamespace(paths=SimpleNamespace(datasets="s3a://bucket/v03/"))
+    datasets = include("_datasets", DA=DA, dataset_manifest=manifest_from_files(FILES))
+
+    assert datasets["dataset_data_files"]("/ecommerce/sales/sales.delta") == [
+        ("s3a://bucket/v03/ecommerce/sales/sales.delta/part-00000.snappy.parquet", 200)
+    ]
+    assert datasets["dataset_data_files"]("/people/people-with-dups.txt") == [("s3a://bucket/v03/people/people-with-dups.txt", 300)]
+
+
+class FakeReader:
+    def __init__(self):
+        self.schema_ddl, self.loaded = None, None
+
+    def format(self, format):
+        return self
+
+    def options(self, **options):
+        return self
+
+    def option(self, key, value):
+        return self
+
+    def schema(self, ddl):
+        self.schema_ddl = ddl
+        return self
+
+    def load(self, paths):
+        self.loaded = paths
+        return self
+
+
+def test_read_dataset_uses_the_manifest_schema_and_files(include):
+    manifest = manifest_from_files(FILES)
+    manifest["/people/people-with-dups.txt"]["schema"] = "firstName STRING, salary INT"
+    reader = FakeReader()
+    DA = SimpleNamespace(paths=SimpleNamespace(datasets="s3a://bucket/v03/"))
+    datasets = include("_datasets", DA=DA, dataset_manifest=manifest, spark=SimpleNamespace(read=reader))
+
+    datasets["read_dataset"]("/people/people-with-dups.txt")
+
+    assert reader.schema_ddl == "firstName STRING, salary INT"
+    assert reader.loaded == ["s3a://bucket/v03/people/people-with-dups.txt"]
+
+
+def test_read_dataset_without_a_manifest_schema_is_an_error(include):
+    DA = SimpleNamespace(paths=SimpleNamespace(datasets="s3a://bucket/v03/"))
+    datasets = include("_datasets", DA=DA, dataset_manifest=manifest_from_files(FILES), spark=SimpleNamespace(read=FakeReader()))
+
+    with pytest.raises(ValueError, match="no schema for /people/people-with-dups.txt"):
+        datasets["read_dataset"]("/people/people-with-dups.txt")
+
+
+@pytest.mark.xfail(
+    strict=True,
+    reason="the checked-in manifest was rebuilt --from-index without the data; regenerate it with --data-root",
+)
+def test_checked_in_manifest_has_sizes_and_schemas(include):
+    manifest = include("_dataset_index")["dataset_manifest"]
+
+    missing_sizes = [dataset for dataset, entry in manifest.items() if any(f["size"] is None for f in entry["files"])]
+    missing_schemas = [
+        dataset
+        for dataset, entry in manifest.items()
+        if entry["format"] not in ("text", "binaryFile") and not entry["schema"]
+    ]
+    assert missing_sizes == []
+    assert missing_schemas == []
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tools.local_runner import LocalDbutils
+
+CORE = ["/ecommerce/sales/sales.delta", "/ecommerce/users/users.delta", "/ecommerce/events/events.delta", "/products/products.delta"]
+
+
+@pytest.fixture
+def mirror(include, tmp_path):
+    source = tmp_path / "source"
+    for dataset in CORE:
+        (source / dataset.lstrip("/") / "_delta_log").mkdir(parents=True)
+        (source / dataset.lstrip("/") / "_delta_log" / "00000000000000000000.json").write_text("{}")
+        (source / dataset.lstrip("/") / "part-00000.parquet").write_text("x" * 10)
+    DA = SimpleNamespace(paths=SimpleNamespace(datasets=f"file:{source}/"))
+    namespace = include("_dataset_mirror", DA=DA, dbutils=LocalDbutils({}), data_source_version="v03", mirror_enabled=False)
+    for dataset in namespace["notebook_datasets"]:
+        (source / dataset.lstrip("/")).mkdir(parents=True)
+        (source / dataset.lstrip("/") / "part-00000").write_text("y" * 100)
+    namespace.update(datasets_root=f"file:{source}", mirror_dir=f"file:{tmp_path / 'mirror'}")
+    return namespace
+
+
+def test_datasets_root_moves_once_every_notebook_dataset_is_mirrored(mirror, tmp_path):
+    mirror["apply_dataset_mirror"]()
+
+    assert mirror["DA"].paths.datasets == f"file:{tmp_path / 'mirror'}/"
+    assert mirror["sales_path"] == f"file:{tmp_path / 'mirror'}/ecommerce/sales/sales.delta"
+    assert (tmp_path / "mirror" / "people" / "people-with-dups.txt" / "part-00000").exists()
+
+
+def test_datasets_root_stays_remote_when_a_notebook_dataset_does_not_fit(mirror, tmp_path):
+    mirror["mirror_budget_bytes"] = 150
+
+    mirror["apply_dataset_mirror"]()
+
+    assert mirror["DA"].paths.datasets == f"file:{tmp_path / 'source'}/"
+    # The core tables are fetched last, so DA.paths never points at an evicted copy
+    assert mirror["DA"].paths.products == f"file:{tmp_path / 'mirror'}/products/products.delta"
+    assert (tmp_path / "mirror" / "products" / "products.delta" / "part-00000.parquet").exists()
+
+
+def test_dataset_path_points_at_each_mirrored_copy(mirror, include, tmp_path):
+    mirror["mirror_budget_bytes"] = 150
+    mirror["apply_dataset_mirror"]()
+    dataset_path = include("_datasets", DA=mirror["DA"])["dataset_path"]
+
+    assert dataset_path("/products/products.delta") == f"file:{tmp_path / 'mirror'}/products/products.delta"
+    assert dataset_path("/ecommerce/events/events-2020-07-03.json") == f"file:{tmp_path / 'source'}/ecommerce/events/events-2020-07-03.json"
+
+
+def test_refreshing_a_dataset_does_not_count_its_stale_copy(mirror, tmp_path):
+    datasets = mirror["DatasetMirror"](mirror["datasets_root"], mirror["mirror_dir"], 160)
+    datasets.manifest = {
+        "/products/products.delta": {"fingerprint": "old", "bytes": 100, "last_used": 1},
+        "/ecommerce/sales/sales.delta": {"fingerprint": "v0", "bytes": 50, "last_used": 2},
+    }
+
+    datasets.evict(100, keep="/products/products.delta")
+
+    assert set(datasets.manifest) == {"/products/products.delta", "/ecommerce/sales/sales.delta"}
+    datasets.evict(120, keep="/products/products.delta")
+    assert set(datasets.manifest) == {"/products/products.delta"}
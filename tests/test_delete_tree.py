@@ -0,0 +1,52 @@
+import os
+
+
+def make_tree(root):
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "a" / "b" / "part-0.parquet").write_text("x" * 10)
+    (root / "top.json").write_text("{}")
+
+
+def test_background_delete_removes_the_tree_and_leaves_the_path_free(include, tmp_path):
+    delete_tree = include("_delete_tree")["delete_tree"]
+    working_dir = tmp_path / "working"
+    make_tree(working_dir)
+
+    deletion = delete_tree(f"file:{working_dir}", background=True).wait()
+
+    assert deletion.error is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_symlinked_directories_are_unlinked_not_followed(include, tmp_path):
+    delete_tree = include("_delete_tree")["delete_tree"]
+    kept = tmp_path / "kept"
+    make_tree(kept)
+    working_dir = tmp_path / "working"
+    working_dir.mkdir()
+    os.symlink(kept, working_dir / "link")
+
+    deletion = delete_tree(f"file:{working_dir}", background=True).wait()
+
+    assert deletion.error is None
+    assert sorted(os.listdir(tmp_path)) == ["kept"]
+    assert (kept / "top.json").exists()
+
+
+def test_failed_background_delete_is_recorded_and_swept_next_time(include, tmp_path):
+    namespace = include("_delete_tree")
+    working_dir = tmp_path / "working"
+    make_tree(working_dir)
+    deletion = namespace["TreeDeletion"](f"file:{working_dir}").scan()
+    # A file that disappears between the listing and the delete makes the run fail
+    os.remove(working_dir / "top.json")
+
+    deletion.run_in_background().wait()
+
+    assert isinstance(deletion.error, FileNotFoundError)
+    assert [name for name in os.listdir(tmp_path) if name.startswith(".trash-working-")]
+
+    make_tree(working_dir)
+    namespace["delete_tree"](f"file:{working_dir}", background=True).wait()
+
+    assert os.listdir(tmp_path) == []
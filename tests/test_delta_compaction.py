@@ -0,0 +1,21 @@
+def test_bin_pack_fills_bins_first_fit_decreasing(include):
+    bin_pack = include("_delta_compaction")["bin_pack"]
+    files = [("a", 60), ("b", 50), ("c", 40), ("d", 30), ("e", 20)]
+
+    assert bin_pack(files, 100) == [[("a", 60), ("c", 40)], [("b", 50), ("d", 30), ("e", 20)]]
+
+
+def test_bin_pack_keeps_large_files_alone(include):
+    bin_pack = include("_delta_compaction")["bin_pack"]
+
+    assert bin_pack([("big", 150), ("small", 10), ("exact", 100)], 100) == [[("big", 150)], [("exact", 100)], [("small", 10)]]
+
+
+def test_number_bins_is_dense_over_all_partitions(include):
+    number_bins = include("_delta_compaction")["number_bins"]
+    plan = {
+        "state=CA": [[("state=CA/1", 1), ("state=CA/2", 1)], [("state=CA/3", 1)]],
+        "state=NY": [[("state=NY/1", 1), ("state=NY/2", 1)]],
+    }
+
+    assert number_bins(plan) == {"state=CA/1": 0, "state=CA/2": 0, "state=CA/3": 1, "state=NY/1": 2, "state=NY/2": 2}
@@ -0,0 +1,37 @@
+import sqlite3
+
+from tools.local_jdbc import people_rows
+
+
+def test_range_predicates_cover_every_value_once(include):
+    jdbc = include("_jdbc")
+    predicates = jdbc["jdbc_range_predicates"]("id", [10, 20, 30])
+
+    assert predicates == [
+        "id < 10",
+        "id >= 10 AND id < 20",
+        "id >= 20 AND id < 30",
+        "id >= 30 OR id IS NULL",
+    ]
+
+
+def test_range_predicates_without_bounds_read_everything(include):
+    assert include("_jdbc")["jdbc_range_predicates"]("id", []) == ["1 = 1"]
+
+
+def test_quantile_bounds_balance_sparse_ids(include):
+    """The local_jdbc seed: 20% of the ids are spaced 100 apart, which a periodic sample over-represents."""
+    jdbc = include("_jdbc")
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE people (id INTEGER, firstName, middleName, lastName, gender, birthDate, ssn, salary)")
+    connection.executemany("INSERT INTO people VALUES (?, ?, ?, ?, ?, ?, ?, ?)", people_rows(50_000, 0.2, 100, 42))
+
+    rows = connection.execute(jdbc["jdbc_quantile_bounds_query"]("people", "id", 8)).fetchall()
+    bounds = sorted(set(bound for bound, in rows[1:]))
+    counts = [
+        connection.execute(f"SELECT COUNT(*) FROM people WHERE {predicate}").fetchone()[0]
+        for predicate in jdbc["jdbc_range_predicates"]("id", bounds)
+    ]
+
+    assert sum(counts) == 50_000
+    assert max(counts) - min(counts) <= 1
@@ -0,0 +1,50 @@
+import os
+from types import SimpleNamespace
+
+from tools.local_runner import LocalDbutils, LocalFs, LocalNotebookRunner, parse_notebook
+
+PATH_MAP = {
+    "s3a://dbx-data-public/": "/data/public",
+    "s3a://dbx-data-public/v03/": "/data/v03",
+    "dbfs:/": "/tmp/dbfs",
+}
+
+
+def test_rewrite_paths_uses_the_longest_prefix_once():
+    runner = SimpleNamespace(path_map={**PATH_MAP, "/data/": "/elsewhere"})
+    source = 'spark.read.load("s3a://dbx-data-public/v03/x") and "s3a://dbx-data-public/y" and "dbfs:/z"'
+
+    assert LocalNotebookRunner.rewrite_paths(runner, source) == (
+        'spark.read.load("file:/data/v03/x") and "file:/data/public/y" and "file:/tmp/dbfs/z"'
+    )
+
+
+def test_local_fs_uses_the_longest_prefix():
+    fs = LocalFs(PATH_MAP)
+
+    assert fs.local("s3a://dbx-data-public/v03/people") == "/data/v03/people"
+    assert fs.local("s3a://dbx-data-public/other") == "/data/public/other"
+
+
+def test_fs_ls_without_a_path_lists_the_dbfs_root(tmp_path):
+    (tmp_path / "FileStore").mkdir()
+    displayed = []
+    runner = SimpleNamespace(dbutils=LocalDbutils({"dbfs:/": str(tmp_path)}), namespace={"display": displayed.append})
+
+    LocalNotebookRunner._run_fs(runner, "ls")
+
+    assert [info.name for info in displayed[0]] == ["FileStore/"]
+
+
+def test_parse_notebook_splits_magic_cells(tmp_path):
+    notebook = tmp_path / "notebook.py"
+    notebook.write_text(
+        "# Databricks notebook source\nx = 1\n\n# COMMAND ----------\n\n# MAGIC %fs ls\n\n# COMMAND ----------\n\n"
+        "# MAGIC %run ../Includes/Classroom-Setup\n"
+    )
+
+    assert [(cell.kind, cell.source) for cell in parse_notebook(str(notebook))] == [
+        ("python", "x = 1"),
+        ("fs", "ls"),
+        ("run", "../Includes/Classroom-Setup"),
+    ]
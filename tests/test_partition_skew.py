@@ -0,0 +1,29 @@
+import math
+
+import pytest
+
+
+def test_gini_is_zero_for_equal_partitions(include):
+    gini = include("_partition_skew")["gini"]
+
+    assert gini([5, 5, 5, 5]) == 0
+    assert gini([]) == 0
+    assert gini([0, 0]) == 0
+
+
+def test_gini_approaches_one_when_one_partition_holds_everything(include):
+    gini = include("_partition_skew")["gini"]
+
+    assert gini([0, 0, 0, 100]) == pytest.approx(0.75)
+    assert gini([0] * 199 + [1]) == pytest.approx(0.995)
+    assert gini([1, 2, 3, 4]) == pytest.approx(0.25)
+
+
+def test_max_over_median(include):
+    max_over_median = include("_partition_skew")["_max_over_median"]
+
+    assert max_over_median([10, 30, 20]) == 1.5
+    assert max_over_median([1, 2, 3, 10]) == 4
+    assert max_over_median([]) == 0
+    assert max_over_median([0, 0, 0]) == 0
+    assert math.isinf(max_over_median([0, 0, 7]))
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+
+class FakeReader:
+    """spark.read as far as schema inference goes; counts the inferring loads."""
+
+    def __init__(self, spark):
+        self.spark = spark
+
+    def format(self, format):
+        return self
+
+    def options(self, **options):
+        return self
+
+    def option(self, key, value):
+        return self
+
+    def load(self, path):
+        self.spark.inferred += 1
+        schema = SimpleNamespace(toDDL=lambda: f"value STRING, version INT{self.spark.version}")
+        return SimpleNamespace(_jdf=SimpleNamespace(schema=lambda: schema))
+
+
+class FakeSpark:
+    def __init__(self):
+        self.inferred = 0
+        self.version = 1
+
+    @property
+    def read(self):
+        return FakeReader(self)
+
+
+def load(include):
+    spark, listings = FakeSpark(), []
+
+    def listing_etag(path):
+        listings.append(path)
+        return f"etag-{spark.version}", 0
+
+    dbutils = SimpleNamespace(fs=SimpleNamespace(head=lambda *args: "{}", put=lambda *args: None))
+    namespace = include("_schema_registry", spark=spark, DA=SimpleNamespace(), dbutils=dbutils, listing_etag=listing_etag)
+    return namespace["SchemaRegistry"](), spark, listings
+
+
+def test_registered_schema_is_reused_without_listing(include):
+    registry, spark, listings = load(include)
+
+    first = registry.schema_for("/data/users.csv", "csv", header="true")
+    spark.version = 2
+    second = registry.schema_for("/data/users.csv", "csv", header="true")
+
+    assert first == second
+    assert spark.inferred == 1
+    assert listings == ["/data/users.csv"]
+
+
+def test_validate_lists_again_and_reinfers_changed_files(include):
+    registry, spark, listings = load(include)
+
+    registry.schema_for("/data/users.csv", "csv")
+    assert registry.schema_for("/data/users.csv", "csv", validate=True) == "value STRING, version INT1"
+    spark.version = 2
+
+    assert registry.schema_for("/data/users.csv", "csv", validate=True) == "value STRING, version INT2"
+    assert spark.inferred == 2
+    assert len(listings) == 3
+
+
+def test_options_are_part_of_the_key(include):
+    registry, spark, _ = load(include)
+
+    registry.schema_for("/data/users.csv", "csv", sep="\t")
+    registry.schema_for("/data/users.csv", "csv", sep=",")
+
+    assert spark.inferred == 2
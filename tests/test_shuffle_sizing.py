@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+MB = 1024**2
+UNKNOWN = 2**63 - 1
+
+
+class Seq:
+    def __init__(self, items):
+        self.items = items
+
+    def size(self):
+        return len(self.items)
+
+    def apply(self, i):
+        return self.items[i]
+
+
+class Node:
+    """A logical plan node as py4j exposes it, with only what the size estimate reads."""
+
+    def __init__(self, name, size, *children):
+        self.name, self.size, self.children_ = name, size, list(children)
+
+    def getClass(self):
+        return SimpleNamespace(getSimpleName=lambda: self.name)
+
+    def children(self):
+        return Seq(self.children_)
+
+    def stats(self):
+        return SimpleNamespace(sizeInBytes=lambda: SimpleNamespace(toString=lambda: str(self.size)))
+
+
+def fake_spark():
+    conf = SimpleNamespace(defaultSizeInBytes=lambda: UNKNOWN, autoBroadcastJoinThreshold=lambda: 10 * MB)
+    session_state = SimpleNamespace(conf=lambda: conf)
+    settings = {"spark.sql.shuffle.partitions": "200"}
+    return SimpleNamespace(
+        _jsparkSession=SimpleNamespace(sessionState=lambda: session_state),
+        sparkContext=SimpleNamespace(defaultParallelism=8),
+        conf=SimpleNamespace(get=settings.get, set=settings.__setitem__),
+    )
+
+
+def fake_df(plan):
+    return SimpleNamespace(_jdf=SimpleNamespace(queryExecution=lambda: SimpleNamespace(optimizedPlan=lambda: plan)))
+
+
+def load(include):
+    namespace = include("_plan_helpers")
+    return include("_shuffle_sizing", spark=fake_spark(), format_bytes=str, **namespace)
+
+
+def test_shuffle_partitions_for_rounds_up_to_a_multiple_of_parallelism(include):
+    shuffle_partitions_for = load(include)["shuffle_partitions_for"]
+
+    assert shuffle_partitions_for(2000 * MB, target_bytes=200 * MB, parallelism=8) == 16
+    assert shuffle_partitions_for(1, target_bytes=200 * MB, parallelism=8) == 8
+    assert shuffle_partitions_for(0, target_bytes=200 * MB, parallelism=4) == 4
+    assert shuffle_partitions_for(1700 * MB, target_bytes=100 * MB) == 24
+
+
+def test_estimate_skips_a_shuffle_without_estimate(include):
+    estimate = load(include)["estimate_shuffle_input_bytes"]
+    plan = Node(
+        "Union",
+        UNKNOWN,
+        Node("Deduplicate", UNKNOWN, Node("LogicalRDD", UNKNOWN)),
+        Node("Aggregate", 1 * MB, Node("Relation", 300 * MB)),
+    )
+
+    assert estimate(fake_df(plan)) == (300 * MB, "Aggregate")
+
+
+def test_estimate_is_none_when_no_shuffle_has_an_estimate(include):
+    estimate = load(include)["estimate_shuffle_input_bytes"]
+    plan = Node("Deduplicate", UNKNOWN, Node("LogicalRDD", UNKNOWN))
+
+    assert estimate(fake_df(plan)) == (None, "Deduplicate")
+
+
+def test_estimate_ignores_broadcast_joins(include):
+    estimate = load(include)["estimate_shuffle_input_bytes"]
+    plan = Node("Join", 500 * MB, Node("Relation", 500 * MB), Node("Relation", 1 * MB))
+
+    assert estimate(fake_df(plan)) == (0, None)
+
+
+def test_an_empty_shuffle_input_is_not_a_plan_without_shuffles(include):
+    namespace = load(include)
+    plan = Node("Aggregate", 0, Node("LocalRelation", 0))
+
+    assert namespace["estimate_shuffle_input_bytes"](fake_df(plan)) == (0, "Aggregate")
+    with namespace["ShuffleSizing"](fake_df(plan), quiet=True) as sizing:
+        assert sizing.partitions == "200"
+    assert "estimated empty" in namespace["shuffle_sizing_log"][-1]["reason"]
+
+    with namespace["ShuffleSizing"](fake_df(Node("LocalRelation", 0)), quiet=True):
+        pass
+    assert "no shuffle exchange" in namespace["shuffle_sizing_log"][-1]["reason"]
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+
+class Jobs:
+    """Counts the jobs 'run' by FakeDataFrame, standing in for the Spark status tracker."""
+
+    count = 0
+
+
+class FakeMetrics:
+    def start(self):
+        self.started_at = Jobs.count
+        return self
+
+    def stop(self):
+        return {"jobs": Jobs.count - self.started_at}
+
+
+class FakeDataFrame:
+    def __init__(self, values):
+        self.values = values
+
+    def agg(self, *columns):
+        self.columns = columns
+        return self
+
+    def first(self):
+        Jobs.count += 1
+        return [self.values[column] for column in self.columns]
+
+
+class FakeColumn(str):
+    def alias(self, name):
+        return self
+
+
+@pytest.fixture
+def suite(include):
+    Jobs.count = 0
+    namespace = include("_common", SparkMetrics=FakeMetrics)
+    return namespace["SimpleSuite"]
+
+
+def test_each_check_is_measured_on_its_own(suite):
+    checks = suite("eager")
+    df = FakeDataFrame({"n": 3})
+    Jobs.count += 5  # work done between checks, e.g. in an earlier cell
+
+    checks.test_equals(["a"], ["a"], "columns")
+    checks.test_agg(df, FakeColumn("n"), 3, "count")
+    checks.test_equals(lambda: df.agg(FakeColumn("n")).first()[0], 3, "lazy count")
+
+    assert [metrics["jobs"] for metrics in checks.metrics] == [0, 1, 1]
+    assert checks.passed
+
+
+def test_deferred_aggregations_are_charged_to_their_own_checks(suite):
+    checks = suite("deferred", deferred=True)
+    first, second = FakeDataFrame({"n": 3, "m": 1}), FakeDataFrame({"n": 7})
+
+    checks.test_equals(["a"], ["a"], "columns")
+    checks.test_agg(first, FakeColumn("n"), 3, "first n")
+    checks.test_agg(first, FakeColumn("m"), 2, "first m")
+    checks.test_agg(second, FakeColumn("n"), 7, "second n")
+    checks.evaluate_pending()
+
+    assert [description for description, _ in checks.tests] == ["columns", "first n", "first m", "second n"]
+    assert checks.metrics == [{"jobs": 0}, {"jobs": 1, "grouped_checks": 2}, {"jobs": 1, "grouped_checks": 2}, {"jobs": 1, "grouped_checks": 1}]
+    assert not checks.passed
@@ -0,0 +1,33 @@
+def test_checksum_ignores_row_order(include):
+    StreamVerification = include("_stream_verification")["StreamVerification"]
+    rows = [(1, "a"), (2, "b"), (3, None)]
+    forward, backward = StreamVerification(["id", "name"]), StreamVerification(["id", "name"])
+    for row in rows:
+        forward.update(row)
+    for row in reversed(rows):
+        backward.update(row)
+
+    assert forward.result()["checksum"] == backward.result()["checksum"]
+    assert forward.result()["null_counts"] == {"id": 0, "name": 1}
+
+
+def test_extra_key_columns_are_not_part_of_the_checksum(include):
+    StreamVerification = include("_stream_verification")["StreamVerification"]
+    plain = StreamVerification(["name"])
+    keyed = StreamVerification(["name"], ["_verify_key_0"], ["_verify_key_0"])
+    for name in ["Ann", "ANN", "Bob"]:
+        plain.update((name,))
+        keyed.update((name, name.lower()))
+
+    assert keyed.result()["checksum"] == plain.result()["checksum"]
+    assert keyed.duplicate_keys == 1
+
+
+def test_duplicates_are_found_after_overflowing_into_the_bloom_filter(include):
+    StreamVerification = include("_stream_verification")["StreamVerification"]
+    verification = StreamVerification(["id"], ["id"], exact_keys_limit=10, bloom_capacity=1_000)
+    for i in list(range(100)) + [5, 50]:
+        verification.update((i,))
+
+    assert not verification.exact
+    assert verification.duplicate_keys >= 2
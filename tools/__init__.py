@@ -0,0 +1 @@
+"""Local tooling for running and benchmarking the course notebooks outside Databricks."""
@@ -0,0 +1,61 @@
+"""Benchmark sized against fixed shuffle partition counts on the events dataset.
+
+    python -m tools.benchmark_shuffle_sizing --data-root /data/dbx-data-public
+    python -m tools.benchmark_shuffle_sizing --data-root /data/dbx-data-public --scales 1 4 16 --settings 8 200 auto
+
+Runs the classroom setup with the local runner, then de-duplicates `events`
+at every scale (sampled below 1, unioned with itself above 1) under each
+setting of spark.sql.shuffle.partitions, where `auto` is the count
+ShuffleSizing derives from the query plan, and reports wall time, tasks,
+shuffle bytes and spill.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from tools.local_runner import INCLUDES_DIR, LocalNotebookRunner, build_spark, default_path_map
+
+
+def setting(value):
+    return value if value == "auto" else int(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-root", required=True, help="local copy of s3a://dbx-data-public/")
+    parser.add_argument("--dbfs-root", default="/tmp/spark-course-dbfs")
+    parser.add_argument("--scales", nargs="+", type=float, default=[0.25, 1, 4])
+    parser.add_argument("--settings", nargs="+", type=setting, default=[8, 200, "auto"])
+    parser.add_argument("--coalesce", action="store_true", help="leave AQE partition coalescing on")
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--report", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    spark = build_spark("benchmark-shuffle-sizing", args.master)
+    try:
+        runner = LocalNotebookRunner(spark, default_path_map(args.data_root, args.dbfs_root))
+        if not runner.run(os.path.join(INCLUDES_DIR, "Classroom-Setup.py")):
+            print(f"❌ Classroom setup failed: {runner.cells[-1]['error']}")
+            return 1
+        results = runner.namespace["benchmark_shuffle_sizing"](
+            scales=args.scales, settings=args.settings, coalesce=args.coalesce
+        )
+    finally:
+        spark.stop()
+
+    for result in results:
+        print(
+            f"{result['scale']:>6}x {result['setting']:>5}: {result['partitions']:>5} partitions, "
+            f"{result['wall_time_s']:.2f}s, {result['tasks']} tasks, "
+            f"shuffle {result['shuffle_write_bytes'] / 1024 / 1024:.1f} MB, spill {result['spill_bytes'] / 1024 / 1024:.1f} MB"
+        )
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""Scaling benchmark over the lab solution ("LS") notebooks.
+
+    python -m tools.benchmark_solutions --data-root /data/dbx-data-public --update-baseline
+    python -m tools.benchmark_solutions --data-root /data/dbx-data-public --threshold 0.25
+
+Each solution notebook is run with the local runner against the course
+datasets at 1x, 10x and 100x scale. Scaled copies of the data root are built
+once under --scaled-root by replicating every dataset (Delta/Parquet tables
+are unioned with themselves, JSON/CSV part files are copied, text files are
+concatenated). At scales above 1x the labs' row-count assertions fail by
+design, so notebooks are run with continue-on-error and only the metrics are
+compared.
+
+Per pipeline and scale the benchmark records wall time, shuffle bytes, peak
+executor memory and output rows, the row count of the pipeline's result
+DataFrame. --update-baseline stores them in the baseline file; otherwise the
+run fails if any metric regresses past the baseline by more than --threshold,
+or if the output rows differ from the baseline at all.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+
+from tools.local_runner import COURSE_DIR, build_spark, run_notebook
+
+# Solution notebook -> the variable holding its result DataFrame. The results
+# are read from the datasets, not from working_dir, so they can still be
+# counted after the notebook's cleanup.
+SOLUTIONS = {
+    "01 - Spark Core/ASP 2.3LS - Purchase Revenues Lab.py": "final_df",
+    "02 - Aggregations and Functions/ASP 3.1LS - Revenue by Traffic Lab.py": "top_traffic_df",
+    "02 - Aggregations and Functions/ASP 3.2LS - Active Users Lab.py": "active_dow_df",
+    "02 - Aggregations and Functions/ASP 3.4LS - Abandoned Carts Lab.py": "abandoned_items_df",
+    "Reference 1 - Performance/ASP 4.2LS - De-Duping Data Lab.py": "deduped_df",
+    "Reference 2 - Delta Lake/ASP 6.1LS - Delta Lake Lab.py": "updated_sales_df",
+}
+SCALES = [1, 10, 100]
+COMPARED_METRICS = ["wall_time_s", "shuffle_bytes", "peak_executor_memory"]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "solutions-baseline.json")
+
+
+# Scaled datasets
+
+
+def find_datasets(root):
+    """Yield the dataset paths below root: the shallowest entries whose name has an extension."""
+    for current, dirs, files in os.walk(root):
+        datasets = [d for d in dirs if "." in d]
+        for name in sorted(datasets):
+            yield os.path.join(current, name)
+        dirs[:] = sorted(d for d in dirs if "." not in d)
+        for name in sorted(files):
+            if "." in name:
+                yield os.path.join(current, name)
+
+
+def replicate_text_file(source, destination, factor):
+    """Concatenate a text file factor times, keeping only the first header line."""
+    with open(source, encoding="utf-8") as f:
+        header, *body = f.readlines()
+    if body and not body[-1].endswith("\n"):
+        body[-1] += "\n"
+    with open(destination, "w", encoding="utf-8") as f:
+        f.write(header)
+        for _ in range(factor):
+            f.writelines(body)
+
+
+def replicate_part_files(source, destination, factor):
+    """Copy every data file of a JSON/CSV directory factor times, preserving partition dirs."""
+    for current, _, files in os.walk(source):
+        target_dir = os.path.join(destination, os.path.relpath(current, source))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in files:
+            if name.startswith(("_", ".")):
+                shutil.copy2(os.path.join(current, name), os.path.join(target_dir, name))
+                continue
+            stem, ext = os.path.splitext(name)
+            for copy in range(factor):
+                shutil.copy2(os.path.join(current, name), os.path.join(target_dir, f"{stem}-x{copy}{ext}"))
+
+
+def build_scaled_data_root(spark, data_root, factor, scaled_root):
+    """Return a data root with every dataset replicated factor times, building it on first use."""
+    if factor == 1:
+        return data_root
+    target_root = os.path.join(scaled_root, f"x{factor}")
+    marker = os.path.join(target_root, "_SCALED")
+    if os.path.exists(marker):
+        return target_root
+
+    shutil.rmtree(target_root, ignore_errors=True)
+    for dataset in find_datasets(data_root):
+        target = os.path.join(target_root, os.path.relpath(dataset, data_root))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if dataset.endswith((".delta", ".parquet")):
+            fmt = "delta" if dataset.endswith(".delta") else "parquet"
+            df = spark.read.format(fmt).load(dataset)
+            scaled = df
+            for _ in range(factor - 1):
+                scaled = scaled.unionAll(df)
+            scaled.write.format(fmt).mode("overwrite").save(target)
+        elif os.path.isdir(dataset):
+            replicate_part_files(dataset, target, factor)
+        elif dataset.endswith((".txt", ".csv")):
+            replicate_text_file(dataset, target, factor)
+        else:
+            shutil.copy2(dataset, target)
+
+    with open(marker, "w") as f:
+        f.write(str(factor))
+    return target_root
+
+
+# Benchmark
+
+
+def summarize(report):
+    """Reduce a local runner notebook report to the benchmarked metrics."""
+    cells = report["cells"]
+    return {
+        "wall_time_s": report["wall_time_s"],
+        "shuffle_bytes": sum(c.get("shuffle_read_bytes", 0) + c.get("shuffle_write_bytes", 0) for c in cells),
+        "peak_executor_memory": report.get("peak_executor_memory", 0),
+        "output_rows": report.get("result_rows"),
+        "failed_cells": sum(1 for c in cells if c["status"] != "ok"),
+    }
+
+
+def run_benchmark(data_root, scaled_root, dbfs_root, scales=SCALES, solutions=SOLUTIONS, master="local[*]"):
+    spark = build_spark("scale-datasets", master)
+    try:
+        roots = {scale: build_scaled_data_root(spark, data_root, scale, scaled_root) for scale in scales}
+    finally:
+        spark.stop()
+
+    results = {}
+    for solution, result_variable in solutions.items():
+        for scale in scales:
+            report = run_notebook(
+                os.path.join(COURSE_DIR, solution),
+                data_root=roots[scale],
+                dbfs_root=dbfs_root,
+                master=master,
+                continue_on_error=scale > 1,
+                result_variable=result_variable,
+            )
+            results[f"{solution}@{scale}x"] = summarize(report)
+            print(f"{solution} @ {scale}x: {json.dumps(results[f'{solution}@{scale}x'])}")
+    return results
+
+
+def find_regressions(results, baseline, threshold):
+    """List (pipeline, metric, baseline, current) for metrics more than threshold above the baseline.
+
+    Output rows are a result, not a cost, so any change from the baseline counts.
+    """
+    regressions = []
+    for key, metrics in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if previous.get(metric) and metrics[metric] > previous[metric] * (1 + threshold):
+                regressions.append((key, metric, previous[metric], metrics[metric]))
+        if previous.get("output_rows") is not None and metrics["output_rows"] != previous["output_rows"]:
+            regressions.append((key, "output_rows", previous["output_rows"], metrics["output_rows"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-root", required=True, help="local copy of s3a://dbx-data-public/")
+    parser.add_argument("--scaled-root", default="/tmp/spark-course-scaled", help="where scaled copies of the data root are built")
+    parser.add_argument("--dbfs-root", default="/tmp/spark-course-dbfs")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression, e.g. 0.2 = 20%%")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.data_root, args.scaled_root, args.dbfs_root, args.scales, master=args.master)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Wrote baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 1
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for key, metric, previous, current in regressions:
+        print(f"❌ {key}: {metric} regressed from {previous} to {current}")
+    if not regressions:
+        print(f"✅ No regressions above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
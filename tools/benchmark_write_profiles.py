@@ -0,0 +1,51 @@
+"""Benchmark the named write profiles of Includes/_write_profiles.py on the events dataset.
+
+    python -m tools.benchmark_write_profiles --data-root /data/dbx-data-public
+    python -m tools.benchmark_write_profiles --data-root /data/dbx-data-public --profiles default archive --format parquet
+
+Runs the classroom setup with the local runner, then writes `events` under
+every profile and reports bytes on disk, write throughput and the latency of
+a downstream scan (`groupBy("traffic_source").count()`).
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from tools.local_runner import INCLUDES_DIR, LocalNotebookRunner, build_spark, default_path_map
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-root", required=True, help="local copy of s3a://dbx-data-public/")
+    parser.add_argument("--dbfs-root", default="/tmp/spark-course-dbfs")
+    parser.add_argument("--profiles", nargs="+", help="profiles to compare (default: all)")
+    parser.add_argument("--format", choices=["delta", "parquet"], default="delta")
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--report", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    spark = build_spark("benchmark-write-profiles", args.master)
+    try:
+        runner = LocalNotebookRunner(spark, default_path_map(args.data_root, args.dbfs_root))
+        if not runner.run(os.path.join(INCLUDES_DIR, "Classroom-Setup.py")):
+            print(f"❌ Classroom setup failed: {runner.cells[-1]['error']}")
+            return 1
+        results = runner.namespace["benchmark_write_profiles"](profiles=args.profiles, format=args.format)
+    finally:
+        spark.stop()
+
+    for name, result in results.items():
+        print(
+            f"{name:>12}: {result['bytes_on_disk'] / 1024 / 1024:8.1f} MB on disk, "
+            f"write {result['write_time_s']:.2f}s ({result['write_mb_per_s']:.1f} MB/s), scan {result['scan_time_s']:.2f}s"
+        )
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Regenerate Includes/_dataset_index.py, the structured manifest of the course datasets.
+
+    python -m tools.build_dataset_manifest --data-root /data/dbx-data-public/v03
+    python -m tools.build_dataset_manifest --from-index --no-stats
+
+For every dataset (the shallowest path with an extension, e.g.
+`/ecommerce/events/events.delta` or `/people/people-with-dups.txt`) the
+manifest records its format, reader options, file list with byte sizes,
+partition columns (`hour=` directories) and Delta version (from the
+`_delta_log` files), plus, unless --no-stats is given, the row count and DDL
+schema computed with a local SparkSession. --from-index rebuilds the manifest from the paths already in
+the index, for when the data itself is not at hand; sizes and stats are
+then left as None.
+"""
+
+import argparse
+import ast
+import os
+import pprint
+import re
+import sys
+
+from tools.local_runner import INCLUDES_DIR, build_spark, parse_notebook
+
+INDEX_PATH = os.path.join(INCLUDES_DIR, "_dataset_index.py")
+
+FORMATS = {
+    ".delta": "delta",
+    ".parquet": "parquet",
+    ".json": "json",
+    ".csv": "csv",
+    ".txt": "csv",
+    ".md": "text",
+}
+
+# Reader options of the delimited datasets, as used in the labs
+READER_OPTIONS = {
+    "/ecommerce/users/users-500k.csv": {"sep": "\t", "header": "true"},
+    "/products/products.csv": {"header": "true"},
+    "/people/people-with-dups.txt": {"sep": ":", "header": "true"},
+}
+
+
+def dataset_of(path):
+    """Return the dataset a file path belongs to, or None for plain directories."""
+    parts = path.strip("/").split("/")
+    for i, part in enumerate(parts):
+        if "." in part and not part.startswith(("_", ".")):
+            return "/" + "/".join(parts[: i + 1])
+    return None
+
+
+def manifest_from_files(files):
+    """Build the manifest from (path, size) pairs; size may be None."""
+    manifest = {}
+    for path, size in sorted(files):
+        dataset = dataset_of(path)
+        if dataset is None:
+            continue
+        ext = os.path.splitext(dataset)[1]
+        entry = manifest.setdefault(dataset, {
+            "format": FORMATS.get(ext, "binaryFile"),
+            "options": READER_OPTIONS.get(dataset, {}),
+            "files": [],
+            "bytes": 0,
+            "partition_columns": [],
+            "rows": None,
+            "schema": None,
+            "delta_version": None,
+        })
+        relative = path[len(dataset):].strip("/")
+        entry["files"].append({"path": relative, "size": size})
+        entry["bytes"] = None if size is None or entry["bytes"] is None else entry["bytes"] + size
+        for column in re.findall(r"(?:^|/)(\w+)=[^/]*/", relative):
+            if column not in entry["partition_columns"]:
+                entry["partition_columns"].append(column)
+        log_file = re.fullmatch(r"_delta_log/(\d+)\.json", relative)
+        if log_file:
+            entry["delta_version"] = max(entry["delta_version"] or 0, int(log_file.group(1)))
+    return manifest
+
+
+def files_from_data_root(data_root):
+    files = []
+    for current, _, names in os.walk(data_root):
+        for name in names:
+            full = os.path.join(current, name)
+            files.append(("/" + os.path.relpath(full, data_root).replace(os.sep, "/"), os.path.getsize(full)))
+    return files
+
+
+def files_from_index():
+    """Read the file paths out of the current index (the old flat remote_files list or the manifest)."""
+    namespace = {}
+    for cell in parse_notebook(INDEX_PATH):
+        if cell.kind == "python":
+            exec(cell.source, namespace)
+    if "dataset_manifest" in namespace:
+        return [
+            (dataset + ("/" + f["path"] if f["path"] else ""), None)
+            for dataset, entry in namespace["dataset_manifest"].items()
+            for f in entry["files"]
+        ]
+    return [(path, None) for path in namespace["remote_files"] if not path.endswith("/")]
+
+
+def add_stats(manifest, data_root, master):
+    """Fill in row counts and DDL schemas with Spark."""
+    spark = build_spark("build-dataset-manifest", master)
+    try:
+        for dataset, entry in manifest.items():
+            if entry["format"] in ("text", "binaryFile"):
+                continue
+            path = data_root.rstrip("/") + dataset
+            reader = spark.read.format(entry["format"]).options(**entry["options"])
+            if entry["format"] in ("csv", "json"):
+                reader = reader.option("inferSchema", "true")
+            df = reader.load(path)
+            partition_columns = set(entry["partition_columns"])
+            data_schema = df.drop(*partition_columns) if partition_columns else df
+            entry["schema"] = data_schema._jdf.schema().toDDL()
+            entry["rows"] = df.count()
+            print(f"{dataset}: {entry['rows']} rows")
+    finally:
+        spark.stop()
+
+
+REMOTE_FILES_CELL = '''
+def manifest_paths(manifest):
+    """Every directory (with a trailing /) and file in the manifest, like the old flat index."""
+    paths = set()
+    for dataset, entry in manifest.items():
+        for file in entry["files"]:
+            full = f"{dataset}/{file['path']}" if file["path"] else dataset
+            parts = full.strip("/").split("/")
+            paths.update("/" + "/".join(parts[:i]) + "/" for i in range(1, len(parts)))
+            paths.add(full)
+    return sorted(paths)
+
+
+remote_files = manifest_paths(dataset_manifest)
+'''.lstrip()
+
+
+def write_index(manifest, path=INDEX_PATH):
+    body = pprint.pformat(manifest, indent=1, width=120, sort_dicts=True)
+    ast.literal_eval(body)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Databricks notebook source\n")
+        f.write("# Generated by tools/build_dataset_manifest.py - regenerate instead of editing by hand.\n")
+        f.write("# Paths are relative to DA.paths.datasets; a file path of \"\" is the dataset itself.\n")
+        f.write(f"dataset_manifest = {body}\n")
+        f.write("\n# COMMAND ----------\n\n")
+        f.write(REMOTE_FILES_CELL)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data-root", help="local copy of s3a://dbx-data-public/v03")
+    source.add_argument("--from-index", action="store_true", help="rebuild from the paths in the current index")
+    parser.add_argument("--no-stats", action="store_true", help="skip row counts and schemas")
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--out", default=INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    if args.from_index:
+        manifest = manifest_from_files(files_from_index())
+    else:
+        manifest = manifest_from_files(files_from_data_root(args.data_root))
+        if not args.no_stats:
+            add_stats(manifest, args.data_root, args.master)
+
+    write_index(manifest, args.out)
+    print(f"Wrote {len(manifest)} datasets to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""Convert the delimited-text course datasets to Parquet and benchmark the read throughput.
+
+    python -m tools.convert_delimited --data-root /data/dbx-data-public/v03
+    python -m tools.convert_delimited --data-root /data/dbx-data-public/v03 --sort people=gender,lastName
+
+`users-500k.csv` (tab separated), `products.csv` (comma separated) and
+`people-with-dups.txt` (`:` separated) are re-parsed by the CSV reader on every
+lab run. Each is written next to its source as `<name>.parquet`, using the
+reader options from the dataset manifest builder and a schema inferred once.
+
+String columns whose approximate distinct count is at most
+--dictionary-ratio of the rows (gender, traffic_source, ...) keep Parquet
+dictionary encoding; it is switched off for high-cardinality columns such as
+emails and ids, where the dictionary would only be built and then abandoned.
+Rows are sorted within each file by the dataset's sort key, low-cardinality
+columns first, which tightens the row-group min/max statistics used for
+filter pushdown and lengthens the runs for RLE.
+
+For every dataset the benchmark then scans the CSV and the Parquet copy in
+full (the `noop` sink) and with a filter on the first sort column, and prints
+rows/s and MB/s for each.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from tools.build_dataset_manifest import READER_OPTIONS
+from tools.local_runner import build_spark
+
+DATASETS = {
+    "users": "/ecommerce/users/users-500k.csv",
+    "products": "/products/products.csv",
+    "people": "/people/people-with-dups.txt",
+}
+
+# Sort keys, low-cardinality columns first; columns missing from a dataset are skipped
+SORT_KEYS = {
+    "users": ["user_first_touch_timestamp", "user_id"],
+    "products": ["item_id"],
+    "people": ["gender", "lastName", "firstName"],
+}
+
+
+def parquet_path(path):
+    return os.path.splitext(path)[0] + ".parquet"
+
+
+def disk_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(current, name))
+        for current, _, names in os.walk(path)
+        for name in names
+        if not name.startswith(("_", "."))
+    )
+
+
+def dictionary_columns(df, ratio):
+    """Return {column: use dictionary} for the string columns of df, by approximate distinct count."""
+    from pyspark.sql import functions as F
+
+    strings = [field.name for field in df.schema.fields if field.dataType.typeName() == "string"]
+    if not strings:
+        return {}
+    row = df.agg(F.count(F.lit(1)).alias("_rows"), *[F.approx_count_distinct(c).alias(c) for c in strings]).first()
+    rows = max(row["_rows"], 1)
+    return {column: row[column] / rows <= ratio for column in strings}
+
+
+def convert(spark, name, source, sort_key, dictionary_ratio):
+    """Write source as Parquet with per-column dictionary encoding and sorted files; returns the Parquet path."""
+    options = READER_OPTIONS.get(DATASETS[name], {})
+    df = spark.read.options(**options).option("inferSchema", "true").csv(source)
+
+    dictionary = dictionary_columns(df, dictionary_ratio)
+    sort_key = [column for column in sort_key if column in df.columns]
+
+    writer = df.sortWithinPartitions(*sort_key).write.mode("overwrite") if sort_key else df.write.mode("overwrite")
+    # Per-column dictionary switches need parquet-mr 1.12+ (Spark 3.2+); older versions ignore them
+    for column, enabled in dictionary.items():
+        writer = writer.option(f"parquet.enable.dictionary#{column}", str(enabled).lower())
+
+    target = parquet_path(source)
+    writer.parquet(target)
+
+    encoded = sorted(column for column, enabled in dictionary.items() if enabled)
+    print(f"✅ {name}: wrote {target} (dictionary: {', '.join(encoded) or 'none'}; sorted by {', '.join(sort_key) or 'nothing'})")
+    return target
+
+
+def timed_scan(df):
+    start = time.time()
+    df.write.format("noop").mode("overwrite").save()
+    return time.time() - start
+
+
+def benchmark(spark, name, source, target, sort_key, repeat):
+    """Full and filtered scan times of the CSV and Parquet copies of a dataset."""
+    options = READER_OPTIONS.get(DATASETS[name], {})
+    parquet_df = spark.read.parquet(target)
+    readers = {
+        "csv": (lambda: spark.read.options(**options).schema(parquet_df.schema).csv(source), disk_bytes(source)),
+        "parquet": (lambda: spark.read.parquet(target), disk_bytes(target)),
+    }
+    rows = parquet_df.count()
+    filter_column = next((column for column in sort_key if column in parquet_df.columns), None)
+    filter_value = parquet_df.select(filter_column).first()[0] if filter_column else None
+    if filter_value is None:
+        filter_column = None
+
+    results = {}
+    for fmt, (read, size) in readers.items():
+        full = min(timed_scan(read()) for _ in range(repeat))
+        result = {
+            "bytes": size,
+            "rows": rows,
+            "full_scan_s": full,
+            "rows_per_s": rows / max(full, 1e-6),
+            "mb_per_s": size / 1024 / 1024 / max(full, 1e-6),
+        }
+        if filter_column is not None:
+            result["filtered_scan_s"] = min(timed_scan(read().where(f"`{filter_column}` = '{filter_value}'")) for _ in range(repeat))
+        results[fmt] = result
+        print(
+            f"  {name:>8} {fmt:>7}: {size / 1024 / 1024:8.1f} MB, full scan {full:6.2f}s "
+            f"({result['rows_per_s']:,.0f} rows/s, {result['mb_per_s']:.1f} MB/s)"
+            + (f", filtered scan {result['filtered_scan_s']:.2f}s" if "filtered_scan_s" in result else "")
+        )
+
+    speedup = results["csv"]["full_scan_s"] / max(results["parquet"]["full_scan_s"], 1e-6)
+    print(f"  {name:>8}: Parquet full scan is {speedup:.1f}x faster, {results['parquet']['bytes'] / max(results['csv']['bytes'], 1):.0%} of the CSV size")
+    return results
+
+
+def parse_sort_overrides(values):
+    overrides = {}
+    for value in values or []:
+        name, _, columns = value.partition("=")
+        if name not in DATASETS:
+            raise SystemExit(f"Unknown dataset {name!r}; choose from {', '.join(DATASETS)}")
+        overrides[name] = [column for column in columns.split(",") if column]
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-root", required=True, help="local copy of s3a://dbx-data-public/v03")
+    parser.add_argument("--datasets", nargs="+", choices=sorted(DATASETS), default=sorted(DATASETS))
+    parser.add_argument("--sort", action="append", metavar="DATASET=COL[,COL]", help="override a dataset's sort key")
+    parser.add_argument("--dictionary-ratio", type=float, default=0.1, help="max distinct/rows for dictionary encoding")
+    parser.add_argument("--repeat", type=int, default=3, help="scans per measurement; the fastest is kept")
+    parser.add_argument("--no-benchmark", action="store_true")
+    parser.add_argument("--report", help="also write the benchmark results to this JSON file")
+    parser.add_argument("--master", default="local[*]")
+    args = parser.parse_args(argv)
+
+    sort_keys = {**SORT_KEYS, **parse_sort_overrides(args.sort)}
+    spark = build_spark("convert-delimited", args.master)
+    results = {}
+    try:
+        for name in args.datasets:
+            source = os.path.join(args.data_root, DATASETS[name].lstrip("/"))
+            target = convert(spark, name, source, sort_keys[name], args.dictionary_ratio)
+            if not args.no_benchmark:
+                results[name] = benchmark(spark, name, source, target, sort_keys[name], args.repeat)
+    finally:
+        spark.stop()
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Wrote {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""Synthetic BedBricks datasets at arbitrary scale.
+
+    python -m tools.generate_bedbricks --out /data/synthetic --events 100000000 --users 5000000 \\
+        --partitions 64 --workers 8 --traffic-skew 1.2 --state-skew 1.0 --hot-user-share 0.3 --delta
+
+Writes the course layout below --out (`v03/ecommerce/events/events.parquet`,
+`.../sales/sales.parquet`, `.../users/users.parquet`,
+`v03/products/products.parquet`), so the result can be used as the local
+runner's --data-root. Events follow the `events_schema` DDL from ASP 2.2
+exactly (`ecommerce` and `geo` structs, `items` array of structs,
+microsecond `event_timestamp`). Sales are derived from the `finalize` events
+of the same partition, so order emails, items and revenue match the events
+and users.
+
+Every partition is generated by one worker process from its own seed, in
+NumPy/Arrow batches of --batch-rows rows, and written with pyarrow. With
+--delta the Parquet outputs are also converted to `.delta` tables with
+Spark.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# The DDL used in ASP 2.2 - Reader & Writer
+EVENTS_DDL = (
+    "`device` STRING,`ecommerce` STRUCT<`purchase_revenue_in_usd`: DOUBLE, `total_item_quantity`: BIGINT, "
+    "`unique_items`: BIGINT>,`event_name` STRING,`event_previous_timestamp` BIGINT,`event_timestamp` BIGINT,"
+    "`geo` STRUCT<`city`: STRING, `state`: STRING>,`items` ARRAY<STRUCT<`coupon`: STRING, `item_id`: STRING, "
+    "`item_name`: STRING, `item_revenue_in_usd`: DOUBLE, `price_in_usd`: DOUBLE, `quantity`: BIGINT>>,"
+    "`traffic_source` STRING,`user_first_touch_timestamp` BIGINT,`user_id` STRING"
+)
+
+ITEM_TYPE = pa.struct([
+    ("coupon", pa.string()),
+    ("item_id", pa.string()),
+    ("item_name", pa.string()),
+    ("item_revenue_in_usd", pa.float64()),
+    ("price_in_usd", pa.float64()),
+    ("quantity", pa.int64()),
+])
+ECOMMERCE_TYPE = pa.struct([
+    ("purchase_revenue_in_usd", pa.float64()),
+    ("total_item_quantity", pa.int64()),
+    ("unique_items", pa.int64()),
+])
+GEO_TYPE = pa.struct([("city", pa.string()), ("state", pa.string())])
+
+EVENTS_SCHEMA = pa.schema([
+    ("device", pa.string()),
+    ("ecommerce", ECOMMERCE_TYPE),
+    ("event_name", pa.string()),
+    ("event_previous_timestamp", pa.int64()),
+    ("event_timestamp", pa.int64()),
+    ("geo", GEO_TYPE),
+    ("items", pa.list_(ITEM_TYPE)),
+    ("traffic_source", pa.string()),
+    ("user_first_touch_timestamp", pa.int64()),
+    ("user_id", pa.string()),
+])
+SALES_SCHEMA = pa.schema([
+    ("order_id", pa.int64()),
+    ("email", pa.string()),
+    ("transaction_timestamp", pa.int64()),
+    ("total_item_quantity", pa.int64()),
+    ("purchase_revenue_in_usd", pa.float64()),
+    ("unique_items", pa.int64()),
+    ("items", pa.list_(ITEM_TYPE)),
+])
+USERS_SCHEMA = pa.schema([
+    ("user_id", pa.string()),
+    ("user_first_touch_timestamp", pa.int64()),
+    ("email", pa.string()),
+])
+
+PRODUCTS = [
+    ("M_STAN_T", "Standard Twin Mattress", 595.0),
+    ("M_STAN_F", "Standard Full Mattress", 945.0),
+    ("M_STAN_Q", "Standard Queen Mattress", 1045.0),
+    ("M_STAN_K", "Standard King Mattress", 1195.0),
+    ("M_PREM_T", "Premium Twin Mattress", 1095.0),
+    ("M_PREM_F", "Premium Full Mattress", 1695.0),
+    ("M_PREM_Q", "Premium Queen Mattress", 1795.0),
+    ("M_PREM_K", "Premium King Mattress", 1995.0),
+    ("P_FOAM_S", "Standard Foam Pillow", 59.0),
+    ("P_FOAM_K", "King Memory Foam Pillow", 79.0),
+    ("P_DOWN_S", "Standard Down Pillow", 119.0),
+    ("P_DOWN_K", "King Down Pillow", 159.0),
+]
+PRODUCT_IDS = pa.array([p[0] for p in PRODUCTS])
+PRODUCT_NAMES = pa.array([p[1] for p in PRODUCTS])
+PRODUCT_PRICES = np.array([p[2] for p in PRODUCTS])
+
+EVENT_NAMES = [
+    "main", "original", "mattresses", "pillows", "premium", "foam", "down", "add_item",
+    "cart", "checkout", "register", "guest", "shipping_info", "cc_info", "finalize",
+    "delivery", "email_coupon", "warranty", "reviews", "faq", "press", "careers", "sale_coupon",
+]
+EVENT_WEIGHTS = np.array([30, 8, 10, 8, 5, 4, 4, 8, 6, 4, 3, 2, 3, 3, 2, 2, 2, 1, 3, 2, 1, 1, 1], dtype=float)
+CART_EVENTS = {"add_item", "cart", "checkout", "register", "guest", "shipping_info", "cc_info", "finalize"}
+DEVICES = pa.array(["macOS", "Windows", "iOS", "Android", "Linux", "Chrome OS"])
+TRAFFIC_SOURCES = pa.array(["google", "facebook", "instagram", "youtube", "email", "direct"])
+STATES = pa.array([
+    "CA", "TX", "FL", "NY", "PA", "IL", "OH", "GA", "NC", "MI", "NJ", "VA", "WA", "AZ", "MA", "TN", "IN",
+    "MD", "MO", "WI", "CO", "MN", "SC", "AL", "LA", "KY", "OR", "OK", "CT", "UT", "IA", "NV", "AR", "MS",
+    "KS", "NM", "NE", "ID", "WV", "HI", "NH", "ME", "MT", "RI", "DE", "SD", "ND", "AK", "DC", "VT", "WY",
+])
+
+# 2020-06-15 .. 2020-07-03, in microseconds like the course data
+START_US = 1592179200 * 1_000_000
+END_US = 1593820800 * 1_000_000
+
+
+def zipf_weights(count, exponent):
+    """Normalized Zipf weights; exponent 0 gives a uniform distribution."""
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def user_ids(user_numbers):
+    padded = pc.utf8_lpad(pa.array(user_numbers).cast(pa.string()), 15, "0")
+    return pc.binary_join_element_wise("UA", padded, "")
+
+
+def user_emails(user_numbers):
+    return pc.binary_join_element_wise("user", pa.array(user_numbers).cast(pa.string()), "@bedbricks.example", "")
+
+
+def first_touch_timestamps(user_numbers):
+    """Deterministic first-touch time per user, so events and users agree without a lookup."""
+    span = (END_US - START_US) // 2
+    return START_US + (user_numbers.astype(np.int64) * 2654435761) % span
+
+
+def sample_users(rng, rows, config):
+    """Pick users for rows, sending hot_user_share of them to the first hot_users users."""
+    hot_users = min(config["hot_users"], config["users"])
+    hot = rng.random(rows) < config["hot_user_share"]
+    numbers = rng.integers(hot_users, config["users"], rows) if hot_users < config["users"] else rng.integers(0, config["users"], rows)
+    numbers[hot] = rng.integers(0, hot_users, hot.sum())
+    return numbers
+
+
+def event_batch(rng, rows, config):
+    """Generate one Arrow batch of events."""
+    event_index = rng.choice(len(EVENT_NAMES), rows, p=EVENT_WEIGHTS / EVENT_WEIGHTS.sum())
+    event_names = pc.take(pa.array(EVENT_NAMES), pa.array(event_index))
+    is_cart = np.isin(event_index, [EVENT_NAMES.index(name) for name in CART_EVENTS])
+    is_finalize = event_index == EVENT_NAMES.index("finalize")
+
+    # items: 1-3 products for cart events, none otherwise
+    item_counts = np.where(is_cart, rng.integers(1, 4, rows), 0)
+    offsets = np.concatenate([[0], np.cumsum(item_counts)]).astype(np.int32)
+    total_items = int(offsets[-1])
+    product_index = pa.array(rng.integers(0, len(PRODUCTS), total_items))
+    prices = PRODUCT_PRICES[product_index.to_numpy()]
+    quantities = np.ones(total_items, dtype=np.int64)
+    owner = np.repeat(np.arange(rows), item_counts)
+    item_finalized = is_finalize[owner]
+    item_revenue = pa.array(prices * quantities, mask=~item_finalized)
+    coupons = pa.array(np.where(rng.random(total_items) < 0.1, "NEWBED10", None))
+    items = pa.ListArray.from_arrays(
+        pa.array(offsets),
+        pa.StructArray.from_arrays(
+            [coupons, pc.take(PRODUCT_IDS, product_index), pc.take(PRODUCT_NAMES, product_index),
+             item_revenue, pa.array(prices), pa.array(quantities)],
+            fields=list(ITEM_TYPE),
+        ),
+    )
+
+    revenue = np.bincount(owner, weights=prices * quantities, minlength=rows)
+    ecommerce = pa.StructArray.from_arrays(
+        [pa.array(revenue, mask=~is_finalize),
+         pa.array(item_counts.astype(np.int64), mask=~is_finalize),
+         pa.array(item_counts.astype(np.int64), mask=~is_finalize)],
+        fields=list(ECOMMERCE_TYPE),
+    )
+
+    users = sample_users(rng, rows, config)
+    first_touch = first_touch_timestamps(users)
+    timestamps = rng.integers(first_touch, END_US)
+    previous = timestamps - rng.integers(1_000_000, 3_600_000_000, rows)
+    has_previous = (previous > first_touch) & (rng.random(rows) < 0.9)
+
+    state_index = pa.array(rng.choice(len(STATES), rows, p=zipf_weights(len(STATES), config["state_skew"])))
+    states = pc.take(STATES, state_index)
+    geo = pa.StructArray.from_arrays(
+        [pc.binary_join_element_wise("City ", pa.array(rng.integers(1, 40, rows)).cast(pa.string()), " ", states, ""),
+         states],
+        fields=list(GEO_TYPE),
+    )
+    traffic = pc.take(
+        TRAFFIC_SOURCES,
+        pa.array(rng.choice(len(TRAFFIC_SOURCES), rows, p=zipf_weights(len(TRAFFIC_SOURCES), config["traffic_skew"]))),
+    )
+    devices = pc.take(DEVICES, pa.array(rng.integers(0, len(DEVICES), rows)))
+
+    batch = pa.RecordBatch.from_arrays(
+        [devices, ecommerce, event_names, pa.array(previous, mask=~has_previous), pa.array(timestamps),
+         geo, items, traffic, pa.array(first_touch), user_ids(users)],
+        schema=EVENTS_SCHEMA,
+    )
+    return batch, users, is_finalize
+
+
+def sales_batch(events, users, is_finalize, first_order_id):
+    """Derive the sales rows of a batch from its finalize events."""
+    finalize_rows = pa.array(np.flatnonzero(is_finalize))
+    finalized = events.take(finalize_rows)
+    ecommerce = finalized.column("ecommerce")
+    return pa.RecordBatch.from_arrays(
+        [pa.array(first_order_id + np.arange(len(finalize_rows)), pa.int64()),
+         user_emails(users[is_finalize]),
+         finalized.column("event_timestamp"),
+         pc.struct_field(ecommerce, [1]),
+         pc.struct_field(ecommerce, [0]),
+         pc.struct_field(ecommerce, [2]),
+         finalized.column("items")],
+        schema=SALES_SCHEMA,
+    )
+
+
+def dataset_dir(out, *parts):
+    path = os.path.join(out, "v03", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def write_events_partition(partition, config):
+    """Generate and write events (and the sales derived from them) for one partition."""
+    rng = np.random.default_rng([config["seed"], partition])
+    rows = config["events"] // config["partitions"] + (partition < config["events"] % config["partitions"])
+    events_dir = dataset_dir(config["out"], "ecommerce", "events", "events.parquet")
+    sales_dir = dataset_dir(config["out"], "ecommerce", "sales", "sales.parquet")
+    name = f"part-{partition:05d}.parquet"
+
+    # Order ids are unique across partitions: partition number in the high bits
+    next_order_id = partition << 32
+    with pq.ParquetWriter(os.path.join(events_dir, name), EVENTS_SCHEMA) as events_writer, \
+            pq.ParquetWriter(os.path.join(sales_dir, name), SALES_SCHEMA) as sales_writer:
+        for start in range(0, rows, config["batch_rows"]):
+            batch, users, is_finalize = event_batch(rng, min(config["batch_rows"], rows - start), config)
+            events_writer.write_batch(batch)
+            sales = sales_batch(batch, users, is_finalize, next_order_id)
+            sales_writer.write_batch(sales)
+            next_order_id += sales.num_rows
+    return rows
+
+
+def write_users_partition(partition, config):
+    """Write the users whose numbers fall in this partition's range."""
+    per_partition = -(-config["users"] // config["partitions"])
+    numbers = np.arange(partition * per_partition, min((partition + 1) * per_partition, config["users"]))
+    users_dir = dataset_dir(config["out"], "ecommerce", "users", "users.parquet")
+    table = pa.Table.from_arrays(
+        [user_ids(numbers), pa.array(first_touch_timestamps(numbers)), user_emails(numbers)],
+        schema=USERS_SCHEMA,
+    )
+    pq.write_table(table, os.path.join(users_dir, f"part-{partition:05d}.parquet"))
+    return len(numbers)
+
+
+def write_products(config):
+    products_dir = dataset_dir(config["out"], "products", "products.parquet")
+    table = pa.table({
+        "item_id": PRODUCT_IDS,
+        "name": PRODUCT_NAMES,
+        "price": pa.array(PRODUCT_PRICES),
+    })
+    pq.write_table(table, os.path.join(products_dir, "part-00000.parquet"))
+
+
+def convert_to_delta(out, master):
+    """Write a .delta copy next to every generated .parquet dataset and check the events schema."""
+    from pyspark.sql.types import _parse_datatype_string
+
+    from tools.local_runner import build_spark
+
+    spark = build_spark("generate-bedbricks-delta", master)
+    try:
+        for parts in [("ecommerce", "events", "events"), ("ecommerce", "sales", "sales"),
+                      ("ecommerce", "users", "users"), ("products", "products")]:
+            source = os.path.join(out, "v03", *parts[:-1], f"{parts[-1]}.parquet")
+            df = spark.read.parquet(source)
+            if parts[-1] == "events":
+                expected = _parse_datatype_string(EVENTS_DDL).simpleString()
+                assert df.schema.simpleString() == expected, f"events schema mismatch: {df.schema.simpleString()}"
+            df.write.format("delta").mode("overwrite").save(source[: -len(".parquet")] + ".delta")
+    finally:
+        spark.stop()
+
+
+def generate(config, workers):
+    start = time.time()
+    with ProcessPoolExecutor(workers) as pool:
+        event_rows = pool.map(write_events_partition, range(config["partitions"]), [config] * config["partitions"])
+        user_rows = pool.map(write_users_partition, range(config["partitions"]), [config] * config["partitions"])
+        event_total, user_total = sum(event_rows), sum(user_rows)
+    write_products(config)
+    elapsed = time.time() - start
+    print(f"Wrote {event_total} events and {user_total} users in {elapsed:.1f}s ({event_total / elapsed:,.0f} events/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=500_000)
+    parser.add_argument("--partitions", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-rows", type=int, default=250_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--traffic-skew", type=float, default=0.0, help="Zipf exponent over traffic_source (0 = uniform)")
+    parser.add_argument("--state-skew", type=float, default=0.0, help="Zipf exponent over geo.state (0 = uniform)")
+    parser.add_argument("--hot-users", type=int, default=100, help="number of hot users")
+    parser.add_argument("--hot-user-share", type=float, default=0.0, help="share of events that come from the hot users")
+    parser.add_argument("--delta", action="store_true", help="also write .delta tables with Spark")
+    parser.add_argument("--master", default="local[*]")
+    args = parser.parse_args(argv)
+
+    config = {
+        "out": os.path.abspath(args.out),
+        "events": args.events,
+        "users": args.users,
+        "partitions": args.partitions,
+        "batch_rows": args.batch_rows,
+        "seed": args.seed,
+        "traffic_skew": args.traffic_skew,
+        "state_skew": args.state_skew,
+        "hot_users": args.hot_users,
+        "hot_user_share": args.hot_user_share,
+    }
+    generate(config, args.workers)
+    if args.delta:
+        convert_to_delta(config["out"], args.master)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Local SQLite stand-in for the training JDBC database, and a JDBC partitioning benchmark.
+
+    python -m tools.local_jdbc seed --rows 1000000 --sparse-share 0.2
+    python -m tools.local_jdbc benchmark --partitions 8
+
+`seed` writes a `people_1m` table (id, firstName, middleName, lastName,
+gender, birthDate, ssn, salary) to /tmp/spark-course-jdbc/training.db, where
+Includes/_jdbc.py picks it up in place of the training Postgres database, so
+ASP 4.1's JDBC cells run offline. The last --sparse-share of the rows get ids
+spaced --sparse-gap apart, which skews a static lowerBound/upperBound split.
+
+`benchmark` reads the table with the lesson's static bounds (1..1000000) and
+with read_jdbc_balanced()'s "minmax" and "quantiles" strategies, and reports
+rows and time per partition for each. Spark fetches the SQLite JDBC driver
+with --driver-package.
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import sys
+import time
+
+from tools.local_runner import INCLUDES_DIR, build_spark, load_include
+
+DEFAULT_DB = "/tmp/spark-course-jdbc/training.db"
+DRIVER_PACKAGE = "org.xerial:sqlite-jdbc:3.45.1.0"
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
+
+
+def people_rows(rows, sparse_share, sparse_gap, seed):
+    rng = random.Random(seed)
+    dense = int(rows * (1 - sparse_share))
+    birth_start = datetime.date(1950, 1, 1)
+    for i in range(rows):
+        person_id = i + 1 if i < dense else dense + (i - dense + 1) * sparse_gap
+        gender = rng.choice("MF")
+        yield (
+            person_id,
+            rng.choice(FIRST_NAMES),
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            gender,
+            (birth_start + datetime.timedelta(days=rng.randrange(365 * 50))).isoformat(),
+            f"{rng.randrange(100, 999)}-{rng.randrange(10, 99)}-{rng.randrange(1000, 9999)}",
+            rng.randrange(20_000, 200_000),
+        )
+
+
+def seed(db_path, rows, sparse_share, sparse_gap, seed_value=42, batch_rows=50_000):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    start = time.time()
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "CREATE TABLE people_1m (id INTEGER PRIMARY KEY, firstName TEXT, middleName TEXT, lastName TEXT, "
+            "gender TEXT, birthDate TEXT, ssn TEXT, salary INTEGER)"
+        )
+        batch = []
+        for row in people_rows(rows, sparse_share, sparse_gap, seed_value):
+            batch.append(row)
+            if len(batch) == batch_rows:
+                connection.executemany("INSERT INTO people_1m VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                batch = []
+        if batch:
+            connection.executemany("INSERT INTO people_1m VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+    print(f"✅ Wrote {rows:,} rows to {db_path} in {time.time() - start:.1f}s")
+
+
+def benchmark(db_path, partitions, master, driver_package):
+    spark = build_spark("jdbc-benchmark", master, {"spark.jars.packages": driver_package})
+    try:
+        namespace = load_include(os.path.join(INCLUDES_DIR, "_jdbc.py"), {"spark": spark})
+        url = f"jdbc:sqlite:{db_path}"
+        properties = {"driver": "org.sqlite.JDBC"}
+        reads = {
+            "static 1..1000000": lambda: spark.read.jdbc(
+                url=url, table="people_1m", column="id", lowerBound=1, upperBound=1000000,
+                numPartitions=partitions, properties=properties,
+            ),
+            "minmax": lambda: namespace["read_jdbc_balanced"](url, "people_1m", "id", partitions, properties, strategy="minmax"),
+            "quantiles": lambda: namespace["read_jdbc_balanced"](url, "people_1m", "id", partitions, properties, strategy="quantiles"),
+        }
+        results = {}
+        for name, read in reads.items():
+            print(f"\n{name}")
+            start = time.time()
+            report = namespace["jdbc_partition_report"](read())
+            results[name] = {"wall_time_s": time.time() - start, "partitions": report}
+            print(f"wall time {results[name]['wall_time_s']:.2f}s")
+    finally:
+        spark.stop()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="create the people_1m table")
+    seed_parser.add_argument("--rows", type=int, default=1_000_000)
+    seed_parser.add_argument("--sparse-share", type=float, default=0.2, help="share of rows with sparse ids")
+    seed_parser.add_argument("--sparse-gap", type=int, default=100, help="id spacing of the sparse rows")
+    seed_parser.add_argument("--seed", type=int, default=42)
+
+    benchmark_parser = commands.add_parser("benchmark", help="compare static and balanced JDBC partitioning")
+    benchmark_parser.add_argument("--partitions", type=int, default=8)
+    benchmark_parser.add_argument("--master", default="local[*]")
+    benchmark_parser.add_argument("--driver-package", default=DRIVER_PACKAGE)
+    args = parser.parse_args(argv)
+
+    if args.command == "seed":
+        seed(args.db, args.rows, args.sparse_share, args.sparse_gap, args.seed)
+    else:
+        if not os.path.exists(args.db):
+            print(f"No database at {args.db}; run `python -m tools.local_jdbc seed` first")
+            return 1
+        benchmark(args.db, args.partitions, args.master, args.driver_package)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,541 @@
+"""Run the course notebooks headlessly against a local SparkSession.
+
+    python -m tools.local_runner "ECBS5334 - Big Data Computing with Apache Spark/03 - Tasks, Jobs and Stages.py" \\
+        --data-root /data/dbx-data-public --report runner-report.json
+
+Notebooks are read from the Databricks source format (`# COMMAND ----------`
+cells, `# MAGIC` magics). `%run` includes are resolved relative to the
+notebook, and `spark`, `sc`, `dbutils` (fs + widgets), `display` and
+`displayHTML` are provided by local shims. Hard-coded dataset locations
+(`s3a://dbx-data-public/`, `/mnt/data/`, `dbfs:/`) are rewritten to local
+directories. Every cell is timed and its Spark jobs/stages/tasks and I/O are
+recorded with the `SparkMetrics` helper from `Includes/_spark_metrics.py`.
+
+Several notebooks can be run concurrently (`--parallel N`); each one gets
+its own process and SparkSession, so the report also gives a throughput
+number for the whole course.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import shutil
+import sys
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from multiprocessing import get_context
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COURSE_DIR = os.path.join(REPO_ROOT, "ECBS5334 - Big Data Computing with Apache Spark")
+INCLUDES_DIR = os.path.join(COURSE_DIR, "Includes")
+
+NOTEBOOK_HEADER = "# Databricks notebook source"
+CELL_SEPARATOR = re.compile(r"^# COMMAND ----------\s*$", re.MULTILINE)
+
+Cell = namedtuple("Cell", ["index", "kind", "source"])
+FileInfo = namedtuple("FileInfo", ["path", "name", "size", "modificationTime"])
+
+
+# Notebook parsing
+
+
+def is_notebook(path):
+    """True if path is a Databricks source-format notebook."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.readline().strip() == NOTEBOOK_HEADER
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def parse_notebook(path):
+    """Split a notebook into cells of kind python, md, sql, fs, run or unsupported."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if text.startswith(NOTEBOOK_HEADER):
+        text = text[len(NOTEBOOK_HEADER):]
+
+    cells = []
+    for index, chunk in enumerate(CELL_SEPARATOR.split(text)):
+        lines = chunk.strip("\n").splitlines()
+        if not any(line.strip() for line in lines):
+            continue
+
+        if all(line.startswith("# MAGIC") or not line.strip() for line in lines):
+            body = [re.sub(r"^# MAGIC ?", "", line) for line in lines]
+            while body and not body[0].strip():
+                body.pop(0)
+            magic, _, rest = body[0].strip().partition(" ")
+            source = "\n".join([rest] + body[1:]).strip()
+            kind = {
+                "%md": "md",
+                "%sql": "sql",
+                "%fs": "fs",
+                "%run": "run",
+                "%python": "python",
+            }.get(magic, "unsupported")
+            cells.append(Cell(index, kind, source))
+        else:
+            cells.append(Cell(index, "python", "\n".join(lines)))
+    return cells
+
+
+def resolve_run_target(notebook_path, argument):
+    """Resolve a `%run ../Includes/Classroom-Setup` argument to a notebook file."""
+    target = argument.split()[0].strip("\"'")
+    path = os.path.normpath(os.path.join(os.path.dirname(notebook_path), target))
+    return path if path.endswith(".py") else f"{path}.py"
+
+
+def split_sql(source):
+    """Split a %sql cell into statements, ignoring `--` comment lines."""
+    lines = [line for line in source.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+# dbutils / display shims
+
+
+class LocalFs:
+    """dbutils.fs over the local filesystem, with remote prefixes mapped to local directories."""
+
+    def __init__(self, path_map):
+        self.path_map = path_map
+
+    def local(self, path):
+        for prefix, target in sorted(self.path_map.items(), key=lambda item: len(item[0]), reverse=True):
+            if path.startswith(prefix):
+                path = target.rstrip("/") + "/" + path[len(prefix):]
+                break
+        if path.startswith("file:"):
+            path = "/" + path[len("file:"):].lstrip("/")
+        return path
+
+    def _info(self, path):
+        stat = os.stat(path)
+        is_dir = os.path.isdir(path)
+        suffix = "/" if is_dir else ""
+        return FileInfo(
+            path=f"file:{path}{suffix}",
+            name=f"{os.path.basename(path)}{suffix}",
+            size=0 if is_dir else stat.st_size,
+            modificationTime=int(stat.st_mtime * 1000),
+        )
+
+    def ls(self, path):
+        local = self.local(path)
+        if not os.path.exists(local):
+            raise FileNotFoundError(f"java.io.FileNotFoundException: File {path} does not exist.")
+        if os.path.isfile(local):
+            return [self._info(local)]
+        return [self._info(os.path.join(local, name)) for name in sorted(os.listdir(local))]
+
+    def rm(self, path, recurse=False):
+        local = self.local(path)
+        if os.path.isdir(local):
+            if not recurse:
+                raise IOError(f"{path} is a directory; use recurse=True")
+            shutil.rmtree(local)
+            return True
+        if os.path.exists(local):
+            os.remove(local)
+            return True
+        return False
+
+    def mkdirs(self, path):
+        os.makedirs(self.local(path), exist_ok=True)
+        return True
+
+    def cp(self, source, destination, recurse=False):
+        source, destination = self.local(source), self.local(destination)
+        if os.path.isdir(source):
+            if not recurse:
+                raise IOError(f"{source} is a directory; use recurse=True")
+            shutil.copytree(source, destination, dirs_exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copy2(source, destination)
+        return True
+
+    def mv(self, source, destination, recurse=False):
+        destination = self.local(destination)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.move(self.local(source), destination)
+        return True
+
+    def put(self, path, contents, overwrite=False):
+        local = self.local(path)
+        if os.path.exists(local) and not overwrite:
+            raise IOError(f"{path} already exists")
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+        with open(local, "w", encoding="utf-8") as f:
+            f.write(contents)
+        return True
+
+    def head(self, path, max_bytes=65536):
+        with open(self.local(path), "rb") as f:
+            return f.read(max_bytes).decode("utf-8", errors="replace")
+
+    def mounts(self):
+        return []
+
+
+class LocalWidgets:
+    """dbutils.widgets backed by a dict."""
+
+    def __init__(self):
+        self.values = {}
+
+    def text(self, name, defaultValue="", label=None):
+        self.values.setdefault(name, defaultValue)
+
+    def dropdown(self, name, defaultValue, choices, label=None):
+        self.values.setdefault(name, defaultValue)
+
+    combobox = dropdown
+    multiselect = dropdown
+
+    def get(self, name):
+        if name not in self.values:
+            raise ValueError(f"InputWidgetNotDefined: No input widget named {name} is defined")
+        return self.values[name]
+
+    def getArgument(self, name, defaultValue=None):
+        return self.values.get(name, defaultValue)
+
+    def remove(self, name):
+        self.values.pop(name, None)
+
+    def removeAll(self):
+        self.values.clear()
+
+
+class LocalDbutils:
+    def __init__(self, path_map):
+        self.fs = LocalFs(path_map)
+        self.widgets = LocalWidgets()
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def html_to_text(html):
+    parser = _TextExtractor()
+    parser.feed(html)
+    return "".join(parser.parts)
+
+
+def make_display(verbose, display_rows=1000):
+    """Build a display() that, like Databricks, collects up to display_rows rows of a DataFrame."""
+    from pyspark.sql import DataFrame
+
+    def display(obj, *args, **kwargs):
+        if isinstance(obj, DataFrame):
+            rows = obj.limit(display_rows).collect()
+            if verbose:
+                print(" | ".join(obj.columns))
+                for row in rows[:5]:
+                    print(" | ".join(str(value) for value in row))
+                print(f"({len(rows)} rows displayed)")
+        elif verbose:
+            if isinstance(obj, list):
+                for item in obj:
+                    print(item)
+            else:
+                print(obj)
+
+    def displayHTML(html):
+        if verbose:
+            print(html_to_text(html))
+
+    return display, displayHTML
+
+
+# Execution
+
+
+def build_spark(app_name="course-notebook", master="local[*]", conf=None):
+    """Create a local SparkSession, with Delta Lake enabled when delta-spark is installed."""
+    from pyspark.sql import SparkSession
+
+    builder = (
+        SparkSession.builder.appName(app_name)
+        .master(master)
+        .config("spark.ui.showConsoleProgress", "false")
+        .config("spark.sql.session.timeZone", "UTC")
+    )
+    for key, value in (conf or {}).items():
+        builder = builder.config(key, value)
+    try:
+        from delta import configure_spark_with_delta_pip
+
+        builder = configure_spark_with_delta_pip(
+            builder.config("spark.sql.extensions", "io.delta.sql.DeltaSparkSessionExtension").config(
+                "spark.sql.catalog.spark_catalog", "org.apache.spark.sql.delta.catalog.DeltaCatalog"
+            )
+        )
+    except ImportError:
+        pass
+    return builder.getOrCreate()
+
+
+def default_path_map(data_root, dbfs_root):
+    data_root = os.path.abspath(data_root)
+    return {
+        "s3a://dbx-data-public/": data_root,
+        "/mnt/data/": data_root,
+        "dbfs:/": os.path.abspath(dbfs_root),
+    }
+
+
+def load_include(path, namespace):
+    """Execute the python cells of an include notebook (no %run resolution) into namespace."""
+    for cell in parse_notebook(path):
+        if cell.kind == "python":
+            exec(compile(cell.source, f"{path}:{cell.index}", "exec"), namespace)
+    return namespace
+
+
+class LocalNotebookRunner:
+    """Runs notebooks cell by cell in one shared namespace, like a Databricks REPL."""
+
+    def __init__(self, spark, path_map, continue_on_error=False, verbose=False):
+        self.spark = spark
+        self.path_map = path_map
+        self.continue_on_error = continue_on_error
+        self.verbose = verbose
+        self.dbutils = LocalDbutils(path_map)
+        display, displayHTML = make_display(verbose)
+        self.namespace = {
+            "__name__": "__main__",
+            "spark": spark,
+            "sc": spark.sparkContext,
+            "dbutils": self.dbutils,
+            "display": display,
+            "displayHTML": displayHTML,
+            # The data already lives on local disk, so the dataset mirror would only duplicate it
+            "mirror_enabled": False,
+        }
+        self.metrics_namespace = load_include(
+            os.path.join(INCLUDES_DIR, "_spark_metrics.py"), {"spark": spark, "dbutils": self.dbutils}
+        )
+        self.SparkMetrics = self.metrics_namespace["SparkMetrics"]
+        self.cells = []
+
+    def peak_executor_memory(self):
+        """Peak JVM heap + off-heap execution memory over all executors, from the Spark UI."""
+        executors = self.metrics_namespace["spark_ui_json"]("allexecutors") or []
+        peaks = [
+            (executor.get("peakMemoryMetrics") or {}).get("JVMHeapMemory", 0)
+            + (executor.get("peakMemoryMetrics") or {}).get("OffHeapExecutionMemory", 0)
+            for executor in executors
+        ]
+        return max(peaks or [0])
+
+    def count_result(self, variable):
+        """Row count of the DataFrame the notebook left in variable, or None."""
+        try:
+            return self.namespace[variable].count()
+        except Exception:
+            return None
+
+    def rewrite_paths(self, source):
+        """Point remote prefixes at their local directories, matching each path once, longest prefix first."""
+        prefixes = sorted(self.path_map, key=len, reverse=True)
+        pattern = re.compile("|".join(re.escape(prefix) for prefix in prefixes))
+        return pattern.sub(lambda m: f"file:{self.path_map[m.group(0)].rstrip('/')}/", source)
+
+    def run(self, notebook_path):
+        """Run a notebook; returns False if a cell failed and execution stopped."""
+        for cell in parse_notebook(notebook_path):
+            if cell.kind in ("md", "unsupported"):
+                continue
+            if cell.kind == "run":
+                if not self.run(resolve_run_target(notebook_path, cell.source)):
+                    return False
+                continue
+            if not self.run_cell(notebook_path, cell) and not self.continue_on_error:
+                return False
+        return True
+
+    def run_cell(self, notebook_path, cell):
+        source = self.rewrite_paths(cell.source)
+        result = {
+            "notebook": os.path.relpath(notebook_path, REPO_ROOT),
+            "cell": cell.index,
+            "kind": cell.kind,
+            "preview": (source.strip().splitlines() or [""])[0][:80],
+            "status": "ok",
+            "error": None,
+        }
+        metrics = self.SparkMetrics().start()
+        try:
+            if cell.kind == "sql":
+                self._run_sql(source)
+            elif cell.kind == "fs":
+                self._run_fs(source)
+            else:
+                self._run_python(source, f"{notebook_path}:{cell.index}")
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+            if self.verbose:
+                traceback.print_exc()
+        finally:
+            result.update(metrics.stop())
+        self.cells.append(result)
+        return result["status"] == "ok"
+
+    def _run_python(self, source, filename):
+        tree = ast.parse(source, filename)
+        last = None
+        if tree.body and isinstance(tree.body[-1], ast.Expr):
+            last = ast.Expression(tree.body.pop().value)
+        exec(compile(tree, filename, "exec"), self.namespace)
+        if last is not None:
+            value = eval(compile(last, filename, "eval"), self.namespace)
+            if value is not None:
+                self.namespace["display"](value)
+
+    def _run_sql(self, source):
+        widgets = self.dbutils.widgets.values
+        source = re.sub(r"\$\{(\w+)\}", lambda m: widgets.get(m.group(1), m.group(0)), source)
+        df = None
+        for statement in split_sql(source):
+            df = self.spark.sql(statement)
+        if df is not None and df.columns:
+            self.namespace["display"](df)
+
+    def _run_fs(self, source):
+        command, *args = source.split()
+        if command == "ls" and not args:
+            # `%fs ls` on its own lists the DBFS root
+            args = ["dbfs:/"]
+        self.namespace["display"](getattr(self.dbutils.fs, command)(*args))
+
+
+def run_notebook(notebook_path, data_root, dbfs_root, master="local[*]", continue_on_error=False, verbose=False, conf=None, result_variable=None):
+    """Run one notebook in a fresh SparkSession and return its timing report.
+
+    With result_variable, the DataFrame the notebook left in that variable is
+    counted after the run and reported as result_rows (None if it is missing
+    or cannot be read).
+    """
+    spark = build_spark(os.path.basename(notebook_path), master, conf)
+    runner = LocalNotebookRunner(
+        spark, default_path_map(data_root, dbfs_root), continue_on_error, verbose
+    )
+    start = time.time()
+    try:
+        completed = runner.run(notebook_path)
+        wall_time = time.time() - start
+        peak_memory = runner.peak_executor_memory()
+        result_rows = runner.count_result(result_variable) if result_variable else None
+    finally:
+        spark.stop()
+    return {
+        "notebook": os.path.relpath(notebook_path, REPO_ROOT),
+        "status": "ok" if completed and all(c["status"] == "ok" for c in runner.cells) else "error",
+        "wall_time_s": round(wall_time, 3),
+        "peak_executor_memory": peak_memory,
+        "result_rows": result_rows,
+        "cells": runner.cells,
+    }
+
+
+def run_notebooks(notebook_paths, parallel=1, **kwargs):
+    """Run notebooks in isolated processes, `parallel` at a time, and report course throughput."""
+    start = time.time()
+    if parallel <= 1:
+        reports = [run_notebook(path, **kwargs) for path in notebook_paths]
+    else:
+        with ProcessPoolExecutor(parallel, mp_context=get_context("spawn")) as pool:
+            futures = [pool.submit(run_notebook, path, **kwargs) for path in notebook_paths]
+            reports = [future.result() for future in futures]
+    wall_time = time.time() - start
+    cells = sum(len(report["cells"]) for report in reports)
+    return {
+        "parallel": parallel,
+        "wall_time_s": round(wall_time, 3),
+        "notebooks_per_minute": round(len(reports) / wall_time * 60, 2) if wall_time else None,
+        "cells_per_second": round(cells / wall_time, 2) if wall_time else None,
+        "notebooks": reports,
+    }
+
+
+def find_notebooks(paths):
+    """Expand directories into the notebooks they contain, skipping the Includes folder."""
+    notebooks = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d != "Includes")
+                notebooks.extend(
+                    os.path.join(root, name)
+                    for name in sorted(files)
+                    if name.endswith(".py") and is_notebook(os.path.join(root, name))
+                )
+        else:
+            notebooks.append(path)
+    return notebooks
+
+
+def print_summary(report):
+    for notebook in report["notebooks"]:
+        print(f"{'✅' if notebook['status'] == 'ok' else '❌'} {notebook['notebook']} ({notebook['wall_time_s']:.1f}s)")
+        for cell in notebook["cells"]:
+            line = (
+                f"    cell {cell['cell']:>3} {cell['wall_time_s']:>7.2f}s "
+                f"jobs={cell.get('jobs', 0)} stages={cell.get('stages', 0)} tasks={cell.get('tasks', 0)} "
+                f"{cell['preview']}"
+            )
+            if cell["error"]:
+                line += f"\n        {cell['error']}"
+            print(line)
+    print(
+        f"\n{len(report['notebooks'])} notebooks in {report['wall_time_s']:.1f}s "
+        f"({report['notebooks_per_minute']} notebooks/min, {report['cells_per_second']} cells/s, parallel={report['parallel']})"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("notebooks", nargs="+", help="notebook files or directories")
+    parser.add_argument("--data-root", required=True, help="local copy of s3a://dbx-data-public/")
+    parser.add_argument("--dbfs-root", default="/tmp/spark-course-dbfs", help="local directory standing in for dbfs:/")
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--parallel", type=int, default=1, help="notebooks to run concurrently")
+    parser.add_argument("--continue-on-error", action="store_true", help="keep running cells after a failure")
+    parser.add_argument("--verbose", action="store_true", help="print display() output and tracebacks")
+    parser.add_argument("--report", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_notebooks(
+        find_notebooks(args.notebooks),
+        parallel=args.parallel,
+        data_root=args.data_root,
+        dbfs_root=args.dbfs_root,
+        master=args.master,
+        continue_on_error=args.continue_on_error,
+        verbose=args.verbose,
+    )
+    print_summary(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if all(n["status"] == "ok" for n in report["notebooks"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Benchmark the S3A access profiles against a local S3-compatible stand-in.
+
+    python -m tools.local_s3 --data-root /data/dbx-data-public/v03
+    python -m tools.local_s3 --data-root /data/dbx-data-public/v03 --profiles default tuned
+
+Starts an in-process S3 server (moto), uploads the data root into a
+`dbx-data-public` bucket with the course layout, and runs
+benchmark_object_store() from Includes/_object_store.py, which lists the
+bucket and reads the events table under each access profile. Needs
+`moto[server]` and `boto3`; Spark fetches hadoop-aws with --hadoop-aws-package,
+which must match Spark's Hadoop version.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from tools.local_runner import INCLUDES_DIR, build_spark, load_include
+
+BUCKET = "dbx-data-public"
+HADOOP_AWS_PACKAGE = "org.apache.hadoop:hadoop-aws:3.3.4"
+CREDENTIALS = {"access_key": "testing", "secret_key": "testing"}
+
+
+def start_server(port):
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        raise SystemExit("The local S3 stand-in needs moto: pip install 'moto[server]' boto3")
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+    server.start()
+    return server
+
+
+def upload(data_root, endpoint, bucket=BUCKET):
+    """Upload every file below data_root to the bucket, keeping relative paths as keys."""
+    import boto3
+
+    client = boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        aws_access_key_id=CREDENTIALS["access_key"],
+        aws_secret_access_key=CREDENTIALS["secret_key"],
+        region_name="us-east-1",
+    )
+    client.create_bucket(Bucket=bucket)
+    files = 0
+    for current, _, names in os.walk(data_root):
+        for name in names:
+            full = os.path.join(current, name)
+            client.upload_file(full, bucket, os.path.relpath(full, data_root).replace(os.sep, "/"))
+            files += 1
+    print(f"✅ Uploaded {files} files to s3://{bucket} at {endpoint}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-root", required=True, help="local copy of s3a://dbx-data-public/v03")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--profiles", nargs="+", help="profiles to compare (default: all)")
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--hadoop-aws-package", default=HADOOP_AWS_PACKAGE)
+    parser.add_argument("--report", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    endpoint = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.port)
+    try:
+        upload(args.data_root, endpoint)
+        spark = build_spark("object-store-benchmark", args.master, {"spark.jars.packages": args.hadoop_aws_package})
+        try:
+            namespace = {"spark": spark}
+            load_include(os.path.join(INCLUDES_DIR, "_spark_metrics.py"), namespace)
+            load_include(os.path.join(INCLUDES_DIR, "_object_store.py"), namespace)
+            results = namespace["benchmark_object_store"](
+                BUCKET, profiles=args.profiles, endpoint=endpoint, path_style=True, **CREDENTIALS
+            )
+        finally:
+            spark.stop()
+    finally:
+        server.stop()
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())